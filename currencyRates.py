@@ -0,0 +1,441 @@
+import datetime
+import os
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import requests
+
+# Код валюты, в которую выполняется конвертация
+BASE_CURRENCY = 'RUR'
+# Коды валют вакансий, курсы которых записаны в файле курсов под другим кодом
+currency_aliases = {'BYR': 'BYN'}
+# Количество строк csv-файла, конвертируемых за один шаг
+chunk_size = 100000
+# Адрес ежедневных курсов валют ЦБ РФ
+CBR_URL = 'http://www.cbr.ru/scripts/XML_daily_eng.asp'
+# Столбцы файла курсов в порядке записи
+fetched_currencies = ['BYN', 'USD', 'EUR', 'KZT', 'UAH']
+# Коды, под которыми курс столбца публиковался до указанного месяца
+former_codes = {'BYN': ('BYR', '2016-07')}
+
+
+def month_number(year, month):
+    """
+    Вычисляет порядковый номер месяца, по которому строки матрицы курсов идут без пропусков
+    Args:
+        year (int or np.ndarray): Год
+        month (int or np.ndarray): Месяц от 1 до 12
+
+    Returns:
+        int or np.ndarray: Номер месяца
+
+    >>> month_number(2022, 7) - month_number(2021, 12)
+    7
+    """
+    return year * 12 + month - 1
+
+
+class RateMatrix(object):
+    """
+    Плотная матрица курсов валют к рублю: строка - месяц, столбец - валюта. Курс для вакансии
+    находится обращением по индексу, поэтому конвертация целого столбца зарплат выполняется одной
+    векторной операцией без поиска по таблице курсов
+
+    Attributes:
+        first_month (int): Номер первого месяца матрицы
+        columns (dict): Номер столбца матрицы по коду валюты, включая рубль и псевдонимы
+        rates (np.ndarray of float): Курсы валют, NaN - курс неизвестен. Курс рубля равен 1 за любой месяц
+    """
+    def __init__(self, periods, currencies, rates):
+        """
+        Инициализирует матрицу курсов
+        Args:
+            periods (list of str): Месяцы в формате 'YYYY-MM' для строк rates
+            currencies (list of str): Коды валют для столбцов rates
+            rates (array-like): Курсы валют по месяцам, пропущенные месяцы заполняются NaN
+
+        >>> RateMatrix(['2022-01', '2022-03'], ['USD'], [[75.0], [95.0]]).rate('USD', 2022, 2)
+        nan
+        """
+        numbers = np.array([month_number(int(period[:4]), int(period[5:7])) for period in periods], dtype=np.intp)
+        self.first_month = int(numbers.min()) if len(numbers) else 0
+        length = int(numbers.max()) - self.first_month + 1 if len(numbers) else 0
+        self.columns = {currency: index for index, currency in enumerate(currencies)}
+        self.columns[BASE_CURRENCY] = len(currencies)
+        for alias, currency in currency_aliases.items():
+            if currency in self.columns and alias not in self.columns:
+                self.columns[alias] = self.columns[currency]
+        self.rates = np.full((length, len(currencies) + 1), np.nan)
+        self.rates[numbers - self.first_month, :len(currencies)] = np.asarray(rates, dtype=np.float64) \
+            .reshape(len(numbers), len(currencies))
+        self.rates[:, len(currencies)] = 1.0
+
+    @classmethod
+    def from_csv(cls, file_path):
+        """
+        Загружает матрицу из csv-файла курсов со столбцом date и столбцами валют
+        Args:
+            file_path (str): Путь к csv-файлу курсов
+
+        Returns:
+            RateMatrix: Матрица курсов
+        """
+        data = pd.read_csv(file_path)
+        currencies = [column for column in data.columns if column != 'date']
+        return cls(list(data['date']), currencies, data[currencies].to_numpy(dtype=np.float64))
+
+    def rate(self, currency, year, month, fallback=None, default=np.nan):
+        """
+        Возвращает курс одной валюты за месяц
+        Args:
+            currency (str): Код валюты
+            year (int): Год
+            month (int): Месяц
+            fallback (dict or None): Курсы для валют и месяцев, отсутствующих в матрице
+            default (float): Курс, если валюты нет и в fallback
+
+        Returns:
+            float: Курс валюты к рублю
+
+        >>> RateMatrix(['2022-01'], ['USD'], [[75.0]]).rate('USD', 2022, 1)
+        75.0
+        >>> RateMatrix(['2022-01'], ['USD'], [[75.0]]).rate('EUR', 2022, 1, {'EUR': 59.9})
+        59.9
+        """
+        if currency == BASE_CURRENCY:
+            return 1.0
+        row = month_number(year, month) - self.first_month
+        column = self.columns.get(currency)
+        if column is not None and 0 <= row < len(self.rates):
+            rate = self.rates[row, column]
+            if not np.isnan(rate):
+                return float(rate)
+        return (fallback or {}).get(currency, default)
+
+    def rates_for(self, currencies, years, months, fallback=None, default=np.nan):
+        """
+        Находит курсы для массива вакансий одной выборкой из матрицы
+        Args:
+            currencies (array-like of str): Код валюты каждой вакансии
+            years (array-like of int or float): Год публикации каждой вакансии, NaN - неизвестен
+            months (array-like of int or float): Месяц публикации каждой вакансии, NaN - неизвестен
+            fallback (dict or None): Курсы для валют и месяцев, отсутствующих в матрице
+            default (float): Курс, если валюты нет и в fallback
+
+        Returns:
+            np.ndarray of float: Курс для каждой вакансии
+        """
+        currencies = np.asarray(currencies, dtype=object)
+        codes, inverse = np.unique(currencies, return_inverse=True)
+        columns = np.array([self.columns.get(code, -1) for code in codes], dtype=np.intp)[inverse]
+        rows = month_number(np.asarray(years, dtype=np.float64), np.asarray(months, dtype=np.float64)) \
+            - self.first_month
+        known = (columns >= 0) & (rows >= 0) & (rows < len(self.rates))
+        result = np.full(len(currencies), np.nan)
+        result[known] = self.rates[rows[known].astype(np.intp), columns[known]]
+        result[columns == self.columns[BASE_CURRENCY]] = 1.0
+        missing = np.isnan(result)
+        if missing.any():
+            codes, inverse = np.unique(currencies[missing], return_inverse=True)
+            result[missing] = np.array([(fallback or {}).get(code, default) for code in codes],
+                                       dtype=np.float64)[inverse]
+        return result
+
+    def convert(self, salaries, currencies, published_at, fallback=None, default=np.nan):
+        """
+        Конвертирует зарплаты в рубли по курсу месяца публикации
+        Args:
+            salaries (array-like of float): Зарплаты в валюте
+            currencies (array-like of str): Код валюты каждой зарплаты
+            published_at (array-like of str): Дата публикации, начинающаяся с 'YYYY-MM'
+            fallback (dict or None): Курсы для валют и месяцев, отсутствующих в матрице
+            default (float): Курс, если валюты нет и в fallback
+
+        Returns:
+            np.ndarray of float: Зарплаты в рублях
+
+        >>> RateMatrix(['2022-01'], ['USD'], [[75.0]]).convert([10, 10], ['USD', 'RUR'], ['2022-01-15', '2022-01-15'])
+        array([750.,  10.])
+        """
+        dates = pd.Series(np.asarray(published_at, dtype=object)).astype(str)
+        years = pd.to_numeric(dates.str.slice(0, 4), errors='coerce').to_numpy(dtype=np.float64)
+        months = pd.to_numeric(dates.str.slice(5, 7), errors='coerce').to_numpy(dtype=np.float64)
+        return np.asarray(salaries, dtype=np.float64) * self.rates_for(currencies, years, months, fallback, default)
+
+
+def convert_csv(matrix, source, target, size=chunk_size):
+    """
+    Конвертирует зарплаты csv-файла с вакансиями в рубли, читая и записывая его порциями.
+    Зарплата - среднее вилки, округленное вниз. Вакансии с зарплатой в валюте, курса которой за месяц
+    публикации нет в матрице, не записываются, а подсчитываются
+    Args:
+        matrix (RateMatrix): Матрица курсов
+        source (str): Путь к csv-файлу со столбцами name, salary_from, salary_to, salary_currency,
+            area_name, published_at
+        target (str): Путь к создаваемому csv-файлу со столбцами name, salary, area_name, published_at
+        size (int): Количество строк в порции
+
+    Returns:
+        tuple: Количество записанных вакансий и количество пропущенных вакансий без известного курса
+    """
+    count, skipped, is_first = 0, 0, True
+    for chunk in pd.read_csv(source, encoding='utf-8', header=0, chunksize=size):
+        salaries = chunk[['salary_from', 'salary_to']].mean(axis=1)
+        chunk['salary'] = np.floor(matrix.convert(salaries, chunk['salary_currency'].fillna(''),
+                                                  chunk['published_at']))
+        unconverted = salaries.notna() & chunk['salary'].isna()
+        skipped += int(unconverted.sum())
+        chunk = chunk[~unconverted]
+        chunk[['name', 'salary', 'area_name', 'published_at']].to_csv(target, mode='w' if is_first else 'a',
+                                                                      header=is_first, encoding='utf-8',
+                                                                      index=False)
+        count += len(chunk)
+        is_first = False
+    return count, skipped
+
+
+def month_range(start, end):
+    """
+    Перечисляет месяцы между двумя месяцами включительно
+    Args:
+        start (str): Первый месяц в формате 'YYYY-MM'
+        end (str): Последний месяц в формате 'YYYY-MM'
+
+    Returns:
+        list of str: Месяцы в формате 'YYYY-MM'
+
+    >>> month_range('2021-11', '2022-02')
+    ['2021-11', '2021-12', '2022-01', '2022-02']
+    """
+    first = month_number(int(start[:4]), int(start[5:7]))
+    last = month_number(int(end[:4]), int(end[5:7]))
+    return [f'{number // 12}-{number % 12 + 1:02d}' for number in range(first, last + 1)]
+
+
+def parse_rates(text, period, currencies=None):
+    """
+    Извлекает курсы валют к рублю из xml-документа ЦБ РФ
+    Args:
+        text (str): Xml-документ с курсами на первое число месяца
+        period (str): Месяц в формате 'YYYY-MM'
+        currencies (list of str or None): Столбцы файла курсов, по умолчанию - fetched_currencies
+
+    Returns:
+        list of float: Курсы в порядке currencies, NaN - валюты нет в документе
+
+    Raises:
+        ValueError: Если документ обрезан, не является xml или в нём нет курса или номинала валюты
+
+    >>> parse_rates('<ValCurs><Valute><CharCode>KZT</CharCode><Nominal>100</Nominal><Value>13,5612</Value></Valute></ValCurs>', '2022-01', ['KZT', 'USD'])
+    [0.1356, nan]
+    >>> parse_rates('<ValCurs><Valute><CharCode>KZT</CharCode><Value>13,5612</Value></Valute></ValCurs>', '2022-01')
+    Traceback (most recent call last):
+    ...
+    ValueError: Некорректный документ курсов за 2022-01
+    """
+    values = {}
+    try:
+        for valute in ElementTree.fromstring(text).iter('Valute'):
+            value = float(valute.findtext('Value').split()[0].replace(',', '.'))
+            values[valute.findtext('CharCode')] = round(value / float(valute.findtext('Nominal')), 4)
+    except (ElementTree.ParseError, AttributeError, IndexError, TypeError, ValueError, ZeroDivisionError):
+        raise ValueError(f'Некорректный документ курсов за {period}') from None
+    rates = []
+    for currency in currencies or fetched_currencies:
+        code, until = former_codes.get(currency, (currency, ''))
+        rates.append(values.get(code if period < until else currency, np.nan))
+    return rates
+
+
+class HttpSource(object):
+    """
+    Источник xml-документов с курсами валют на сайте ЦБ РФ
+
+    Attributes:
+        url (str): Адрес запроса курсов
+        timeout (float): Время ожидания ответа в секундах
+    """
+    def __init__(self, url=CBR_URL, timeout=10):
+        """
+        Инициализирует источник
+        Args:
+            url (str): Адрес запроса курсов
+            timeout (float): Время ожидания ответа в секундах
+        """
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self, period):
+        """
+        Загружает документ с курсами на первое число месяца
+        Args:
+            period (str): Месяц в формате 'YYYY-MM'
+
+        Returns:
+            str: Xml-документ
+
+        Raises:
+            OSError: Если документ не удалось загрузить
+        """
+        response = requests.get(self.url, params={'date_req': f'01/{period[5:7]}/{period[:4]}'}, timeout=self.timeout)
+        if response.status_code != 200:
+            raise OSError(f'Ответ {response.status_code} для {period}')
+        return response.text
+
+
+class DirectorySource(object):
+    """
+    Источник xml-документов с курсами валют из каталога файлов вида 'YYYY-MM.xml'
+
+    Attributes:
+        directory (str): Путь к каталогу
+    """
+    def __init__(self, directory):
+        """
+        Инициализирует источник
+        Args:
+            directory (str): Путь к каталогу
+        """
+        self.directory = directory
+
+    def path(self, period):
+        """
+        Возвращает путь к файлу документа за месяц
+        Args:
+            period (str): Месяц в формате 'YYYY-MM'
+
+        Returns:
+            str: Путь к файлу
+
+        >>> DirectorySource('cbr').path('2022-07')
+        'cbr/2022-07.xml'
+        """
+        return os.path.join(self.directory, f'{period}.xml')
+
+    def fetch(self, period):
+        """
+        Читает документ с курсами за месяц
+        Args:
+            period (str): Месяц в формате 'YYYY-MM'
+
+        Returns:
+            str: Xml-документ
+
+        Raises:
+            OSError: Если файла нет
+        """
+        with open(self.path(period), encoding='utf-8') as file:
+            return file.read()
+
+
+class CachedSource(DirectorySource):
+    """
+    Источник, который сохраняет загруженные документы в каталог и при повторном запросе читает их оттуда
+
+    Attributes:
+        directory (str): Путь к каталогу кэша
+        source (HttpSource or DirectorySource): Источник документов, отсутствующих в кэше
+    """
+    def __init__(self, source, directory):
+        """
+        Инициализирует источник
+        Args:
+            source (HttpSource or DirectorySource): Источник документов, отсутствующих в кэше
+            directory (str): Путь к каталогу кэша
+        """
+        super().__init__(directory)
+        self.source = source
+
+    def fetch(self, period):
+        """
+        Возвращает документ из кэша или загружает его из источника и сохраняет в кэш. В кэш попадают
+        только документы, которые удалось разобрать; испорченный документ в кэше удаляется и загружается заново
+        Args:
+            period (str): Месяц в формате 'YYYY-MM'
+
+        Returns:
+            str: Xml-документ
+
+        Raises:
+            OSError: Если документ не удалось загрузить
+            ValueError: Если загруженный документ не удалось разобрать
+        """
+        if os.path.exists(self.path(period)):
+            text = super().fetch(period)
+            try:
+                parse_rates(text, period)
+                return text
+            except ValueError:
+                os.remove(self.path(period))
+        text = self.source.fetch(period)
+        parse_rates(text, period)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f'{self.path(period)}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temp_path, self.path(period))
+        return text
+
+
+def fetch_rates(source, period, attempts=3, backoff=1.0):
+    """
+    Загружает и разбирает курсы за месяц, повторяя неудачные попытки с растущей паузой
+    Args:
+        source (HttpSource or DirectorySource): Источник документов
+        period (str): Месяц в формате 'YYYY-MM'
+        attempts (int): Количество попыток
+        backoff (float): Пауза перед второй попыткой в секундах, каждая следующая пауза вдвое длиннее
+
+    Returns:
+        list of float: Курсы в порядке fetched_currencies
+
+    Raises:
+        OSError: Если все попытки загрузки неудачны
+        ValueError: Если в последней попытке получен документ, который не удалось разобрать
+    """
+    for attempt in range(attempts):
+        try:
+            return parse_rates(source.fetch(period), period)
+        except (OSError, ValueError):
+            if attempt == attempts - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def update_rates(file_path, source, start='2003-01', end=None, max_workers=8, attempts=3, backoff=1.0):
+    """
+    Дополняет файл курсов месяцами, которых в нём нет. Месяцы загружаются параллельно; месяцы, которые
+    не удалось загрузить, не записываются и будут запрошены при следующем запуске
+    Args:
+        file_path (str): Путь к csv-файлу курсов
+        source (HttpSource or DirectorySource): Источник документов
+        start (str): Первый месяц в формате 'YYYY-MM'
+        end (str or None): Последний месяц в формате 'YYYY-MM', по умолчанию - текущий месяц
+        max_workers (int): Количество одновременных запросов
+        attempts (int): Количество попыток загрузки одного месяца
+        backoff (float): Пауза перед повторной попыткой в секундах
+
+    Returns:
+        list of str: Месяцы, которые не удалось загрузить
+    """
+    end = end or datetime.date.today().strftime('%Y-%m')
+    data = pd.read_csv(file_path) if os.path.exists(file_path) else \
+        pd.DataFrame(columns=['date'] + fetched_currencies)
+    missing = [period for period in month_range(start, end) if period not in set(data['date'])]
+    failed, rows = [], []
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {period: executor.submit(fetch_rates, source, period, attempts, backoff) for period in missing}
+        for period, future in futures.items():
+            try:
+                rows.append([period] + future.result())
+            except (OSError, ValueError):
+                failed.append(period)
+    if rows:
+        rows = pd.DataFrame(rows, columns=['date'] + fetched_currencies)
+        data = rows if data.empty else pd.concat([data, rows], ignore_index=True)
+        temp_path = file_path + '.tmp'
+        data.sort_values('date').to_csv(temp_path, index=False, encoding='utf-8')
+        os.replace(temp_path, file_path)
+    return failed
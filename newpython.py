@@ -1,12 +1,17 @@
+import queryServer
 import statsWriter
 import tableWriter
 import cProfile
 
 
-output_type = input('Выберите формат представления выходных данных (Вакансии/Статистика): ')
+output_type = input('Выберите формат представления выходных данных (Вакансии/Статистика/Пакет/Сервер): ')
 if output_type == 'Вакансии':
     tableWriter.PrintTable()
     #cProfile.run('tableWriter.PrintTable()')
 elif output_type == 'Статистика':
     statsWriter.PrintStats()
     #cProfile.run('statsWriter.PrintStats()')
+elif output_type == 'Пакет':
+    statsWriter.PrintBatchStats()
+elif output_type == 'Сервер':
+    queryServer.RunServer()
@@ -0,0 +1,240 @@
+import csv
+import functools
+import io
+import multiprocessing
+import os
+
+# Размер блока чтения при поиске границ записей
+BLOCK_SIZE = 1 << 22
+
+# Количество диапазонов на один процесс: несколько небольших диапазонов выравнивают нагрузку между процессами
+RANGES_PER_PROCESS = 4
+
+# Метка порядка байтов UTF-8 в начале файла
+BOM = b'\xef\xbb\xbf'
+
+
+def next_boundary(File, position, parity=0):
+    """
+    Находит ближайшую границу записи csv-файла начиная с указанного смещения. Граница - это позиция после
+    перевода строки, перед которым стоит чётное количество кавычек, то есть перевод строки вне значения
+    в кавычках. Переводы строк внутри значений в кавычках, например в key_skills, границами не считаются
+    Args:
+        File (file object): Открытый в двоичном режиме csv-файл
+        position (int): Смещение, с которого начинается поиск
+        parity (int): Чётность количества кавычек от начала записи до position
+
+    Returns:
+        int: Смещение начала следующей записи или размер файла, если граница не найдена
+    """
+    File.seek(position)
+    while True:
+        block = File.read(BLOCK_SIZE)
+        if not block:
+            return position
+        index = 0
+        while True:
+            newline = block.find(b'\n', index)
+            if newline < 0:
+                parity ^= block.count(b'"', index) & 1
+                break
+            parity ^= block.count(b'"', index, newline) & 1
+            if parity == 0:
+                return position + newline + 1
+            index = newline + 1
+        position += len(block)
+
+
+def quote_parity(File, start, end):
+    """
+    Вычисляет чётность количества кавычек в диапазоне байтов файла
+    Args:
+        File (file object): Открытый в двоичном режиме файл
+        start (int): Начало диапазона
+        end (int): Конец диапазона
+
+    Returns:
+        int: 0, если кавычек чётное количество, иначе 1
+    """
+    File.seek(start)
+    parity = 0
+    while start < end:
+        block = File.read(min(BLOCK_SIZE, end - start))
+        if not block:
+            break
+        parity ^= block.count(b'"') & 1
+        start += len(block)
+    return parity
+
+
+def parse_records(data):
+    """
+    Разбирает байты целых записей csv-файла
+    Args:
+        data (bytes): Байты, начинающиеся и заканчивающиеся на границах записей
+
+    Returns:
+        csv.reader: Итератор по записям
+    """
+    return csv.reader(io.StringIO(data.decode('utf-8'), newline=None), delimiter=',', quotechar='"')
+
+
+def read_header(file_path):
+    """
+    Находит заголовок csv-файла: первую запись, в которой заполнены все значения
+    Args:
+        file_path (str): Путь к csv-файлу
+
+    Returns:
+        tuple: Заголовок (list of str или None, если заголовка нет) и смещение первой записи после заголовка
+    """
+    with open(file_path, 'rb') as File:
+        position = len(BOM) if File.read(len(BOM)) == BOM else 0
+        size = os.fstat(File.fileno()).st_size
+        while position < size:
+            end = next_boundary(File, position)
+            File.seek(position)
+            for record in parse_records(File.read(end - position)):
+                if all(record):
+                    return record, end
+            position = end
+    return None, position
+
+
+def split_ranges(file_path, start, parts):
+    """
+    Делит файл на диапазоны байтов, выровненные по границам записей
+    Args:
+        file_path (str): Путь к csv-файлу
+        start (int): Смещение начала первой записи, с которого начинается деление
+        parts (int): Желаемое количество диапазонов
+
+    Returns:
+        list of tuple: Пары (начало, конец) непустых диапазонов в порядке следования в файле
+    """
+    size = os.stat(file_path).st_size
+    ranges = []
+    with open(file_path, 'rb') as File:
+        parity = 0
+        previous_target = start
+        range_start = start
+        for part in range(1, parts):
+            target = start + (size - start) * part // parts
+            if target <= range_start:
+                continue
+            parity ^= quote_parity(File, previous_target, target)
+            previous_target = target
+            boundary = next_boundary(File, target, parity)
+            if boundary > range_start:
+                ranges.append((range_start, boundary))
+                range_start = boundary
+        if range_start < size:
+            ranges.append((range_start, size))
+    return ranges
+
+
+def iter_range(file_path, start, end, header_length):
+    """
+    Читает записи диапазона байтов, отбрасывая строки с пустыми значениями и строки короче заголовка
+    Args:
+        file_path (str): Путь к csv-файлу
+        start (int): Начало диапазона на границе записи
+        end (int): Конец диапазона на границе записи
+        header_length (int): Количество столбцов заголовка
+
+    Yields:
+        list of str: Корректные строки данных диапазона
+    """
+    with open(file_path, 'rb') as File:
+        File.seek(start)
+        data = File.read(end - start)
+    for vacancy in parse_records(data):
+        if all(vacancy) and len(vacancy) >= header_length:
+            yield vacancy
+
+
+def collect_range(file_path, header_length, function, args, file_range):
+    """
+    Обрабатывает один диапазон в дочернем процессе
+    Args:
+        file_path (str): Путь к csv-файлу
+        header_length (int): Количество столбцов заголовка
+        function (function): Функция, получающая итератор строк диапазона и дополнительные аргументы
+        args (tuple): Дополнительные аргументы функции
+        file_range (tuple): Начало и конец диапазона
+
+    Returns:
+        Результат function для строк диапазона
+    """
+    return function(iter_range(file_path, file_range[0], file_range[1], header_length), *args)
+
+
+def map_ranges(file_path, function, args=(), processes=None):
+    """
+    Разбирает csv-файл параллельно по диапазонам байтов и применяет функцию к строкам каждого диапазона
+    в пуле процессов. Функция может возвращать частичные агрегаты вместо строк, тогда между процессами
+    передаются только они
+    Args:
+        file_path (str): Путь к csv-файлу
+        function (function): Функция уровня модуля, получающая итератор строк диапазона и args
+        args (tuple): Дополнительные аргументы функции
+        processes (int): Количество процессов, по умолчанию - количество ядер
+
+    Returns:
+        tuple: Заголовок файла и список результатов функции в порядке следования диапазонов в файле
+    """
+    header, start = read_header(file_path)
+    if header is None:
+        return None, []
+    processes = processes or os.cpu_count()
+    ranges = split_ranges(file_path, start, processes * RANGES_PER_PROCESS)
+    worker = functools.partial(collect_range, file_path, len(header), function, args)
+    with multiprocessing.Pool(processes) as pool:
+        return header, pool.map(worker, ranges, chunksize=1)
+
+
+def read_rows(file_path):
+    """
+    Построчно читает csv-файл за один проход, отбрасывая строки с пустыми значениями и
+    строки короче заголовка. Строки не накапливаются в памяти. Этим чтением пользуются датасеты
+    tableWriter и statsWriter, поэтому правила отбора строк у них совпадают
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях
+
+    Yields:
+        list of str: Заголовок файла, а затем каждая корректная строка данных
+    """
+    with open(file_path, encoding="utf-8-sig") as File:
+        reader = csv.reader(File, delimiter=',', quotechar='"')
+        header_length = None
+        for vacancy in reader:
+            if not all(vacancy):
+                continue
+            if header_length is None:
+                header_length = len(vacancy)
+            elif len(vacancy) < header_length:
+                continue
+            yield vacancy
+
+
+def read_rows_parallel(file_path, processes=None):
+    """
+    Параллельно разбирает csv-файл и возвращает строки в исходном порядке. Результат совпадает
+    с последовательным чтением через csv.reader
+    Args:
+        file_path (str): Путь к csv-файлу
+        processes (int): Количество процессов, по умолчанию - количество ядер
+
+    Yields:
+        list of str: Заголовок файла, а затем каждая корректная строка данных
+    """
+    header, start = read_header(file_path)
+    if header is None:
+        return
+    yield header
+    processes = processes or os.cpu_count()
+    ranges = split_ranges(file_path, start, processes * RANGES_PER_PROCESS)
+    worker = functools.partial(collect_range, file_path, len(header), list, ())
+    with multiprocessing.Pool(processes) as pool:
+        for rows in pool.imap(worker, ranges, chunksize=1):
+            yield from rows
@@ -0,0 +1,149 @@
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import statsWriter
+import tableWriter
+
+# Заголовки статистики в порядке словарей, которые возвращает get_full_dict_list
+stats_titles = ['Динамика уровня зарплат по годам',
+                'Динамика количества вакансий по годам',
+                'Динамика уровня зарплат по годам для выбранной профессии',
+                'Динамика количества вакансий по годам для выбранной профессии',
+                'Уровень зарплат по городам (в порядке убывания)',
+                'Доля вакансий по городам (в порядке убывания)']
+
+
+class QueryServer(ThreadingHTTPServer):
+    """
+    Локальный http-сервер, который один раз загружает файл с вакансиями и отвечает на запросы таблиц и
+    статистики из памяти. Каждый запрос обрабатывается в отдельном потоке на собственном представлении
+    датасета, поэтому одновременные запросы не влияют друг на друга
+
+    Attributes:
+        table_data (tableWriter.DataSet): Датасет для табличного вывода с построенными индексами
+        stats_data (statsWriter.DataSet): Колоночный датасет для расчёта статистики
+        stats_results (dict): Посчитанная статистика по названиям профессий
+        stats_lock (threading.Lock): Блокировка для заполнения stats_results
+    """
+    daemon_threads = True
+
+    def __init__(self, file_path, address=('127.0.0.1', 8000), use_cache=True):
+        """
+        Загружает датасеты и открывает сокет сервера
+        Args:
+            file_path (str): Путь к csv-файлу с данными о вакансиях
+            address (tuple): Адрес и порт сервера
+            use_cache (bool): Использовать двоичный кэш разобранного csv-файла
+        """
+        self.table_data = tableWriter.DataSet(file_path, use_cache)
+        if isinstance(self.table_data.vacancies, list):
+            self.table_data.create_index()
+        self.stats_data = statsWriter.DataSet(file_path, columnar=True, use_cache=use_cache)
+        self.stats_results = {}
+        self.stats_lock = threading.Lock()
+        super().__init__(address, QueryHandler)
+
+    def table(self, filter_opt, sorter_opt, is_reverse, split_r, columns_r):
+        """
+        Формирует таблицу вакансий так же, как tableWriter.InputConect
+        Args:
+            filter_opt (str): Значение параметра фильтрации
+            sorter_opt (str): Значение параметра сортировки
+            is_reverse (str): Значение параметра обратной сортировки
+            split_r (list of str): Нумерованные границы строк, которые должны быть выведены
+            columns_r (list of str): Список названий столбцов, которые должны быть выведены
+
+        Returns:
+            tuple: Признак корректного запроса и текст ответа
+        """
+        error = (tableWriter.check_filter_value(filter_opt) or tableWriter.check_sorter_value(sorter_opt) or
+                 tableWriter.check_reverse_value(is_reverse) or tableWriter.check_range_value(split_r))
+        if error:
+            return False, error
+        if isinstance(self.table_data.vacancies, str):
+            return True, self.table_data.vacancies
+        data = self.table_data.view()
+        if filter_opt != '':
+            data.filter_data(filter_opt)
+        output = io.StringIO()
+        tableWriter.print_vacancies(data, sorter_opt, is_reverse, split_r, columns_r, file=output)
+        return True, output.getvalue()
+
+    def stats(self, profession):
+        """
+        Возвращает статистику для профессии, считая её при первом запросе
+        Args:
+            profession (str): Название профессии
+
+        Returns:
+            dict or str: Словари статистики по заголовкам или сообщение об отсутствии данных
+        """
+        if isinstance(self.stats_data.vacancies, str):
+            return self.stats_data.vacancies
+        with self.stats_lock:
+            results = self.stats_results.get(profession)
+        if results is None:
+            results = dict(zip(stats_titles, self.stats_data.columns.get_full_dict_list(profession)))
+            with self.stats_lock:
+                results = self.stats_results.setdefault(profession, results)
+        return results
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов QueryServer:
+    /table?filter=...&sort=...&reverse=...&range=...&columns=... - таблица вакансий в текстовом виде,
+    /stats?profession=... - статистика в формате json
+    """
+    def do_GET(self):
+        """
+        Отвечает на GET-запрос
+        """
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+        if url.path == '/table':
+            try:
+                is_valid, text = self.server.table(query.get('filter', ''), query.get('sort', ''),
+                                                   query.get('reverse', ''), query.get('range', '').split(' '),
+                                                   query.get('columns', '').split(', '))
+            except ValueError as error:
+                is_valid, text = False, str(error)
+            self.send_text(200 if is_valid else 400, text, 'text/plain')
+        elif url.path == '/stats':
+            results = self.server.stats(query.get('profession', ''))
+            self.send_text(200, json.dumps(results, ensure_ascii=False), 'application/json')
+        else:
+            self.send_text(404, 'Неизвестный запрос', 'text/plain')
+
+    def send_text(self, status, text, content_type):
+        """
+        Отправляет ответ
+        Args:
+            status (int): Код ответа
+            text (str): Тело ответа
+            content_type (str): Тип содержимого
+        """
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def RunServer():
+    """
+    Запускает сервер запросов для заданного файла с вакансиями и обслуживает запросы до прерывания
+    """
+    file = input('Введите название файла: ')
+    port = input('Введите порт сервера: ')
+    server = QueryServer(file, ('127.0.0.1', int(port or 8000)))
+    print(f'Сервер запущен: http://127.0.0.1:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,40 @@
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+from queryServer import QueryServer
+from tableWriterTest import write_vacancies
+
+
+class QueryServerTests(unittest.TestCase):
+    def test_table_range(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,noExperience,False,Компания,'
+                    f'{index}0000,{index + 1}0000,False,RUR,Москва,2022-07-1{index}T09:56:52+0300'
+                    for index in range(5))
+            file_path = write_vacancies(directory, rows)
+            server = QueryServer(file_path, ('127.0.0.1', 0), use_cache=False)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                url = f'http://127.0.0.1:{server.server_address[1]}/table?range='
+                with urlopen(url + quote('2 4')) as response:
+                    text = response.read().decode('utf-8')
+                self.assertIn('Вакансия 1', text)
+                self.assertNotIn('Вакансия 3', text)
+                for bad_range in ['abc', '1 x']:
+                    with self.assertRaises(HTTPError) as context:
+                        urlopen(url + quote(bad_range))
+                    self.assertEqual(context.exception.code, 400)
+                    self.assertEqual(context.exception.read().decode('utf-8'), 'Диапазон строк задан некорректно')
+                    context.exception.close()
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,34 @@
 import datetime
+import hashlib
+import json
 import math
 import os
-import csv
+import pathlib
+import pickle
+import re
+import shutil
+import tempfile
+import collections
+import functools
 import itertools
-import matplotlib.pyplot as plt
+import time
+import types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
 from jinja2 import Environment, FileSystemLoader
-from openpyxl.reader.excel import load_workbook
-from openpyxl.styles import Border, Side, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Side, Font, NamedStyle
+from openpyxl.utils import get_column_letter
 from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
 import openpyxl as excel
 import pdfkit
-import _strptime
 import cProfile
+import parallelReader
+import vacancyCache
+import vacancyPartitions
 
 currency_to_rub = {
     """
@@ -30,6 +46,16 @@ currency_to_rub = {
     "UZS": 0.0055,
 }
 
+# Размер одной диаграммы в дюймах и разрешение изображений диаграмм
+CHART_SIZE = (9.6, 7.2)
+CHART_DPI = 200
+# Каталог кэша изображений диаграмм
+CHART_CACHE = '.chart_cache'
+# Наибольший размер кэша изображений диаграмм в байтах
+CHART_CACHE_LIMIT = 256 * 2 ** 20
+# Переменная окружения с путем к wkhtmltopdf; если она не задана, wkhtmltopdf ищется в PATH
+WKHTMLTOPDF_VARIABLE = 'WKHTMLTOPDF'
+
 dic_naming = {
     """
     Словарь перевода английских названий заголовков в русские
@@ -44,55 +70,187 @@ dic_naming = {
 }
 
 
-def format_columns_width(worksheet):
+@functools.lru_cache(maxsize=None)
+def report_template(name='html_template.html'):
+    """
+    Загружает и компилирует шаблон pdf-отчёта из каталога модуля. Шаблон компилируется один раз
+    и используется всеми последующими отчётами
+    Args:
+        name (str): Имя файла шаблона
+
+    Returns:
+        jinja2.Template: Скомпилированный шаблон
+    """
+    return Environment(loader=FileSystemLoader(os.path.dirname(os.path.abspath(__file__)))).get_template(name)
+
+
+def chart_key(spec):
     """
-    Устанавливает ширину стоблцов рабочего листа по длине содержимого ячеек
+    Вычисляет ключ изображения диаграммы по её данным и параметрам отображения
     Args:
-        worksheet (excel.worksheet): Рабочий лист excel-документа
+        spec (dict): Описание диаграммы
+
+    Returns:
+        str: Шестнадцатеричный sha256-хэш
+
+    >>> chart_key({'kind': 'pie', 'values': [0.5]}) == chart_key({'values': [0.5], 'kind': 'pie'})
+    True
     """
-    dims = {}
-    for row in worksheet.rows:
-        for cell in row:
-            if cell.value:
-                dims[cell.column_letter] = max(dims.get(cell.column_letter, 0), len(str(cell.value)))
+    content = json.dumps([spec, CHART_SIZE, CHART_DPI], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    for column, value in dims.items():
-        worksheet.column_dimensions[column].width = value + 2
+
+def draw_chart(spec, file_path):
+    """
+    Рисует одну диаграмму на отдельном объекте Figure без глобального состояния pyplot и сохраняет её в png.
+    Изображение записывается во временный файл и переименовывается, поэтому в кэше не бывает недописанных файлов
+    Args:
+        spec (dict): Описание диаграммы: вид ('bars', 'barh' или 'pie'), заголовок, подписи и значения
+        file_path (str): Путь к создаваемому png-изображению
+    """
+    figure = Figure(figsize=CHART_SIZE)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    labels = spec['labels']
+    if spec['kind'] == 'bars':
+        x = np.arange(len(labels))
+        width = 0.35
+        axes.bar(x - width / 2, spec['values'][0], width, label=spec['legend'][0])
+        axes.bar(x + width / 2, spec['values'][1], width, label=spec['legend'][1])
+        axes.set_xticks(x, labels, rotation=90)
+        axes.legend(fontsize=8)
+        axes.grid(axis='y')
+    elif spec['kind'] == 'barh':
+        axes.barh(labels, spec['values'])
+        axes.set_yticks(np.arange(len(labels)), ['-\n'.join('\n'.join(label.split(' ')).split('-')) for label in labels])
+        axes.invert_yaxis()
+        axes.grid(axis='x')
+    else:
+        axes.pie([1 - sum(spec['values'])] + spec['values'], labels=['Другие'] + labels)
+        axes.axis('equal')
+    axes.tick_params(labelsize=8)
+    axes.set_title(spec['title'])
+    figure.tight_layout()
+    temp_path = f'{file_path}.{os.getpid()}.tmp'
+    figure.savefig(temp_path, dpi=CHART_DPI, format='png')
+    os.replace(temp_path, file_path)
 
 
-def set_header(worksheet, columns_title, bd):
+def compose_charts(paths, file_path, columns=2):
     """
-    Задает стили границ и записывает заголовки в первую строку рабочего листа
+    Собирает изображения диаграмм одинакового размера в одно изображение по строкам
     Args:
-        worksheet (excel.worksheet): Рабочий лист excel-документа
-        columns_title (list of string): Список заголовков листа
-        bd (excel.border_style): Стиль границ для ячеек заголовков
+        paths (list of str): Пути к png-изображениям диаграмм
+        file_path (str): Путь к создаваемому png-изображению
+        columns (int): Количество диаграмм в строке
     """
-    for index, title in enumerate(columns_title):
-        cell = worksheet.cell(column=index + 1, row=1, value=title)
-        if title:
-            cell.border = Border(left=bd, top=bd, right=bd, bottom=bd)
-            cell.font = Font(bold=True)
+    charts = [Image.open(path) for path in paths]
+    width, height = charts[0].size
+    composite = Image.new('RGBA', (width * columns, height * math.ceil(len(charts) / columns)), 'white')
+    for index, chart in enumerate(charts):
+        composite.paste(chart, (width * (index % columns), height * (index // columns)))
+        chart.close()
+    temp_path = f'{file_path}.{os.getpid()}.tmp'
+    composite.save(temp_path, format='png')
+    os.replace(temp_path, file_path)
 
 
-def write_data(worksheet, data, bd, first_col_number=1, first_row_number=2, percentage_col_number=-1):
+def prune_chart_cache(cache_directory=CHART_CACHE, max_bytes=CHART_CACHE_LIMIT):
     """
-    Задает стили границ и записывает данные в виде таблицы начиная с указанных колонки и строки
+    Удаляет из кэша диаграмм изображения, которые дольше всех не использовались, пока размер кэша
+    не станет не больше max_bytes. Вызывается после формирования отчётов, когда кэш никем не читается
     Args:
-        worksheet (excel.worksheet): Рабочий лист excel-документа
-        data (list of lists of float or integer): Список выводимых данных
-        bd (excel.border_style): Стиль границ для ячеек данных
-        first_col_number: Порядковый номер колонки, с которой начинается запись данных
-        first_row_number: Порядковый номер строки, с которой начинается запись данных
-        percentage_col_number: Порядковый номер столбца, которому нужно установить процентный значения
+        cache_directory (str): Каталог кэша изображений диаграмм
+        max_bytes (int): Наибольший размер кэша в байтах
+
+    Returns:
+        int: Количество удаленных изображений
+    """
+    if not os.path.isdir(cache_directory):
+        return 0
+    entries = sorted((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                     for entry in os.scandir(cache_directory) if entry.is_file())
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def report_styles(bd):
     """
+    Создает именованные стили ячеек отчёта, которые хранятся в книге один раз и используются всеми ячейками
+    Args:
+        bd (excel.border_style): Стиль границ для ячеек
 
-    for i, row in enumerate(data):
-        for j, value in enumerate(row):
-            cell = worksheet.cell(column=j + first_col_number, row=i + first_row_number, value=data[i][j])
-            cell.border = Border(left=bd, top=bd, right=bd, bottom=bd)
-            if j + 1 == percentage_col_number:
-                cell.number_format = FORMAT_PERCENTAGE_00
+    Returns:
+        list of NamedStyle: Стили заголовков, данных и процентных данных
+    """
+    border = Border(left=bd, top=bd, right=bd, bottom=bd)
+    return [NamedStyle(name='report_header', font=Font(bold=True), border=border),
+            NamedStyle(name='report_data', border=border),
+            NamedStyle(name='report_percent', border=border, number_format=FORMAT_PERCENTAGE_00)]
+
+
+def write_sheet(workbook, title, header, rows, percentage_columns=()):
+    """
+    Записывает рабочий лист книги в режиме только для записи. Строки по мере поступления сохраняются во
+    временный файл, а ширина каждого столбца считается по длине его значений; затем лист записывается
+    из временного файла, поэтому в памяти одновременно находится только одна строка
+    Args:
+        workbook (excel.Workbook): Книга, созданная с write_only=True, со стилями report_styles
+        title (str): Название листа
+        header (list of str): Заголовки столбцов, пустой заголовок оставляет ячейку без оформления
+        rows (iterable of list): Строки данных, значение None оставляет ячейку пустой и без оформления
+        percentage_columns (iterable of int): Порядковые номера столбцов с процентным форматом, начиная с 1
+    """
+    widths = {}
+    with tempfile.TemporaryFile() as spool:
+        for row in itertools.chain([header], rows):
+            for index, value in enumerate(row):
+                if value:
+                    widths[index] = max(widths.get(index, 0), len(str(value)))
+            pickle.dump(row, spool, pickle.HIGHEST_PROTOCOL)
+        spool.seek(0)
+
+        worksheet = workbook.create_sheet(title)
+        for index, width in widths.items():
+            worksheet.column_dimensions[get_column_letter(index + 1)].width = width + 2
+        styles = ['report_percent' if index + 1 in percentage_columns else 'report_data'
+                  for index in range(max(widths, default=-1) + 1)]
+        worksheet.append([styled_cell(worksheet, value, 'report_header') for value in pickle.load(spool)])
+        while True:
+            try:
+                row = pickle.load(spool)
+            except EOFError:
+                break
+            worksheet.append([styled_cell(worksheet, value, styles[index] if index < len(styles) else 'report_data')
+                              for index, value in enumerate(row)])
+
+
+def styled_cell(worksheet, value, style):
+    """
+    Создает ячейку листа, записываемого в режиме только для записи
+    Args:
+        worksheet (excel.worksheet): Рабочий лист
+        value: Значение ячейки
+        style (str): Название именованного стиля, применяемого к непустой ячейке
+
+    Returns:
+        WriteOnlyCell or None: Ячейка или None для пустого значения
+    """
+    if value is None or value == '':
+        return None
+    cell = WriteOnlyCell(worksheet, value)
+    cell.style = style
+    return cell
 
 
 class Report(object):
@@ -102,13 +260,15 @@ class Report(object):
     Attributes:
         ws_titles_list (list of strings): Список названий рабочих листов excel-документа
         border_style (excel.border_style): Стиль границ для ячеек excel-документа
+        profession (str): Название профессии, для которой построен отчёт
     """
-    def __init__(self, ws_titles_list, border_style):
+    def __init__(self, ws_titles_list, border_style, profession=''):
         """
         Инициализирует объект Report
         Args:
             ws_titles_list (list of strings): Список названий рабочих листов excel-документа
             border_style (excel.border_style): Стиль границ для ячеек excel-документа
+            profession (str): Название профессии, для которой построен отчёт
 
         >>> type(Report(['First_Worksheet', 'Second_Worksheet', 'Third_Worksheet'], Side(style='thin', color="000000")))
         <class 'statsWriter.Report'>
@@ -117,111 +277,137 @@ class Report(object):
         """
         self.ws_titles_headers = ws_titles_list
         self.border_style = border_style
+        self.profession = profession
 
-    def generate_excel(self, dic_list):
+    def generate_excel(self, dic_list, file_path='report.xlsx', extra_sheets=None):
         """
-        Генерирует excel-документ со списком получаемых статистических данных
+        Генерирует excel-документ со списком получаемых статистических данных. Книга записывается потоково,
+        поэтому дополнительные листы могут содержать сколько угодно строк
         Args:
             dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
+            file_path (str): Путь к создаваемому excel-документу
+            extra_sheets (dict or None): Дополнительные листы: название листа - пара из списка заголовков и
+                итерируемого объекта строк, например генератора
         """
-        wb = excel.Workbook()
-        ws_list = []
-        bd = self.border_style
+        wb = excel.Workbook(write_only=True)
+        for style in report_styles(self.border_style):
+            wb.add_named_style(style)
+        titles = list(self.ws_titles_headers.keys())
 
-        by_year_data = []
-        by_city_data_salary = []
-        by_city_data_ratio = []
+        by_year_data = self.by_year_rows(dic_list)
+        by_city_data = ([city_salary[0] if city_salary else None, city_salary[1] if city_salary else None, None,
+                         city_ratio[0] if city_ratio else None, city_ratio[1] if city_ratio else None]
+                        for city_salary, city_ratio in itertools.zip_longest(dic_list[4].items(), dic_list[5].items()))
 
-        for year in list(dic_list[0].keys()):
-            by_year_data.append([year, dic_list[0][year], dic_list[2][year],
-                                 dic_list[1][year], dic_list[3][year]])
+        write_sheet(wb, titles[0], self.ws_titles_headers[titles[0]], by_year_data)
+        write_sheet(wb, titles[1], self.ws_titles_headers[titles[1]], by_city_data, percentage_columns=(5,))
+        for title, (header, rows) in (extra_sheets or {}).items():
+            write_sheet(wb, title, header, rows)
+        wb.save(file_path)
 
-        for city in list(dic_list[4].keys()):
-            by_city_data_salary.append([city, dic_list[4][city]])
+    @staticmethod
+    def by_year_rows(dic_list):
+        """
+        Формирует строки таблицы статистики по годам
+        Args:
+            dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
 
-        for city in list(dic_list[5].keys()):
-            by_city_data_ratio.append([city, dic_list[5][city]])
+        Returns:
+            list of list: Год, средняя зарплата, средняя зарплата для профессии, количество вакансий и
+            количество вакансий для профессии
 
-        for index, title in enumerate(list(self.ws_titles_headers.keys())):
-            if index == 0:
-                worksheet = wb.active
-                worksheet.title = title
-            else:
-                worksheet = wb.create_sheet(title)
-            ws_list.append(worksheet)
-            set_header(worksheet, self.ws_titles_headers[title], bd)
+        >>> Report.by_year_rows([{2022: 100}, {2022: 2}, {2022: 150}, {2022: 1}])
+        [[2022, 100, 150, 2, 1]]
+        """
+        return [[year, dic_list[0][year], dic_list[2][year], dic_list[1][year], dic_list[3][year]]
+                for year in dic_list[0]]
 
-        write_data(ws_list[0], by_year_data, bd)
-        write_data(ws_list[1], by_city_data_salary, bd)
-        write_data(ws_list[1], by_city_data_ratio, bd, 4, 2, 2)
+    def chart_specs(self, dic_list):
+        """
+        Формирует описания четырех диаграмм отчёта
+        Args:
+            dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
 
-        format_columns_width(ws_list[0])
-        format_columns_width(ws_list[1])
-        wb.save('report.xlsx')
+        Returns:
+            list of dict: Описания диаграмм в порядке вывода
+        """
+        years = list(dic_list[0].keys())
+        return [{'kind': 'bars', 'title': 'Уровень зарплат по годам', 'labels': years,
+                 'values': [list(dic_list[0].values()), list(dic_list[2].values())],
+                 'legend': ['средняя з/п', f'з/п {self.profession}']},
+                {'kind': 'bars', 'title': 'Количество вакансий по годам', 'labels': years,
+                 'values': [list(dic_list[1].values()), list(dic_list[3].values())],
+                 'legend': ['Количество вакансий', f'Количество вакансий {self.profession}']},
+                {'kind': 'barh', 'title': 'Уровень зарплат по городам', 'labels': list(dic_list[4].keys()),
+                 'values': list(dic_list[4].values())},
+                {'kind': 'pie', 'title': 'Доля вакансий по городам', 'labels': list(dic_list[5].keys()),
+                 'values': list(dic_list[5].values())}]
 
-    def generate_image(self, dic_list):
+    def generate_image(self, dic_list, file_path='graph.png', cache_directory=CHART_CACHE, max_workers=None):
         """
-        Формирует png-изображение диаграмм по полученным статистическим данным
+        Формирует png-изображение диаграмм по полученным статистическим данным. Каждая диаграмма рисуется
+        отдельно в пуле процессов и сохраняется в кэш под ключом из хэша своих данных, поэтому диаграммы
+        с неизменившимися данными не перерисовываются. Готовые диаграммы собираются в одно изображение.
+        Время изменения использованных изображений обновляется, чтобы prune_chart_cache удалял давно
+        не использованные
         Args:
             dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
+            file_path (str): Путь к создаваемому png-изображению
+            cache_directory (str): Каталог кэша изображений диаграмм
+            max_workers (int or None): Количество процессов для рисования диаграмм, 1 - рисовать в текущем процессе
         """
-        plt.rc('axes', labelsize=8)
-        plt.rc('xtick', labelsize=8)
-        plt.rc('ytick', labelsize=8)
-        plt.rc('legend', fontsize=8)
-
-        labels = list(dic_list[0].keys())
-        cities = list(dic_list[4].keys())
-
-        one_cities = ['\n'.join(x.split(' ')) for x in cities]
-        new_cities = ['-\n'.join(x.split('-')) for x in one_cities]
-
-        x = np.arange(len(labels))
-        y = np.arange(len(cities))
-        width = 0.35
-
-        fig, axs = plt.subplots(2, 2, figsize=(19.2, 14.4))
-        axs[0, 0].bar(x - width / 2, list(dic_list[0].values()), width, label='средняя з/п')
-        axs[0, 0].bar(x + width / 2, list(dic_list[2].values()), width, label=f'з/п {profession}')
-        axs[0, 0].set_title('Уровень зарплат по годам')
-        axs[0, 0].set_xticks(x, labels, rotation=90)
-        axs[0, 0].legend()
-        axs[0, 0].grid(axis='y')
-
-        axs[0, 1].bar(x - width / 2, list(dic_list[1].values()), width, label='Количество вакансий')
-        axs[0, 1].bar(x + width / 2, list(dic_list[3].values()), width,
-                      label=f'Количество вакансий {profession}')
-        axs[0, 1].set_title('Количество вакансий по годам')
-        axs[0, 1].set_xticks(x, labels, rotation=90)
-        axs[0, 1].legend()
-        axs[0, 1].grid(axis='y')
+        os.makedirs(cache_directory, exist_ok=True)
+        specs = self.chart_specs(dic_list)
+        keys = [chart_key(spec) for spec in specs]
+        paths = [os.path.join(cache_directory, f'{key}.png') for key in keys]
+        missing = [(spec, path) for spec, path in zip(specs, paths) if not os.path.exists(path)]
+        if len(missing) == 1 or max_workers == 1:
+            for spec, path in missing:
+                draw_chart(spec, path)
+        elif missing:
+            with ProcessPoolExecutor(max_workers) as executor:
+                list(executor.map(draw_chart, *zip(*missing)))
+        composite_path = os.path.join(cache_directory, f'{chart_key(keys)}.png')
+        if not os.path.exists(composite_path):
+            compose_charts(paths, composite_path)
+        for path in paths + [composite_path]:
+            os.utime(path)
+        shutil.copyfile(composite_path, file_path)
 
-        axs[1, 0].barh(cities, list(dic_list[4].values()))
-        axs[1, 0].set_title('Уровень зарплат по городам')
-        axs[1, 0].set_yticks(y, new_cities)
-        axs[1, 0].invert_yaxis()
-        axs[1, 0].grid(axis='x')
-
-        others_ratio = 1 - sum(list(dic_list[5].values()))
-
-        axs[1, 1].pie([others_ratio] + (list(dic_list[5].values())), labels=['Другие'] + cities)
-        axs[1, 1].set_title('Доля вакансий по городам')
-        axs[1, 1].axis('equal')
+    def render_html(self, dic_list, image_path='graph.png'):
+        """
+        Формирует html-документ отчёта прямо из словарей статистики
+        Args:
+            dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
+            image_path (str): Путь к png-изображению с диаграммами
 
-        fig.tight_layout()
-        plt.savefig(r"C:\Users\Andrew\PycharmProjects\YandexContest2\graph.png", dpi=200)
+        Returns:
+            str: Html-документ
+        """
+        headers = list(self.ws_titles_headers.values())
+        return report_template().render(profession=self.profession, image=pathlib.Path(image_path).resolve().as_uri(),
+                                         by_year_rows=[headers[0]] + self.by_year_rows(dic_list),
+                                         salary_rows=[headers[1][:2]] + [list(item) for item in dic_list[4].items()],
+                                         ratio_rows=[headers[1][3:5]] + [list(item) for item in dic_list[5].items()])
 
-    def generate_pdf(self):
+    def generate_pdf(self, dic_list, file_path='report.pdf', image_path='graph.png', wkhtmltopdf=None):
         """
-        Формирует pdf-документ с таблицамии и диаграммами
+        Формирует pdf-документ с таблицамии и диаграммами. Html-документ передается в wkhtmltopdf из памяти,
+        поэтому pdf-документ не зависит от excel-документа
+        Args:
+            dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
+            file_path (str): Путь к создаваемому pdf-документу
+            image_path (str): Путь к png-изображению с диаграммами
+            wkhtmltopdf (str or None): Путь к wkhtmltopdf, по умолчанию - из переменной окружения WKHTMLTOPDF,
+                а если она не задана - из PATH
+
+        Raises:
+            OSError: Если wkhtmltopdf не найден
         """
-        env = Environment(loader=FileSystemLoader('.'))
-        template = env.get_template("html_template.html")
-        book = load_workbook("report.xlsx")
-        ws_list = book.worksheets
-        pdf_template = template.render({'profession': profession}, first_ws=ws_list[0], second_ws=ws_list[1])
-        config = pdfkit.configuration(wkhtmltopdf=r'E:\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": True})
+        wkhtmltopdf = wkhtmltopdf or os.environ.get(WKHTMLTOPDF_VARIABLE)
+        config = pdfkit.configuration(wkhtmltopdf=wkhtmltopdf) if wkhtmltopdf else pdfkit.configuration()
+        pdfkit.from_string(self.render_html(dic_list, image_path), file_path, configuration=config,
+                           options={"enable-local-file-access": True})
 
 
 class Salary(object):
@@ -261,9 +447,12 @@ class Salary(object):
         self.salary_gross = salary_g
         self.salary_currency = salary_c
 
-    def convert(self):
+    def convert(self, rate=None):
         """
         Конвертирует значение зарплаты в валюте в рубли
+        Args:
+            rate (float or None): Курс валюты к рублю, по умолчанию - курс из словаря currency_to_rub
+
         Returns: int: Конвертированное значение зарплаты в рублях
 
         >>> Salary(10, 20, 'RUR').convert()
@@ -278,13 +467,41 @@ class Salary(object):
         898.5
         >>> Salary(10.0, 20.0, 'RUR', 'Да').convert()
         15.0
+        >>> Salary(10, 20, 'USD').convert(70.0)
+        1050.0
         """
-        return (int(float(self.salary_from)) + int(float(self.salary_to))) / 2 * currency_to_rub[self.salary_currency]
+        if rate is None:
+            rate = currency_to_rub[self.salary_currency]
+        return (int(float(self.salary_from)) + int(float(self.salary_to))) / 2 * rate
 
-class Date(object):
+class Date(str):
+    """
+    Класс для представления даты публикации вакансии. Остаётся строкой в исходном формате,
+    поэтому сравнивается с ней напрямую
+
+    Attributes:
+        year (int): Год публикации
+        month (str): Месяц публикации
+        day (str): День публикации
+        hours (str): Час публикации
+        minutes (str): Минуты публикации
+        seconds (str): Секунды публикации
+        UTC (str): Смещение часового пояса
+    """
     def __init__(self, date_row):
-        self.full_date = _strptime.datetime_date(date_row)
-        self.year = date_row[:4]
+        """
+        Инициализирует объект Date
+        Args:
+            date_row (str): Дата публикации в формате '%Y-%m-%dT%H:%M:%S%z'
+
+        >>> Date('2022-07-15T09:56:52+0300').year
+        2022
+        >>> Date('2022-07-15T09:56:52+0300') == '2022-07-15T09:56:52+0300'
+        True
+        >>> Date('2022-07-15T09:56:52+0300').full_date
+        datetime.date(2022, 7, 15)
+        """
+        self.year = int(date_row[:4])
         self.month = date_row[5:7]
         self.day = date_row[8:10]
         self.hours = date_row[11:13]
@@ -292,6 +509,15 @@ class Date(object):
         self.seconds = date_row[17:19]
         self.UTC = date_row[19:]
 
+    @property
+    def full_date(self):
+        """
+        Возвращает дату публикации без времени
+        Returns:
+            datetime.date: Дата публикации
+        """
+        return datetime.date(self.year, int(self.month), int(self.day))
+
 
 class Vacancy(object):
     """
@@ -363,42 +589,669 @@ class Vacancy(object):
             self.published_at = Date(vacancy_row[11])
 
 
+def select_years(rows, date_index, years):
+    """
+    Отбирает строки данных, опубликованные в указанные годы
+    Args:
+        rows (iterable of list of str): Строки данных
+        date_index (int): Номер столбца published_at
+        years (set of int): Годы публикации
+
+    Returns:
+        list of list of str: Подходящие строки
+    """
+    return [row for row in rows if int(row[date_index][:4]) in years]
+
+
+def open_partitions(directory, use_cache=False, processes=None, years=None):
+    """
+    Читает строки каталога разделов, созданного vacancyPartitions.partition_csv. Разделы, в которых нет
+    вакансий за указанные годы, не читаются, остальные разбираются параллельно
+    Args:
+        directory (str): Каталог разделов с manifest.json
+        use_cache (bool): Читать строки из двоичного кэша рядом с файлами разделов
+        processes (int or None): Количество процессов, по умолчанию - количество ядер
+        years (set of int or None): Годы публикации учитываемых вакансий, None - все годы
+
+    Returns:
+        iterator of list of str: Заголовок, а затем строки данных в порядке разделов
+    """
+    manifest = vacancyPartitions.read_manifest(directory)
+    header, partitions = manifest['header'], manifest['partitions']
+    if years is None:
+        parts = vacancyPartitions.map_partitions(directory, partitions, list, (), processes, use_cache)
+    else:
+        partitions = [partition for partition in partitions
+                      if any(int(partition['first_published'][:4]) <= year <= int(partition['last_published'][:4])
+                             for year in years)]
+        parts = vacancyPartitions.map_partitions(directory, partitions, select_years,
+                                                 (header.index('published_at'), set(years)), processes, use_cache)
+    return itertools.chain([header], itertools.chain.from_iterable(parts))
+
+
+def open_rows(file_path, use_cache=False, processes=None, years=None):
+    """
+    Выбирает способ чтения строк csv-файла или каталога разделов
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях или к каталогу разделов
+        use_cache (bool): Читать строки из двоичного кэша рядом с csv-файлом и создавать его при отсутствии
+        processes (int or None): Количество процессов для параллельного разбора, None - последовательный разбор
+            csv-файла и параллельный разбор разделов
+        years (set of int or None): Годы публикации учитываемых вакансий, None - все годы
+
+    Returns:
+        iterator of list of str: Заголовок, а затем строки данных
+    """
+    if vacancyPartitions.is_partitioned(file_path):
+        return open_partitions(file_path, use_cache, processes, years)
+    reader = functools.partial(parallelReader.read_rows_parallel, processes=processes) if processes else \
+        parallelReader.read_rows
+    rows = vacancyCache.cached_rows(file_path, reader) if use_cache else reader(file_path)
+    if years is None:
+        return rows
+    header = next(rows, None)
+    if header is None:
+        return iter(())
+    date_index, years = header.index('published_at'), set(years)
+    return itertools.chain([header], (row for row in rows if int(row[date_index][:4]) in years))
+
+
+def stream_vacancies(file_path, use_cache=False, processes=None, years=None):
+    """
+    Потоково преобразует строки csv-файла в объекты вакансий, пропуская заголовок
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях или к каталогу разделов
+        use_cache (bool): Читать строки из двоичного кэша рядом с csv-файлом и создавать его при отсутствии
+        processes (int or None): Количество процессов для параллельного разбора, None - последовательный разбор
+        years (set of int or None): Годы публикации учитываемых вакансий, None - все годы
+
+    Yields:
+        Vacancy: Объект вакансии для каждой корректной строки файла
+    """
+    rows = open_rows(file_path, use_cache, processes, years)
+    next(rows, None)
+    for vacancy in rows:
+        yield Vacancy(vacancy)
+
+
+class Accumulator(object):
+    """
+    Базовый класс накопителя статистики для однопроходного движка StatsEngine.
+    Наследники реализуют add, merge и result, после чего их можно добавлять в движок без
+    дополнительного прохода по вакансиям
+    """
+    def add(self, vacancy, salary):
+        """
+        Учитывает одну вакансию
+        Args:
+            vacancy (Vacancy): Объект вакансии
+            salary (float): Зарплата вакансии, уже конвертированная в рубли
+        """
+        raise NotImplementedError
+
+    def merge(self, other):
+        """
+        Добавляет к накопителю частичный результат другого накопителя того же типа
+        Args:
+            other (Accumulator): Накопитель, посчитанный по другой части данных
+        """
+        raise NotImplementedError
+
+    def result(self, engine):
+        """
+        Формирует итоговую статистику
+        Args:
+            engine (StatsEngine): Движок, содержащий общее число вакансий и множество годов датасета
+
+        Returns:
+            list of dict: Итоговые словари статистики
+        """
+        raise NotImplementedError
+
+
+class KeyedSalaryAccumulator(Accumulator):
+    """
+    Накопитель суммы зарплат и количества вакансий по ключу
+
+    Attributes:
+        salaries (dict): Сумма зарплат по ключу
+        counts (dict): Количество вакансий по ключу
+    """
+    def __init__(self):
+        self.salaries = {}
+        self.counts = {}
+
+    def key(self, vacancy):
+        """
+        Возвращает ключ группировки вакансии или None, если вакансия не учитывается
+        Args:
+            vacancy (Vacancy): Объект вакансии
+        """
+        raise NotImplementedError
+
+    def add(self, vacancy, salary):
+        key = self.key(vacancy)
+        if key is None:
+            return
+        self.salaries[key] = self.salaries.get(key, 0) + salary
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def merge(self, other):
+        for key, salary in other.salaries.items():
+            self.salaries[key] = self.salaries.get(key, 0) + salary
+            self.counts[key] = self.counts.get(key, 0) + other.counts[key]
+
+    def averages(self, keys):
+        """
+        Вычисляет среднюю зарплату и количество вакансий для указанных ключей
+        Args:
+            keys (iterable): Ключи в порядке вывода
+
+        Returns:
+            list of dict: Средняя зарплата по ключу и количество вакансий по ключу, 0 для отсутствующих ключей
+        """
+        return [{key: math.floor(self.salaries[key] / self.counts[key]) if key in self.counts else 0 for key in keys},
+                {key: self.counts.get(key, 0) for key in keys}]
+
+
+class YearAccumulator(KeyedSalaryAccumulator):
+    """
+    Накопитель распределения зарплат и количества вакансий по годам
+    """
+    def key(self, vacancy):
+        return vacancy.published_at.year
+
+    def result(self, engine):
+        return self.averages(sorted(engine.years))
+
+
+class ProfessionAccumulator(KeyedSalaryAccumulator):
+    """
+    Накопитель распределения зарплат и количества вакансий по годам для одной профессии
+
+    Attributes:
+        profession (str): Название профессии
+    """
+    def __init__(self, profession):
+        super().__init__()
+        self.profession = profession
+
+    def key(self, vacancy):
+        return vacancy.published_at.year if self.profession in vacancy.name else None
+
+    def result(self, engine):
+        return self.averages(sorted(engine.years))
+
+
+class ProfessionMatcher(object):
+    """
+    Автомат Ахо-Корасик для одновременного поиска названий нескольких профессий в названии вакансии.
+    Время поиска линейно по длине названия и не зависит от количества профессий
+
+    Attributes:
+        professions (list of str): Названия профессий, индекс - номер профессии
+    """
+    def __init__(self, professions):
+        """
+        Строит автомат по списку профессий
+        Args:
+            professions (list of str): Названия профессий
+
+        >>> sorted(ProfessionMatcher(['Python', 'Программист', 'Java']).find('Программист Python'))
+        [0, 1]
+        >>> ProfessionMatcher(['Python', 'Java']).find('Аналитик')
+        set()
+        """
+        self.professions = list(professions)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        self._found = {}
+        for index, profession in enumerate(self.professions):
+            state = 0
+            for char in profession:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].add(index)
+
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """
+        Находит профессии, названия которых входят в текст. Результат запоминается для каждого текста,
+        так как названия вакансий часто повторяются
+        Args:
+            text (str): Название вакансии
+
+        Returns:
+            set of int: Номера найденных профессий
+        """
+        found = self._found.get(text)
+        if found is not None:
+            return found
+        found = set(self._output[0])
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found |= self._output[state]
+        self._found[text] = found
+        return found
+
+
+class ProfessionsAccumulator(Accumulator):
+    """
+    Накопитель распределения зарплат и количества вакансий по годам сразу для нескольких профессий
+
+    Attributes:
+        matcher (ProfessionMatcher): Автомат поиска профессий в названии вакансии
+        salaries (list of dict): Сумма зарплат по годам для каждой профессии
+        counts (list of dict): Количество вакансий по годам для каждой профессии
+    """
+    def __init__(self, professions):
+        """
+        Инициализирует накопитель
+        Args:
+            professions (list of str): Названия профессий
+        """
+        self.matcher = ProfessionMatcher(professions)
+        self.salaries = [{} for _ in self.matcher.professions]
+        self.counts = [{} for _ in self.matcher.professions]
+
+    def add(self, vacancy, salary):
+        year = vacancy.published_at.year
+        for index in self.matcher.find(vacancy.name):
+            self.salaries[index][year] = self.salaries[index].get(year, 0) + salary
+            self.counts[index][year] = self.counts[index].get(year, 0) + 1
+
+    def merge(self, other):
+        for index in range(len(self.salaries)):
+            for year, salary in other.salaries[index].items():
+                self.salaries[index][year] = self.salaries[index].get(year, 0) + salary
+                self.counts[index][year] = self.counts[index].get(year, 0) + other.counts[index][year]
+
+    def result(self, engine):
+        """
+        Формирует итоговую статистику для всех профессий
+        Args:
+            engine (StatsEngine): Движок, содержащий множество годов датасета
+
+        Returns:
+            dict: Для каждой профессии список из распределения зарплат и распределения кол-ва вакансий по годам
+        """
+        years = sorted(engine.years)
+        return {profession: [{year: math.floor(self.salaries[index][year] / self.counts[index][year])
+                              if year in self.counts[index] else 0 for year in years},
+                             {year: self.counts[index].get(year, 0) for year in years}]
+                for index, profession in enumerate(self.matcher.professions)}
+
+
+class AreaAccumulator(KeyedSalaryAccumulator):
+    """
+    Накопитель распределения зарплат и долей вакансий по городам
+    """
+    def key(self, vacancy):
+        return vacancy.area_name
+
+    def result(self, engine):
+        threshold = math.floor(engine.total * 0.01)
+        cities_salary = {}
+        cities_ratio = {}
+        for city, count in self.counts.items():
+            if count >= threshold:
+                cities_salary[city] = math.floor(self.salaries[city] / count)
+                cities_ratio[city] = round(count / engine.total, 4)
+        return [dict(itertools.islice(sorted(cities_salary.items(), key=lambda item: item[1], reverse=True), 10)),
+                dict(itertools.islice(sorted(cities_ratio.items(), key=lambda item: item[1], reverse=True), 10))]
+
+
+class StatsEngine(object):
+    """
+    Однопроходный движок расчёта статистики: каждая вакансия просматривается один раз,
+    её зарплата конвертируется один раз и передаётся во все накопители
+
+    Attributes:
+        accumulators (dict of Accumulator): Накопители статистики по именам
+        total (int): Количество учтённых вакансий
+        years (set of int): Годы публикации учтённых вакансий
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют, None - курсы из currency_to_rub
+    """
+    def __init__(self, accumulators, rates=None):
+        """
+        Инициализирует движок
+        Args:
+            accumulators (dict of Accumulator): Накопители статистики по именам
+            rates (currencyRates.RateMatrix or None): Исторические курсы валют, None - курсы из currency_to_rub
+        """
+        self.accumulators = accumulators
+        self.rates = rates
+        self.total = 0
+        self.years = set()
+
+    def add(self, vacancy):
+        """
+        Передает вакансию во все накопители
+        Args:
+            vacancy (Vacancy): Объект вакансии
+        """
+        if self.rates is None:
+            salary = vacancy.salary.convert()
+        else:
+            salary = vacancy.salary.convert(self.rates.rate(vacancy.salary.salary_currency, vacancy.published_at.year,
+                                                            int(vacancy.published_at.month), currency_to_rub))
+        self.total += 1
+        self.years.add(vacancy.published_at.year)
+        for accumulator in self.accumulators.values():
+            accumulator.add(vacancy, salary)
+
+    def consume(self, vacancies):
+        """
+        Учитывает все вакансии из итерируемого объекта, в том числе из генератора stream_vacancies
+        Args:
+            vacancies (iterable of Vacancy): Вакансии
+
+        Returns:
+            StatsEngine: Этот же движок
+        """
+        for vacancy in vacancies:
+            self.add(vacancy)
+        return self
+
+    def merge(self, other):
+        """
+        Объединяет движок с движком, посчитанным по другой части данных с тем же набором накопителей
+        Args:
+            other (StatsEngine): Движок с частичными результатами
+
+        Returns:
+            StatsEngine: Этот же движок
+        """
+        self.total += other.total
+        self.years.update(other.years)
+        for name, accumulator in self.accumulators.items():
+            accumulator.merge(other.accumulators[name])
+        return self
+
+    def results(self):
+        """
+        Формирует итоговую статистику всех накопителей
+        Returns:
+            dict: Результаты накопителей по их именам
+        """
+        return {name: accumulator.result(self) for name, accumulator in self.accumulators.items()}
+
+
+def full_stats_engine(profession, rates=None):
+    """
+    Создает движок со всеми накопителями, необходимыми для отчёта
+    Args:
+        profession (str): Название профессии
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют
+
+    Returns:
+        StatsEngine: Движок с накопителями 'year', 'profession' и 'area'
+    """
+    return StatsEngine({'year': YearAccumulator(),
+                        'profession': ProfessionAccumulator(profession),
+                        'area': AreaAccumulator()}, rates)
+
+
+def range_stats(rows, profession, rates=None):
+    """
+    Считает частичную статистику по строкам одного диапазона файла в дочернем процессе
+    Args:
+        rows (iterable of list of str): Строки данных диапазона
+        profession (str): Название профессии
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют
+
+    Returns:
+        StatsEngine: Движок с частичными результатами накопителей
+    """
+    return full_stats_engine(profession, rates).consume(Vacancy(vacancy) for vacancy in rows)
+
+
+def parallel_stats(file_path, profession, processes=None, rates=None):
+    """
+    Параллельно считает статистику для отчёта: каждый процесс разбирает свой диапазон байтов файла
+    или свой раздел каталога разделов и возвращает только частичные агрегаты, которые затем объединяются
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях или к каталогу разделов
+        profession (str): Название профессии
+        processes (int): Количество процессов, по умолчанию - количество ядер
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют
+
+    Returns:
+        list of dict: Шесть словарей статистики в порядке, который ожидает Report
+    """
+    if vacancyPartitions.is_partitioned(file_path):
+        engines = vacancyPartitions.map_partitions(file_path, vacancyPartitions.read_manifest(file_path)['partitions'],
+                                                   range_stats, (profession, rates), processes)
+    else:
+        _, engines = parallelReader.map_ranges(file_path, range_stats, (profession, rates), processes)
+    engine = functools.reduce(StatsEngine.merge, engines, full_stats_engine(profession, rates))
+    results = engine.results()
+    return results['year'] + results['profession'] + results['area']
+
+
+class VacancyColumns(object):
+    """
+    Колоночное представление датасета для векторизованного расчёта статистики
+
+    Attributes:
+        years (np.ndarray of int): Год публикации каждой вакансии
+        salaries (np.ndarray of float): Зарплата каждой вакансии, конвертированная в рубли
+        area_codes (np.ndarray of int): Код региона каждой вакансии
+        area_names (list of str): Названия регионов в порядке первого появления, индекс - код региона
+        name_codes (np.ndarray of int): Код названия каждой вакансии
+        names (list of str): Уникальные названия вакансий, индекс - код названия
+    """
+    def __init__(self, rows, rates=None):
+        """
+        Инициализирует колоночное представление за один проход по строкам csv-файла
+        Args:
+            rows (iterable of list of str): Заголовок и строки данных, например результат parallelReader.read_rows
+            rates (currencyRates.RateMatrix or None): Исторические курсы валют, по которым зарплаты конвертируются
+                по месяцу публикации, None - курсы из currency_to_rub
+
+        >>> columns = VacancyColumns(iter([['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'], ['Программист', '10', '20', 'EUR', 'Москва', '2022-07-15T09:56:52+0300']]))
+        >>> len(columns)
+        1
+        >>> columns.salary_by_year()
+        [{2022: 898}, {2022: 1}]
+        """
+        header = next(rows, None) or []
+        position = {title: index for index, title in enumerate(header)}
+        name_i, from_i, to_i = position.get('name'), position.get('salary_from'), position.get('salary_to')
+        currency_i, area_i, date_i = position.get('salary_currency'), position.get('area_name'), \
+            position.get('published_at')
+
+        years, months, salaries_from, salaries_to, currency_codes, area_codes, name_codes = [], [], [], [], [], [], []
+        currencies, areas, names = {}, {}, {}
+        for vacancy in rows:
+            years.append(int(vacancy[date_i][:4]))
+            months.append(int(vacancy[date_i][5:7]))
+            salaries_from.append(int(float(vacancy[from_i])))
+            salaries_to.append(int(float(vacancy[to_i])))
+            currency_codes.append(currencies.setdefault(vacancy[currency_i], len(currencies)))
+            area_codes.append(areas.setdefault(vacancy[area_i], len(areas)))
+            name_codes.append(names.setdefault(vacancy[name_i], len(names)))
+
+        self.years = np.array(years, dtype=np.int64)
+        currency_codes = np.array(currency_codes, dtype=np.intp)
+        if rates is None:
+            rates = np.array([currency_to_rub[currency] for currency in currencies], dtype=np.float64)[currency_codes]
+        else:
+            rates = rates.rates_for(np.array(list(currencies), dtype=object)[currency_codes], self.years,
+                                    np.array(months, dtype=np.int64), currency_to_rub)
+        self.salaries = (np.array(salaries_from, dtype=np.float64) + np.array(salaries_to, dtype=np.float64)) / 2 \
+            * rates
+        self.area_codes = np.array(area_codes, dtype=np.intp)
+        self.area_names = list(areas)
+        self.name_codes = np.array(name_codes, dtype=np.intp)
+        self.names = list(names)
+
+    def __len__(self):
+        return len(self.years)
+
+    def _by_year(self, mask=None):
+        """
+        Группирует суммы зарплат и количество вакансий по годам
+        Args:
+            mask (np.ndarray of bool): Маска учитываемых вакансий, по умолчанию учитываются все
+
+        Returns:
+            tuple: Отсортированные годы, суммы зарплат и количества вакансий по этим годам
+        """
+        years, year_codes = np.unique(self.years, return_inverse=True)
+        weights = self.salaries if mask is None else np.where(mask, self.salaries, 0)
+        counts = np.bincount(year_codes, weights=None if mask is None else mask, minlength=len(years))
+        sums = np.bincount(year_codes, weights=weights, minlength=len(years))
+        return years, sums, counts
+
+    def salary_by_year(self):
+        """
+        Формирует распределение зарплат и количества вакансий по годам
+        Returns:
+            list of dict: Распределение зарплат по годам и распределение кол-ва вакансий по годам
+        """
+        years, sums, counts = self._by_year()
+        return [{int(year): math.floor(float(total) / int(count)) for year, total, count in zip(years, sums, counts)},
+                {int(year): int(count) for year, count in zip(years, counts)}]
+
+    def salary_by_profession(self, profession):
+        """
+        Формирует распределение зарплат и количества вакансий по годам для профессии. Проверка вхождения
+        названия профессии выполняется один раз для каждого уникального названия вакансии
+        Args:
+            profession (str): Название профессии
+
+        Returns:
+            list of dict: Распределение зарплат по годам и распределение кол-ва вакансий по годам для профессии
+        """
+        matches = np.array([profession in name for name in self.names], dtype=bool)
+        mask = matches[self.name_codes] if len(self.names) else np.zeros(0, dtype=bool)
+        years, sums, counts = self._by_year(mask)
+        return [{int(year): math.floor(float(total) / int(count)) if count else 0
+                 for year, total, count in zip(years, sums, counts)},
+                {int(year): int(count) for year, count in zip(years, counts)}]
+
+    def salary_by_professions(self, professions):
+        """
+        Формирует распределения зарплат и количества вакансий по годам сразу для нескольких профессий.
+        Автомат ProfessionMatcher проходит по каждому уникальному названию вакансии один раз
+        Args:
+            professions (list of str): Названия профессий
+
+        Returns:
+            dict: Для каждой профессии список из распределения зарплат и распределения кол-ва вакансий по годам
+        """
+        matcher = ProfessionMatcher(professions)
+        matches = np.zeros((len(matcher.professions), len(self.names)), dtype=bool)
+        for code, name in enumerate(self.names):
+            for index in matcher.find(name):
+                matches[index, code] = True
+        result = {}
+        for index, profession in enumerate(matcher.professions):
+            years, sums, counts = self._by_year(matches[index][self.name_codes])
+            result[profession] = [{int(year): math.floor(float(total) / int(count)) if count else 0
+                                   for year, total, count in zip(years, sums, counts)},
+                                  {int(year): int(count) for year, count in zip(years, counts)}]
+        return result
+
+    def salary_by_area(self):
+        """
+        Формирует распределение зарплат и долей вакансий по городам, в которых размещено не менее 1% вакансий
+        Returns:
+            list of dict: Десять городов с наибольшей зарплатой и десять городов с наибольшей долей вакансий
+        """
+        length = len(self)
+        counts = np.bincount(self.area_codes, minlength=len(self.area_names))
+        sums = np.bincount(self.area_codes, weights=self.salaries, minlength=len(self.area_names))
+        threshold = math.floor(length * 0.01)
+        cities_salary = {}
+        cities_ratio = {}
+        for code in np.flatnonzero(counts >= threshold):
+            city = self.area_names[code]
+            cities_salary[city] = math.floor(float(sums[code]) / int(counts[code]))
+            cities_ratio[city] = round(int(counts[code]) / length, 4)
+        return [dict(itertools.islice(sorted(cities_salary.items(), key=lambda item: item[1], reverse=True), 10)),
+                dict(itertools.islice(sorted(cities_ratio.items(), key=lambda item: item[1], reverse=True), 10))]
+
+    def get_full_dict_list(self, profession):
+        """
+        Объединяет распределения зарплат по годам, по годам для профессии и по городам
+        Args:
+            profession (str): Название профессии
+
+        Returns:
+            list of dict: Шесть словарей статистики в порядке, который ожидает Report
+        """
+        return self.salary_by_year() + self.salary_by_profession(profession) + self.salary_by_area()
+
+
 class DataSet(object):
     """
     Класс для представления датасета
 
     Attributes:
         vacancies (list of Vacancy objects): Список вакансий датасета
+        columns (VacancyColumns or None): Колоночное представление датасета, если оно было запрошено
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют, None - курсы из currency_to_rub
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, columnar=False, use_cache=False, processes=None, rates=None, years=None):
         """
-        Инициализирует объект датасета
+        Инициализирует объект датасета. Вместо csv-файла можно передать каталог разделов, созданный
+        vacancyPartitions.partition_csv; если заданы годы, читаются только разделы с вакансиями за эти годы
         Args:
-            file_path (str): Путь к csv-файлу с данными о вакансиях
+            file_path (str): Путь к csv-файлу с данными о вакансиях или к каталогу разделов
+            columnar (bool): Загрузить данные в колоночное представление вместо списка объектов Vacancy
+            use_cache (bool): Читать данные из двоичного кэша рядом с csv-файлом и создавать его при отсутствии
+            processes (int or None): Количество процессов для параллельного разбора файла
+            rates (currencyRates.RateMatrix or None): Исторические курсы валют для конвертации зарплат
+            years (iterable of int or None): Годы публикации учитываемых вакансий, None - все годы
 
         >>> type(DataSet('vacancies.csv')).__name__
         'DataSet'
         """
-        vacancies_objs = []
-        with open(file_path, encoding="utf-8-sig") as File:
-            if os.stat(file_path).st_size == 0:
-                self.vacancies = 'Пустой файл'
-            else:
-                reader = csv.reader(File, delimiter=',', quotechar='"')
-                for vacancy in reader:
-                    if all(vacancy):
-                        vacancies.append(vacancy)
-                        if len(vacancy) < len(vacancies[0]):
-                            vacancies.remove(vacancy)
-
-            if len(vacancies) == 1:
-                self.vacancies = 'Нет данных'
-            elif len(vacancies) != 0:
-                for vacancy in vacancies[1::]:
-                    vacancies_objs.append(Vacancy(vacancy))
-                self.vacancies = vacancies_objs
-
-    # Получаем датасет распределения зарплаты по годам
+        self.columns = None
+        self.rates = rates
+        if not vacancyPartitions.is_partitioned(file_path) and os.stat(file_path).st_size == 0:
+            self.vacancies = 'Пустой файл'
+            return
+        if columnar:
+            self.columns = VacancyColumns(open_rows(file_path, use_cache, processes, years), rates)
+            self.vacancies = None if len(self.columns) else 'Нет данных'
+            return
+        self.vacancies = list(stream_vacancies(file_path, use_cache, processes, years))
+        if len(self.vacancies) == 0:
+            self.vacancies = 'Нет данных'
+
+    def statistics(self, accumulators):
+        """
+        Считает статистику по списку вакансий датасета. Все промежуточные данные принадлежат накопителям
+        этого вызова, поэтому расчёты для разных датасетов и профессий не влияют друг на друга
+        Args:
+            accumulators (dict of Accumulator): Накопители статистики по именам
+
+        Returns:
+            dict: Результаты накопителей по их именам
+        """
+        return StatsEngine(accumulators, self.rates).consume(self.vacancies).results()
+
     def salary_by_year(self):
         """
         Формирует датасет распределения зарплат по годам
@@ -406,46 +1259,24 @@ class DataSet(object):
             list of dict: Список из двух словарей: распределение зарплат по годам
             и распределение кол-ва вакансий по годам
         """
-        for vacancy in self.vacancies:
-            if int(vacancy.published_at.year) not in list(dic_salaries.keys()):
-                dic_salaries.update({vacancy.published_at.year: 0})
-                dic_counter.update({vacancy.published_at.year: 0})
-            dic_salaries[vacancy.published_at.year] += vacancy.salary.convert()
-            dic_counter[vacancy.published_at.year] += 1
-        self.years = (dic_salaries.keys())
-        for year in self.years:
-            dic_salaries.update({year: math.floor(dic_salaries[year] / dic_counter[year])})
-            dic_counter.update({year: math.floor(dic_counter[year])})
-        return [dic_salaries, dic_counter]
-
-    # Получаем датасет распределения зарплаты по профессиям
-    def salary_by_profession(self):
-        """
-        Формирует датасет распределения зарплат по профессиям
+        if self.columns is not None:
+            return self.columns.salary_by_year()
+        return self.statistics({'year': YearAccumulator()})['year']
+
+    def salary_by_profession(self, profession):
+        """
+        Формирует датасет распределения зарплат по годам для профессии
+        Args:
+            profession (str): Название профессии
+
         Returns:
-            list of dict: Список из двух словарей: распределение зарплат по профессиям и
-            распределение кол-ва вакансий по профессиям
-        """
-        for vacancy in self.vacancies:
-            if profession in vacancy.name:
-                if int(vacancy.published_at.year) not in list(dic_salaries_by_profession.keys()):
-                    dic_salaries_by_profession.update({vacancy.published_at.year: 0})
-                    dic_counter_by_profession.update({vacancy.published_at.year: 0})
-                dic_salaries_by_profession[vacancy.published_at.year] += vacancy.salary.convert()
-                dic_counter_by_profession[vacancy.published_at.year] += 1
-        if len(dic_salaries_by_profession) == 0:
-            dic_salaries_by_profession.clear()
-            dic_counter_by_profession.clear()
-            dic_salaries_by_profession.update(dict({x: 0 for x in self.years}))
-            dic_counter_by_profession.update(dict({x: 0 for x in self.years}))
-            return [dic_salaries_by_profession, dic_counter_by_profession]
-        for year in self.years:
-            dic_salaries_by_profession.update({year: math.floor(dic_salaries_by_profession[year] /
-                                                                dic_counter_by_profession[year])})
-            dic_counter_by_profession.update({year: dic_counter_by_profession[year]})
-        return [dic_salaries_by_profession, dic_counter_by_profession]
-
-    # Получаем датасет распределения зарплаты по городам
+            list of dict: Список из двух словарей: распределение зарплат по годам для профессии и
+            распределение кол-ва вакансий по годам для профессии
+        """
+        if self.columns is not None:
+            return self.columns.salary_by_profession(profession)
+        return self.statistics({'profession': ProfessionAccumulator(profession)})['profession']
+
     def salary_by_area(self):
         """
         Формирует датасет распределения зарплат по городам
@@ -453,48 +1284,307 @@ class DataSet(object):
             list of dict: Список из двух отсортированных по убыванию словарей: распределение зарплат по городам и
             распределение кол-ва вакансий по городам
         """
-        for vacancy in self.vacancies:
-            if vacancy.area_name not in list(dic_cities_salary.keys()):
-                dic_cities_salary.update({vacancy.area_name: 0})
-                dic_cities_ratio.update({vacancy.area_name: 0})
-            dic_cities_salary[vacancy.area_name] += vacancy.salary.convert()
-            dic_cities_ratio[vacancy.area_name] += 1
-        length = len(self.vacancies)
-        for city in list(dic_cities_salary.keys()):
-            if dic_cities_ratio[city] >= math.floor(length * 0.01):
-                cities_list.append(city)
-                new_dic_cities_salary.update({city: dic_cities_salary[city]})
-                new_dic_cities_ratio.update({city: dic_cities_ratio[city]})
-            else:
-                del dic_cities_salary[city]
-                del dic_cities_ratio[city]
-        for city in cities_list:
-            dic_cities_salary.update({city: math.floor(new_dic_cities_salary[city] / new_dic_cities_ratio[city])})
-            dic_cities_ratio.update({city: round(new_dic_cities_ratio[city] / length, 4)})
-        return [dict(itertools.islice(sorted(dic_cities_salary.items(), key=lambda item: item[1], reverse=True), 10)),
-                dict(itertools.islice(sorted(dic_cities_ratio.items(), key=lambda item: item[1], reverse=True), 10))]
-
-    def get_full_dict_list(self):
+        if self.columns is not None:
+            return self.columns.salary_by_area()
+        return self.statistics({'area': AreaAccumulator()})['area']
+
+    def salary_by_professions(self, professions):
+        """
+        Формирует распределения зарплат и количества вакансий по годам сразу для нескольких профессий
+        за один проход по датасету
+        Args:
+            professions (list of str): Названия профессий
+
+        Returns:
+            dict: Для каждой профессии список из распределения зарплат и распределения кол-ва вакансий по годам
+        """
+        if self.columns is not None:
+            return self.columns.salary_by_professions(professions)
+        return self.statistics({'professions': ProfessionsAccumulator(professions)})['professions']
+
+    def get_full_dict_list(self, profession):
         """
         Объединяет датасеты распределения зарплат по годам, распределения зарплат по профессиям и
         распределения зарплат по городам
+        Args:
+            profession (str): Название профессии
+
         Returns:
             list of dict: Датасет, образованный объединением трёх датасетов распределения зарплат по годам,
             распределения зарплат по профессиям и распределения зарплат по городам
         """
-        return data.salary_by_year() + data.salary_by_profession() + data.salary_by_area()
+        if self.columns is not None:
+            return self.columns.get_full_dict_list(profession)
+        results = full_stats_engine(profession, self.rates).consume(self.vacancies).results()
+        return results['year'] + results['profession'] + results['area']
 
 
-vacancies = []
-cities_list = []
-dic_salaries = {}
-dic_counter = {}
-dic_salaries_by_profession = {}
-dic_counter_by_profession = {}
-dic_cities_salary = {}
-dic_cities_ratio = {}
-new_dic_cities_salary = {}
-new_dic_cities_ratio = {}
+def freeze_stats(dic_list):
+    """
+    Делает словари статистики неизменяемыми, чтобы результат одного расчёта можно было безопасно
+    передавать нескольким потокам
+    Args:
+        dic_list (list of dict): Словари статистики
+
+    Returns:
+        tuple of types.MappingProxyType: Неизменяемые копии словарей
+
+    >>> freeze_stats([{2022: 100}])[0][2022]
+    100
+    """
+    return tuple(types.MappingProxyType(dict(dic)) for dic in dic_list)
+
+
+def file_stats(file_path, professions, use_cache=False, rates=None):
+    """
+    Считает статистику для отчёта по одному файлу сразу для нескольких профессий. Файл разбирается
+    один раз в колоночное представление, которое принадлежит только этому вызову
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях
+        professions (list of str): Названия профессий
+        use_cache (bool): Использовать двоичный кэш разобранного csv-файла
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют
+
+    Returns:
+        types.MappingProxyType or str: Шесть неизменяемых словарей статистики по названиям профессий
+        или сообщение об отсутствии данных
+    """
+    data = DataSet(file_path, columnar=True, use_cache=use_cache, rates=rates)
+    if isinstance(data.vacancies, str):
+        return data.vacancies
+    return types.MappingProxyType({profession: freeze_stats(data.columns.get_full_dict_list(profession))
+                                   for profession in professions})
+
+
+def run_stats_jobs(jobs, max_workers=None, use_cache=False, rates=None):
+    """
+    Выполняет задания расчёта статистики (файл, профессия) в пуле потоков. Задания для одного файла
+    объединяются, поэтому каждый файл разбирается один раз
+    Args:
+        jobs (iterable of tuple): Пары (путь к csv-файлу, название профессии)
+        max_workers (int or None): Количество потоков
+        use_cache (bool): Использовать двоичный кэш разобранных csv-файлов
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют, общие для всех заданий
+
+    Returns:
+        types.MappingProxyType: Результат file_stats для каждой пары (путь к файлу, профессия)
+    """
+    professions = {}
+    for file_path, profession in jobs:
+        professions.setdefault(file_path, []).append(profession)
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {file_path: executor.submit(file_stats, file_path, names, use_cache, rates)
+                   for file_path, names in professions.items()}
+    results = {}
+    for file_path, future in futures.items():
+        stats = future.result()
+        for profession in professions[file_path]:
+            results[file_path, profession] = stats if isinstance(stats, str) else stats[profession]
+    return types.MappingProxyType(results)
+
+
+def timed_call(function, args):
+    """
+    Выполняет функцию и измеряет время её выполнения
+    Args:
+        function (function): Функция
+        args (tuple): Аргументы функции
+
+    Returns:
+        tuple: Результат функции и время выполнения в секундах
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run_tasks(tasks, max_workers=None):
+    """
+    Выполняет граф задач в пуле процессов. Задача запускается, как только завершены все задачи, от которых
+    она зависит, поэтому независимые задачи выполняются одновременно. Ошибка задачи не прерывает остальные:
+    она запоминается, а задачи, зависящие от неё, не запускаются
+    Args:
+        tasks (dict): Задачи по именам: функция уровня модуля или метод, кортеж аргументов и список имен
+            задач, от которых она зависит
+        max_workers (int or None): Количество процессов
+
+    Returns:
+        tuple: Результат и время выполнения в секундах для каждой успешной задачи в порядке завершения
+        и исключение для каждой неудачной или не запущенной задачи
+
+    Raises:
+        ValueError: Если задача зависит от отсутствующей задачи или зависимости образуют цикл
+    """
+    for dependencies in (task[2] for task in tasks.values()):
+        for dependency in dependencies:
+            if dependency not in tasks:
+                raise ValueError(f'Неизвестная задача: {dependency}')
+    waiting, running, results, failures = dict(tasks), {}, {}, {}
+    with ProcessPoolExecutor(max_workers) as executor:
+        while waiting or running:
+            blocked = True
+            while blocked:
+                blocked = [name for name, task in waiting.items() if any(dependency in failures
+                                                                         for dependency in task[2])]
+                for name in blocked:
+                    failed = [dependency for dependency in waiting.pop(name)[2] if dependency in failures]
+                    failures[name] = RuntimeError(f'Не выполнены задачи: {", ".join(failed)}')
+            for name in [name for name, task in waiting.items() if all(dependency in results for dependency in task[2])]:
+                function, args, _ = waiting.pop(name)
+                running[executor.submit(timed_call, function, args)] = name
+            if not running:
+                if waiting:
+                    raise ValueError(f'Зависимости задач образуют цикл: {", ".join(waiting)}')
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as error:
+                    failures[name] = error
+    return results, failures
+
+
+def select_tasks(tasks, names):
+    """
+    Оставляет в графе задачи с заданными именами и все задачи, от которых они зависят
+    Args:
+        tasks (dict): Задачи для run_tasks
+        names (iterable of str): Имена нужных задач
+
+    Returns:
+        dict: Выбранные задачи в исходном порядке
+
+    Raises:
+        ValueError: Если задачи с таким именем нет
+
+    >>> list(select_tasks({'image': (abs, (1,), []), 'pdf': (abs, (1,), ['image']), 'excel': (abs, (1,), [])}, ['pdf']))
+    ['image', 'pdf']
+    """
+    selected, pending = set(), list(names)
+    while pending:
+        name = pending.pop()
+        if name not in tasks:
+            raise ValueError(f'Неизвестная задача: {name}')
+        if name not in selected:
+            selected.add(name)
+            pending.extend(tasks[name][2])
+    return {name: task for name, task in tasks.items() if name in selected}
+
+
+# Имена задач отчёта, которые формирует report_tasks
+REPORT_TASKS = ('excel', 'image', 'pdf')
+
+
+def report_tasks(report, dic_list, directory='.', chart_workers=None, cache_directory=CHART_CACHE):
+    """
+    Формирует граф задач отчёта: excel-документ и диаграммы не зависят друг от друга, pdf-документ
+    строится после диаграмм
+    Args:
+        report (Report): Отчёт
+        dic_list (list of dictionaries): Список словарей статистических даннных для всех профессий и городов
+        directory (str): Каталог, в который записываются report.xlsx, graph.png и report.pdf
+        chart_workers (int or None): Количество процессов для рисования диаграмм
+        cache_directory (str): Каталог кэша изображений диаграмм
+
+    Returns:
+        dict: Задачи для run_tasks
+    """
+    dic_list = [dict(dic) for dic in dic_list]
+    image_path = os.path.join(directory, 'graph.png')
+    return {'excel': (report.generate_excel, (dic_list, os.path.join(directory, 'report.xlsx')), []),
+            'image': (report.generate_image, (dic_list, image_path, cache_directory, chart_workers), []),
+            'pdf': (report.generate_pdf, (dic_list, os.path.join(directory, 'report.pdf'), image_path), ['image'])}
+
+
+def report_headers(profession):
+    """
+    Формирует заголовки листов отчёта для профессии
+    Args:
+        profession (str): Название профессии
+
+    Returns:
+        dict: Заголовки столбцов по названиям листов
+    """
+    return {'Статистика по годам': ['Год', 'Средняя зарплата', f'Средняя зарплата - {profession}',
+                                    'Количество вакансий', f'Количество вакансий - {profession}'],
+            'Статистика по городам': ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']}
+
+
+def report_directory_name(profession, used):
+    """
+    Формирует имя каталога отчёта профессии, допустимое в файловой системе и не совпадающее с уже выданными
+    Args:
+        profession (str): Название профессии
+        used (set of str): Уже выданные имена, пополняется новым именем
+
+    Returns:
+        str: Имя каталога
+
+    >>> report_directory_name('Программист 1С', set())
+    'Программист_1С'
+    >>> report_directory_name('C/C++', {'C_C++'})
+    'C_C++_1'
+    """
+    stem = re.sub(r'[\\/:*?"<>|\s]', '_', profession.strip()) or '_'
+    name, number = stem, 0
+    while name in used:
+        number += 1
+        name = f'{stem}_{number}'
+    used.add(name)
+    return name
+
+
+def batch_reports(file_path, professions, output_directory='reports', use_cache=False, max_workers=None, rates=None,
+                  formats=REPORT_TASKS, cache_directory=CHART_CACHE, cache_limit=CHART_CACHE_LIMIT):
+    """
+    Формирует отчёты сразу для нескольких профессий. Файл разбирается один раз, статистика по годам и по
+    городам считается один раз, а статистика профессий - за один проход автомата ProfessionMatcher.
+    Отчёты профессий формируются параллельно, каждый в своем каталоге; диаграммы по городам у всех
+    отчётов одинаковые и рисуются один раз благодаря кэшу диаграмм
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях или к каталогу разделов
+        professions (list of str): Названия профессий
+        output_directory (str): Каталог, в котором создаются каталоги отчётов профессий
+        use_cache (bool): Использовать двоичный кэш разобранного csv-файла
+        max_workers (int or None): Количество процессов для формирования отчётов
+        rates (currencyRates.RateMatrix or None): Исторические курсы валют
+        formats (iterable of str): Формируемые части отчёта из REPORT_TASKS; задачи, от которых они
+            зависят, например диаграммы для pdf-документа, добавляются автоматически
+        cache_directory (str): Каталог кэша изображений диаграмм
+        cache_limit (int): Наибольший размер кэша диаграмм, до которого он сокращается после формирования отчётов
+
+    Returns:
+        tuple or str: Каталоги отчётов по названиям профессий, время выполнения успешных задач отчётов и
+        ошибки неудачных задач или сообщение об отсутствии данных
+
+    Raises:
+        ValueError: Если среди formats есть неизвестная часть отчёта
+    """
+    unknown = [part for part in formats if part not in REPORT_TASKS]
+    if unknown:
+        raise ValueError(f'Неизвестная часть отчёта: {", ".join(unknown)}')
+    data = DataSet(file_path, columnar=True, use_cache=use_cache, rates=rates)
+    if isinstance(data.vacancies, str):
+        return data.vacancies
+    professions = list(dict.fromkeys(professions))
+    by_year, by_area = data.salary_by_year(), data.salary_by_area()
+    by_profession = data.salary_by_professions(professions)
+    directories, tasks, used = {}, {}, set()
+    for profession in professions:
+        directories[profession] = os.path.join(output_directory, report_directory_name(profession, used))
+        os.makedirs(directories[profession], exist_ok=True)
+        report = Report(report_headers(profession), Side(style='thin', color="000000"), profession)
+        dic_list = by_year + by_profession[profession] + by_area
+        profession_tasks = select_tasks(report_tasks(report, dic_list, directories[profession], 1, cache_directory),
+                                        formats)
+        for name, (function, args, dependencies) in profession_tasks.items():
+            tasks[f'{profession}: {name}'] = (function, args, [f'{profession}: {dependency}'
+                                                               for dependency in dependencies])
+    results, failures = run_tasks(tasks, max_workers)
+    prune_chart_cache(cache_directory, cache_limit)
+    return directories, {name: seconds for name, (_, seconds) in results.items()}, failures
 
 
 def PrintStats():
@@ -502,22 +1592,48 @@ def PrintStats():
     Создает excel-документ с статистическими данными, png-изображение с диаграммами и pdf-документ с
     таблицами и диаграммами
     """
-    global file, profession, data
     file = input('Введите название файла: ')
     profession = input('Введите название профессии: ')
-    data = DataSet(file)
-    full_dict_list = data.get_full_dict_list()
+    data = DataSet(file, use_cache=True)
+    full_dict_list = data.get_full_dict_list(profession)
     print(f'Динамика уровня зарплат по годам: {full_dict_list[0]}')
     print(f'Динамика количества вакансий по годам: {full_dict_list[1]}')
     print(f'Динамика уровня зарплат по годам для выбранной профессии: {full_dict_list[2]}')
     print(f'Динамика количества вакансий по годам для выбранной профессии: {full_dict_list[3]}')
     print(f'Уровень зарплат по городам (в порядке убывания): {full_dict_list[4]}')
     print(f'Доля вакансий по городам (в порядке убывания): {full_dict_list[5]}')
-    report = Report({'Статистика по годам': ['Год', 'Средняя зарплата', f'Средняя зарплата - {profession}',
-                                             'Количество вакансий', f'Количество вакансий - {profession}'],
-                     'Статистика по городам': ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']},
-                    Side(style='thin', color="000000"))
-    report.generate_excel(full_dict_list)
-    report.generate_image(full_dict_list)
-    report.generate_pdf()
+    report = Report(report_headers(profession), Side(style='thin', color="000000"), profession)
+    results, failures = run_tasks(report_tasks(report, full_dict_list))
+    prune_chart_cache()
+    for name, (_, seconds) in results.items():
+        print(f'{name}: {seconds:.2f} с')
+    for name, error in failures.items():
+        print(f'{name}: ошибка - {error}')
+
 
+def PrintBatchStats():
+    """
+    Создает отчёты для нескольких профессий по одному файлу, каждый в своем каталоге
+    """
+    file = input('Введите название файла: ')
+    professions = [profession.strip() for profession in input('Введите названия профессий через запятую: ').split(',')]
+    output_directory = input('Введите каталог для отчётов: ') or 'reports'
+    formats = [part.strip() for part in input(f'Введите части отчёта через запятую ({", ".join(REPORT_TASKS)}): ')
+               .split(',')]
+    formats = [part for part in formats if part] or REPORT_TASKS
+    try:
+        result = batch_reports(file, [profession for profession in professions if profession], output_directory,
+                               use_cache=True, formats=formats)
+    except ValueError as error:
+        print(error)
+        return
+    if isinstance(result, str):
+        print(result)
+        return
+    directories, timings, failures = result
+    for profession, directory in directories.items():
+        print(f'{profession}: {directory}')
+    for name, seconds in timings.items():
+        print(f'{name}: {seconds:.2f} с')
+    for name, error in failures.items():
+        print(f'{name}: ошибка - {error}')
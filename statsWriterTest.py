@@ -1,5 +1,16 @@
+import csv
+import json
+import os
+import pathlib
+import re
+import tempfile
+import time
 import unittest
+from openpyxl import load_workbook
 from statsWriter import *
+from parallelReader import read_rows
+from currencyRates import RateMatrix, convert_csv, CachedSource, DirectorySource, update_rates
+from vacancyPartitions import partition_csv, MANIFEST_NAME
 
 
 class StatsWriterTests(unittest.TestCase):
@@ -12,6 +23,98 @@ class StatsWriterTests(unittest.TestCase):
                          Side(style='thin', color="000000")).ws_titles_headers),
                          ["First_Worksheet", "Second_Worksheet", "Third_Worksheet"])
 
+    def test_generate_excel(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'report.xlsx')
+            report = Report({'Статистика по годам': ['Год', 'Средняя зарплата', 'Средняя зарплата - Аналитик',
+                                                     'Количество вакансий', 'Количество вакансий - Аналитик'],
+                             'Статистика по городам': ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']},
+                            Side(style='thin', color="000000"), 'Аналитик')
+            report.generate_excel([{2021: 15, 2022: 469}, {2021: 1, 2022: 2}, {2021: 0, 2022: 898},
+                                   {2021: 0, 2022: 1}, {'Москва': 456}, {'Москва': 0.6667, 'Санкт-Петербург': 0.3333}],
+                                  file_path, {'Города': (['Город', 'Количество'],
+                                                         ([f'Город {index}', index] for index in range(1000)))})
+            book = load_workbook(file_path)
+            self.assertEqual(book.sheetnames, ['Статистика по годам', 'Статистика по городам', 'Города'])
+            by_year, by_city, cities = book.worksheets
+            self.assertEqual([[cell.value for cell in row] for row in by_year.iter_rows(min_row=2)],
+                             [[2021, 15, 0, 1, 0], [2022, 469, 898, 2, 1]])
+            self.assertEqual([[cell.value for cell in row] for row in by_city.iter_rows(min_row=2)],
+                             [['Москва', 456, None, 'Москва', 0.6667], [None, None, None, 'Санкт-Петербург', 0.3333]])
+            self.assertTrue(by_year['A1'].font.b)
+            self.assertIsNone(by_city['C1'].border.left.style)
+            self.assertEqual(by_city['E2'].number_format, FORMAT_PERCENTAGE_00)
+            self.assertEqual(by_year.column_dimensions['C'].width, len('Средняя зарплата - Аналитик') + 2)
+            self.assertEqual(by_city.column_dimensions['D'].width, len('Санкт-Петербург') + 2)
+            self.assertEqual(cities.max_row, 1001)
+            self.assertEqual(cities['A1001'].value, 'Город 999')
+
+    def test_render_html(self):
+        report = Report({'Статистика по годам': ['Год', 'Средняя зарплата', 'Средняя зарплата - Аналитик',
+                                                 'Количество вакансий', 'Количество вакансий - Аналитик'],
+                         'Статистика по городам': ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']},
+                        Side(style='thin', color="000000"), 'Аналитик')
+        html = report.render_html([{2022: 469}, {2022: 2}, {2022: 898}, {2022: 1}, {'Москва': 456},
+                                   {'Москва': 0.6667, 'Пермь': 0.3333}], 'graph.png')
+        self.assertIn('для профессии Аналитик', html)
+        self.assertIn(f'src="{pathlib.Path("graph.png").resolve().as_uri()}"', html)
+        self.assertEqual(re.findall(r'<td>(.*?)</td>', html),
+                         ['Год', 'Средняя зарплата', 'Средняя зарплата - Аналитик', 'Количество вакансий',
+                          'Количество вакансий - Аналитик', '2022', '469', '898', '2', '1',
+                          'Город', 'Уровень зарплат', 'Москва', '456',
+                          'Город', 'Доля вакансий', 'Москва', '66,67%', 'Пермь', '33,33%'])
+        self.assertIs(report_template(), report_template())
+
+    def test_run_tasks(self):
+        report = Report({'Статистика по годам': ['Год', 'Средняя зарплата', 'Средняя зарплата - Аналитик',
+                                                 'Количество вакансий', 'Количество вакансий - Аналитик'],
+                         'Статистика по городам': ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']},
+                        Side(style='thin', color="000000"), 'Аналитик')
+        dic_list = freeze_stats([{2022: 469}, {2022: 2}, {2022: 898}, {2022: 1}, {'Москва': 456}, {'Москва': 1.0}])
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'report.xlsx')
+            results, failures = run_tasks({'excel': (report.generate_excel, (list(map(dict, dic_list)), file_path), []),
+                                           'sleep': (time.sleep, (0.2,), []),
+                                           'check': (os.path.exists, (file_path,), ['excel', 'sleep'])}, 2)
+            self.assertEqual(failures, {})
+            self.assertEqual(list(results)[-1], 'check')
+            self.assertTrue(results['check'][0])
+            self.assertGreaterEqual(results['sleep'][1], 0.2)
+        self.assertEqual({name: task[2] for name, task in report_tasks(report, dic_list).items()},
+                         {'excel': [], 'image': [], 'pdf': ['image']})
+        self.assertEqual(tuple(report_tasks(report, dic_list)), REPORT_TASKS)
+        results, failures = run_tasks({'first': (abs, ('1',), []), 'second': (abs, (1,), ['first']),
+                                       'third': (abs, (-3,), [])})
+        self.assertEqual(list(results), ['third'])
+        self.assertIsInstance(failures['first'], TypeError)
+        self.assertIsInstance(failures['second'], RuntimeError)
+        with self.assertRaises(ValueError):
+            run_tasks({'first': (abs, (1,), ['second']), 'second': (abs, (1,), ['first'])})
+        with self.assertRaises(ValueError):
+            run_tasks({'first': (abs, (1,), ['third'])})
+
+    def test_generate_image(self):
+        report = Report({}, Side(style='thin', color="000000"), 'Аналитик')
+        dic_list = [{2021: 15, 2022: 469}, {2021: 1, 2022: 2}, {2021: 0, 2022: 898}, {2021: 0, 2022: 1},
+                    {'Москва': 456, 'Санкт-Петербург': 40}, {'Москва': 0.6667, 'Санкт-Петербург': 0.3333}]
+        with tempfile.TemporaryDirectory() as directory:
+            cache, file_path = os.path.join(directory, 'cache'), os.path.join(directory, 'graph.png')
+            report.generate_image(dic_list, file_path, cache, 2)
+            with Image.open(file_path) as image:
+                self.assertEqual(image.size, (CHART_SIZE[0] * CHART_DPI * 2, CHART_SIZE[1] * CHART_DPI * 2))
+            cached = sorted(os.listdir(cache))
+            self.assertEqual(len(cached), 5)
+            report.generate_image(dic_list, file_path, cache)
+            self.assertEqual(sorted(os.listdir(cache)), cached)
+            keys = [chart_key(spec) for spec in Report({}, Side(style='thin'), 'Программист').chart_specs(dic_list)]
+            self.assertEqual([f'{key}.png' in cached for key in keys], [False, False, True, True])
+            oldest = os.path.join(cache, f'{keys[2]}.png')
+            os.utime(oldest, (0, 0))
+            total = sum(os.path.getsize(os.path.join(cache, name)) for name in cached)
+            self.assertEqual(prune_chart_cache(cache, total - 1), 1)
+            self.assertEqual(sorted(os.listdir(cache)), sorted(set(cached) - {f'{keys[2]}.png'}))
+            self.assertEqual(prune_chart_cache(cache, 0), 4)
+
     def test_salary_type(self):
         self.assertEqual(str(type(Salary(10.0, 20.4, 'RUR')).__name__), 'Salary')
         self.assertEqual(str(type(Salary(100, 200, 'EUR', 'Да')).__name__), 'Salary')
@@ -75,6 +178,248 @@ class StatsWriterTests(unittest.TestCase):
     def test_dataset(self):
         self.assertEqual(type(DataSet('vacancies.csv')).__name__, 'DataSet')
 
+    def test_vacancy_columns(self):
+        columns = VacancyColumns(iter([['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'],
+                                       ['Программист', '10', '20', 'RUR', 'Москва', '2021-07-15T09:56:52+0300'],
+                                       ['Аналитик', '10', '20', 'EUR', 'Москва', '2022-07-15T09:56:52+0300'],
+                                       ['Программист 1С', '30', '50', 'RUR', 'Пермь', '2022-07-15T09:56:52+0300']]))
+        self.assertEqual(columns.salary_by_year(), [{2021: 15, 2022: 469}, {2021: 1, 2022: 2}])
+        self.assertEqual(columns.salary_by_profession('Программист'), [{2021: 15, 2022: 40}, {2021: 1, 2022: 1}])
+        self.assertEqual(columns.salary_by_profession('Тестировщик'), [{2021: 0, 2022: 0}, {2021: 0, 2022: 0}])
+        self.assertEqual(columns.salary_by_area(), [{'Москва': 456, 'Пермь': 40}, {'Москва': 0.6667, 'Пермь': 0.3333}])
+
+    def test_stats_engine(self):
+        engine = full_stats_engine('Программист').consume([
+            Vacancy(['Программист', '10', '20', 'RUR', 'Москва', '2021-07-15T09:56:52+0300']),
+            Vacancy(['Аналитик', '10', '20', 'EUR', 'Москва', '2022-07-15T09:56:52+0300']),
+            Vacancy(['Программист 1С', '30', '50', 'RUR', 'Пермь', '2022-07-15T09:56:52+0300'])])
+        results = engine.results()
+        self.assertEqual(engine.total, 3)
+        self.assertEqual(results['year'], [{2021: 15, 2022: 469}, {2021: 1, 2022: 2}])
+        self.assertEqual(results['profession'], [{2021: 15, 2022: 40}, {2021: 1, 2022: 1}])
+        self.assertEqual(results['area'], [{'Москва': 456, 'Пермь': 40}, {'Москва': 0.6667, 'Пермь': 0.3333}])
+
+    def test_stats_engine_merge(self):
+        first = full_stats_engine('Программист').consume(
+            [Vacancy(['Программист', '10', '20', 'RUR', 'Москва', '2021-07-15T09:56:52+0300'])])
+        second = full_stats_engine('Программист').consume(
+            [Vacancy(['Программист 1С', '30', '50', 'RUR', 'Москва', '2021-07-15T09:56:52+0300'])])
+        self.assertEqual(first.merge(second).results()['year'], [{2021: 27}, {2021: 2}])
+
+    def test_profession_matcher(self):
+        matcher = ProfessionMatcher(['Python', 'Программист', 'Java', 'грамм'])
+        self.assertEqual(matcher.find('Программист Python'), {0, 1, 3})
+        self.assertEqual(matcher.find('JavaScript разработчик'), {2})
+        self.assertEqual(matcher.find('Аналитик'), set())
+
+    def test_professions_accumulator(self):
+        engine = StatsEngine({'professions': ProfessionsAccumulator(['Программист', 'Аналитик', 'Тестировщик'])})
+        engine.consume([Vacancy(['Программист', '10', '20', 'RUR', 'Москва', '2021-07-15T09:56:52+0300']),
+                        Vacancy(['Аналитик', '10', '20', 'EUR', 'Москва', '2022-07-15T09:56:52+0300']),
+                        Vacancy(['Программист 1С', '30', '50', 'RUR', 'Пермь', '2022-07-15T09:56:52+0300'])])
+        self.assertEqual(engine.results()['professions'],
+                         {'Программист': [{2021: 15, 2022: 40}, {2021: 1, 2022: 1}],
+                          'Аналитик': [{2021: 0, 2022: 898}, {2021: 0, 2022: 1}],
+                          'Тестировщик': [{2021: 0, 2022: 0}, {2021: 0, 2022: 0}]})
+
+    def test_parallel_stats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'vacancies.csv')
+            with open(file_path, 'w', encoding='utf-8-sig') as file:
+                file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n')
+                for index in range(200):
+                    file.write(f'Программист {index % 3},{index}000,{index + 10}000,{"RUR" if index % 4 else "EUR"},'
+                               f'"Город,\n{index % 7}",20{10 + index % 5}-07-15T09:56:52+0300\n')
+            parallel_rows = list(parallelReader.read_rows_parallel(file_path, 3))
+            self.assertEqual(parallel_rows, list(read_rows(file_path)))
+            self.assertEqual(parallel_rows[1][4], 'Город,\n0')
+            engine = full_stats_engine('Программист 1').consume(stream_vacancies(file_path)).results()
+            self.assertEqual(parallel_stats(file_path, 'Программист 1', 3),
+                             engine['year'] + engine['profession'] + engine['area'])
+
+    def test_run_stats_jobs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for number in range(2):
+                paths.append(os.path.join(directory, f'vacancies_{number}.csv'))
+                with open(paths[-1], 'w', encoding='utf-8-sig') as file:
+                    file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n')
+                    for index in range(30):
+                        file.write(f'{["Программист", "Аналитик"][index % 2]},{index + number}000,{index + 10}000,'
+                                   f'RUR,Город {index % 3},20{10 + index % 4}-07-15T09:56:52+0300\n')
+            jobs = [(path, profession) for path in paths for profession in ['Программист', 'Аналитик']]
+            results = run_stats_jobs(jobs, 4)
+            for path, profession in jobs:
+                data = DataSet(path)
+                self.assertEqual(list(results[path, profession]), data.get_full_dict_list(profession))
+                self.assertEqual(data.salary_by_year() + data.salary_by_profession(profession) + data.salary_by_area(),
+                                 data.get_full_dict_list(profession))
+            self.assertNotEqual(results[paths[0], 'Программист'], results[paths[1], 'Программист'])
+            with self.assertRaises(TypeError):
+                results[paths[0], 'Аналитик'][0][2010] = 0
+
+    def test_rate_matrix(self):
+        rates = RateMatrix(['2022-06', '2022-07'], ['BYN', 'EUR'], [[20.0, 60.0], [25.0, 62.0]])
+        self.assertEqual(rates.rate('EUR', 2022, 7), 62.0)
+        self.assertEqual(rates.rate('BYR', 2022, 6), 20.0)
+        self.assertEqual(rates.rate('RUR', 2010, 1), 1.0)
+        self.assertEqual(rates.rate('EUR', 2021, 7, currency_to_rub), 59.90)
+        self.assertEqual(list(rates.convert([10, 10, 100, 10], ['EUR', 'EUR', 'USD', 'RUR'],
+                                            ['2022-06-15', '2022-07-15', '2022-07-15', '2022-07-15'], currency_to_rub)),
+                         [600.0, 620.0, 6066.0, 10.0])
+        rows = [['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'],
+                ['Программист', '10', '20', 'RUR', 'Москва', '2021-07-15T09:56:52+0300'],
+                ['Аналитик', '10', '20', 'EUR', 'Москва', '2022-07-15T09:56:52+0300'],
+                ['Программист 1С', '30', '50', 'EUR', 'Пермь', '2022-06-15T09:56:52+0300']]
+        engine = full_stats_engine('Программист', rates).consume(Vacancy(row) for row in rows[1:]).results()
+        self.assertEqual(VacancyColumns(iter(rows), rates).get_full_dict_list('Программист'),
+                         engine['year'] + engine['profession'] + engine['area'])
+        self.assertEqual(engine['year'], [{2021: 15, 2022: 1665}, {2021: 1, 2022: 2}])
+
+    def test_convert_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, target = os.path.join(directory, 'source.csv'), os.path.join(directory, 'target.csv')
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                           'Программист,10,21,EUR,Москва,2022-07-15T09:56:52+0300\n'
+                           'Аналитик,10,,GEL,Москва,2022-07-15T09:56:52+0300\n'
+                           'Тестировщик,,,,Пермь,2022-06-15T09:56:52+0300\n')
+            self.assertEqual(convert_csv(RateMatrix(['2022-07'], ['EUR'], [[62.0]]), source, target, 2), (2, 1))
+            with open(target, encoding='utf-8') as file:
+                self.assertEqual(file.read().splitlines(),
+                                 ['name,salary,area_name,published_at',
+                                  'Программист,961.0,Москва,2022-07-15T09:56:52+0300',
+                                  'Тестировщик,,Пермь,2022-06-15T09:56:52+0300'])
+
+    def test_update_rates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fixtures, cache = os.path.join(directory, 'fixtures'), os.path.join(directory, 'cache')
+            os.mkdir(fixtures)
+            for period, code in [('2016-06', 'BYR'), ('2016-07', 'BYN'), ('2016-09', 'BYN')]:
+                with open(os.path.join(fixtures, f'{period}.xml'), 'w', encoding='utf-8') as file:
+                    file.write(f'<ValCurs><Valute><CharCode>{code}</CharCode><Nominal>10000</Nominal>'
+                               f'<Value>33,1200</Value></Valute><Valute><CharCode>USD</CharCode><Nominal>1</Nominal>'
+                               f'<Value>65,5000</Value></Valute></ValCurs>')
+            file_path = os.path.join(directory, 'currency_data.csv')
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write('date,BYN,USD,EUR,KZT,UAH\n2016-05,0.0033,66.0,75.0,0.19,2.6\n')
+            source = CachedSource(DirectorySource(fixtures), cache)
+            self.assertEqual(update_rates(file_path, source, '2016-05', '2016-09', 2, 2, 0), ['2016-08'])
+            self.assertEqual(sorted(os.listdir(cache)), ['2016-06.xml', '2016-07.xml', '2016-09.xml'])
+            rates = RateMatrix.from_csv(file_path)
+            self.assertEqual([rates.rate('BYR', 2016, month) for month in range(5, 8)], [0.0033, 0.0033, 0.0033])
+            self.assertEqual(rates.rate('USD', 2016, 9), 65.5)
+            self.assertTrue(math.isnan(rates.rate('USD', 2016, 8)))
+            os.remove(os.path.join(fixtures, '2016-06.xml'))
+            with open(os.path.join(fixtures, '2016-08.xml'), 'w', encoding='utf-8') as file:
+                file.write('<ValCurs><Valute><CharCode>USD</CharCode><Nominal>1</Nominal>'
+                           '<Value>64,0000</Value></Valute></ValCurs>')
+            self.assertEqual(update_rates(file_path, source, '2016-05', '2016-09', 2, 2, 0), [])
+            with open(file_path, encoding='utf-8') as file:
+                self.assertEqual([line.split(',')[0] for line in file.read().splitlines()],
+                                 ['date', '2016-05', '2016-06', '2016-07', '2016-08', '2016-09'])
+            for period, text in [('2016-10', '<ValCurs><Valute><CharCode>USD</Char'),
+                                 ('2016-11', '<ValCurs><Valute><CharCode>USD</CharCode><Nominal>1</Nominal>'
+                                             '</Valute></ValCurs>'),
+                                 ('2016-12', '<ValCurs><Valute><CharCode>USD</CharCode><Nominal>1</Nominal>'
+                                             '<Value>6x,1</Value></Valute></ValCurs>')]:
+                with open(os.path.join(fixtures, f'{period}.xml'), 'w', encoding='utf-8') as file:
+                    file.write(text)
+            with open(os.path.join(cache, '2017-01.xml'), 'w', encoding='utf-8') as file:
+                file.write('<html>')
+            with open(os.path.join(fixtures, '2017-01.xml'), 'w', encoding='utf-8') as file:
+                file.write('<ValCurs><Valute><CharCode>USD</CharCode><Nominal>1</Nominal>'
+                           '<Value>60,0000</Value></Valute></ValCurs>')
+            self.assertEqual(update_rates(file_path, source, '2016-05', '2017-01', 2, 2, 0),
+                             ['2016-10', '2016-11', '2016-12'])
+            self.assertEqual(sorted(os.listdir(cache))[-2:], ['2016-09.xml', '2017-01.xml'])
+            self.assertEqual(RateMatrix.from_csv(file_path).rate('USD', 2017, 1), 60.0)
+
+    def test_dataset_partitions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'vacancies.csv')
+            with open(file_path, 'w', encoding='utf-8-sig') as file:
+                file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n')
+                for index in range(60):
+                    file.write(f'{["Программист", "Аналитик"][index % 2]},{index}000,{index + 10}000,RUR,'
+                               f'Город {index % 3},20{10 + index % 5}-07-15T09:56:52+0300\n')
+            partitioned = os.path.join(directory, 'years')
+            partition_csv(file_path, partitioned)
+            expected = DataSet(file_path).get_full_dict_list('Программист')
+            self.assertEqual(DataSet(partitioned).get_full_dict_list('Программист'), expected)
+            self.assertEqual(DataSet(partitioned, columnar=True).get_full_dict_list('Программист'), expected)
+            self.assertEqual(parallel_stats(partitioned, 'Программист', 2), expected)
+            self.assertEqual(DataSet(partitioned, columnar=True, years={2011, 2013}).salary_by_year(),
+                             DataSet(file_path, years={2011, 2013}).salary_by_year())
+            self.assertEqual(list(DataSet(partitioned, years=[2012]).salary_by_year()[1]), [2012])
+
+    def test_batch_reports(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'vacancies.csv')
+            with open(file_path, 'w', encoding='utf-8-sig') as file:
+                file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n')
+                for index in range(60):
+                    file.write(f'{["Программист", "Аналитик", "C/C++ разработчик"][index % 3]},{index}000,'
+                               f'{index + 10}000,RUR,Город {index % 4},20{10 + index % 5}-07-15T09:56:52+0300\n')
+            cwd = os.getcwd()
+            os.chdir(directory)
+            self.addCleanup(os.chdir, cwd)
+            directories, timings, failures = batch_reports(file_path, ['Программист', 'C/C++', 'Программист'],
+                                                           'reports', max_workers=2, formats=('excel', 'image'),
+                                                           cache_directory='charts')
+            self.assertEqual(failures, {})
+            self.assertEqual(directories, {'Программист': os.path.join('reports', 'Программист'),
+                                           'C/C++': os.path.join('reports', 'C_C++')})
+            self.assertEqual(sorted(timings), ['C/C++: excel', 'C/C++: image',
+                                               'Программист: excel', 'Программист: image'])
+            for profession, report_directory in directories.items():
+                self.assertEqual(sorted(os.listdir(report_directory)), ['graph.png', 'report.xlsx'])
+                expected = DataSet(file_path).get_full_dict_list(profession)
+                sheet = load_workbook(os.path.join(report_directory, 'report.xlsx'))['Статистика по годам']
+                self.assertEqual(sheet['C1'].value, f'Средняя зарплата - {profession}')
+                self.assertEqual({row[0]: row[2] for row in sheet.iter_rows(min_row=2, values_only=True)},
+                                 expected[2])
+            self.assertEqual(len(os.listdir('charts')), 8)
+            os.environ[WKHTMLTOPDF_VARIABLE] = os.path.join(directory, 'missing', 'wkhtmltopdf')
+            self.addCleanup(os.environ.pop, WKHTMLTOPDF_VARIABLE, None)
+            _, timings, failures = batch_reports(file_path, ['Программист', 'C/C++'], 'pdf', formats=('excel', 'pdf'))
+            self.assertEqual(sorted(timings), ['C/C++: excel', 'C/C++: image',
+                                               'Программист: excel', 'Программист: image'])
+            self.assertEqual(sorted(failures), ['C/C++: pdf', 'Программист: pdf'])
+            self.assertIsInstance(failures['C/C++: pdf'], OSError)
+            with self.assertRaises(ValueError):
+                batch_reports(file_path, ['Программист'], formats=('excel', 'docx'))
+            open('empty.csv', 'w').close()
+            self.assertEqual(batch_reports('empty.csv', ['Программист']), 'Пустой файл')
+
+    def test_partition_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'vacancies.csv')
+            with open(file_path, 'w', encoding='utf-8-sig') as file:
+                file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n')
+                for index in range(50):
+                    file.write(f'"Программист,\n{index}",{index}000,,RUR,Город {index % 3},'
+                               f'20{10 + index % 3}-{index % 12 + 1:02d}-15T09:56:52+0300\n')
+                file.write('Аналитик,10,20,RUR,Москва,\n')
+            manifest = partition_csv(file_path, os.path.join(directory, 'years'), buffer_size=7)
+            self.assertEqual(manifest['rows'], 50)
+            self.assertEqual(manifest['skipped'], 1)
+            self.assertEqual([(partition['file'], partition['rows']) for partition in manifest['partitions']],
+                             [('2010.csv', 17), ('2011.csv', 17), ('2012.csv', 16)])
+            self.assertEqual([partition['valid_rows'] for partition in manifest['partitions']], [0, 0, 0])
+            self.assertEqual(manifest['partitions'][0]['first_published'], '2010-01-15T09:56:52+0300')
+            self.assertEqual(manifest['partitions'][0]['last_published'], '2010-10-15T09:56:52+0300')
+            with open(os.path.join(directory, 'years', MANIFEST_NAME), encoding='utf-8') as file:
+                self.assertEqual(json.load(file), manifest)
+            with open(os.path.join(directory, 'years', '2011.csv'), encoding='utf-8', newline='') as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(rows[0], manifest['header'])
+            self.assertEqual(rows[1][:2], ['Программист,\n1', '1000'])
+            self.assertEqual(len(rows), 18)
+            manifest = partition_csv(file_path, os.path.join(directory, 'areas'), 'area')
+            self.assertEqual([partition['file'] for partition in manifest['partitions']],
+                             ['Город_0.csv', 'Город_1.csv', 'Город_2.csv'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,159 @@
+import functools
+import sys
+import textwrap
+import wcwidth
+
+# Символы рамки таблицы
+VERTICAL_CHAR = '|'
+HORIZONTAL_CHAR = '-'
+JUNCTION_CHAR = '+'
+
+
+@functools.lru_cache(maxsize=4096)
+def text_width(text):
+    """
+    Вычисляет ширину строки при выводе в терминал
+    Args:
+        text (str): Строка без переводов строк
+
+    Returns:
+        int: Количество занимаемых позиций
+
+    >>> text_width('Оклад')
+    5
+    >>> text_width('日本')
+    4
+    """
+    width = wcwidth.wcswidth(text)
+    return width if width >= 0 else len(text)
+
+
+def block_width(text):
+    """
+    Вычисляет ширину многострочного значения ячейки
+    Args:
+        text (str): Значение ячейки
+
+    Returns:
+        int: Ширина самой длинной строки значения
+
+    >>> block_width('Python\\nSQL')
+    6
+    """
+    return max(text_width(line) for line in text.split('\n'))
+
+
+def wrap_cell(text, width):
+    """
+    Разбивает значение ячейки на строки, не превышающие ширину столбца, по тем же правилам, что и PrettyTable
+    Args:
+        text (str): Значение ячейки
+        width (int): Ширина столбца
+
+    Returns:
+        list of str: Строки ячейки
+
+    >>> wrap_cell('Программист Python\\nSQL', 11)
+    ['Программист', 'Python', 'SQL']
+    """
+    lines = []
+    for line in text.split('\n'):
+        if text_width(line) > width:
+            line = '\n'.join(textwrap.wrap(line, width, break_on_hyphens=True))
+        lines.extend(line.split('\n'))
+    return lines
+
+
+class TableRenderer(object):
+    """
+    Класс для вывода таблицы с рамками вокруг каждой ячейки и выравниванием по левому краю, совпадающего
+    с выводом PrettyTable при hrules=ALL и align='l'.
+
+    Таблица выводится построчно в файл. Ширины столбцов вычисляются только по переданным строкам,
+    поэтому затраты зависят от размера выводимой страницы, а не от размера датасета
+
+    Attributes:
+        field_names (list of str): Заголовки всех столбцов
+        max_width (dict): Максимальная ширина столбцов по заголовкам
+    """
+    def __init__(self, field_names, max_width=None):
+        """
+        Инициализирует объект TableRenderer
+        Args:
+            field_names (list of str): Заголовки всех столбцов
+            max_width (dict or None): Максимальная ширина столбцов по заголовкам
+        """
+        self.field_names = field_names
+        self.max_width = max_width or {}
+
+    def compute_widths(self, rows):
+        """
+        Вычисляет ширины столбцов по заголовкам и значениям строк с учетом максимальной ширины
+        Args:
+            rows (list of list of str): Строки таблицы
+
+        Returns:
+            list of int: Ширины столбцов
+        """
+        widths = [block_width(field) for field in self.field_names]
+        for row in rows:
+            for index, (field, value) in enumerate(zip(self.field_names, row)):
+                width = block_width(value)
+                if field in self.max_width:
+                    width = min(width, self.max_width[field])
+                widths[index] = max(widths[index], width)
+        return widths
+
+    def render(self, rows, fields=None, file=None):
+        """
+        Выводит таблицу. Строки, переданные итератором, собираются только для вычисления ширин столбцов,
+        поэтому передаваться должны только строки выводимого диапазона
+        Args:
+            rows (iterable of list): Строки таблицы со значениями всех столбцов в порядке field_names
+            fields (list of str or None): Заголовки выводимых столбцов, по умолчанию - все столбцы
+            file (file object or None): Файл для вывода, по умолчанию - стандартный вывод
+
+        Raises:
+            ValueError: Если среди выводимых столбцов есть отсутствующий в таблице
+
+        >>> TableRenderer(['№', 'Название']).render([[1, 'Программист']])
+        +---+-------------+
+        | № | Название    |
+        +---+-------------+
+        | 1 | Программист |
+        +---+-------------+
+        """
+        for field in fields or []:
+            if field not in self.field_names:
+                raise ValueError(f'Столбец не найден: {field}')
+        file = file or sys.stdout
+        rows = [[str(value).expandtabs() for value in row] for row in rows]
+        widths = self.compute_widths(rows)
+        visible = [index for index, field in enumerate(self.field_names) if not fields or field in fields]
+        hrule = JUNCTION_CHAR + JUNCTION_CHAR.join(HORIZONTAL_CHAR * (widths[index] + 2)
+                                                   for index in visible) + JUNCTION_CHAR + '\n'
+
+        file.write(hrule)
+        file.write(self.render_line([self.field_names[index] for index in visible], [widths[index] for index in visible]))
+        file.write(hrule)
+        for row in rows:
+            cells = [wrap_cell(value, width) for value, width in zip(row, widths)]
+            height = max(len(lines) for lines in cells)
+            for y in range(height):
+                file.write(self.render_line([cells[index][y] if y < len(cells[index]) else '' for index in visible],
+                                            [widths[index] for index in visible]))
+            file.write(hrule)
+
+    @staticmethod
+    def render_line(values, widths):
+        """
+        Формирует одну строку вывода таблицы
+        Args:
+            values (list of str): Значения видимых столбцов без переводов строк
+            widths (list of int): Ширины видимых столбцов
+
+        Returns:
+            str: Строка таблицы с рамками и переводом строки в конце
+        """
+        return VERTICAL_CHAR + ''.join(' ' + value + ' ' * (width - text_width(value)) + ' ' + VERTICAL_CHAR
+                                       for value, width in zip(values, widths)) + '\n'
@@ -1,8 +1,16 @@
-from prettytable import PrettyTable
-from prettytable import ALL
-import csv
+import calendar
+import copy
+import functools
+import heapq
+import itertools
 import re
 import os
+import sys
+from array import array
+import parallelReader
+import tableRenderer
+import vacancyCache
+import vacancyPartitions
 
 invert_dic = lambda dic: {v: k for k, v in dic.items()}
 
@@ -23,6 +31,9 @@ dic_naming = {
     'published_at': 'Дата публикации вакансии'
 }
 
+# Словарь перевода русских названий заголовков в английские
+dic_fields = invert_dic(dic_naming)
+
 # Словарь перевода английских логических значений в русские
 dic_bool = {
     'True': 'Да',
@@ -61,6 +72,17 @@ dic_currency = {
     'UZS': 'Узбекский сум'
 }
 
+# Поля вакансии в порядке столбцов csv-файла
+vacancy_fields = ('name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name',
+                  'salary_from', 'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at')
+
+# Словарь номеров полей вакансии
+fields_index = {field: index for index, field in enumerate(vacancy_fields)}
+
+# Поля с часто повторяющимися значениями, строки которых хранятся в единственном экземпляре
+categorical_fields = frozenset(['experience_id', 'premium', 'employer_name', 'salary_gross',
+                                'salary_currency', 'area_name'])
+
 # Cловарь коэффицентов конвертации валют в рубли
 currency_to_rub = {
     "AZN": 35.68,
@@ -75,32 +97,385 @@ currency_to_rub = {
     "UZS": 0.0055
 }
 
-# Словарь функций фильтрации для парметров вакансии
-dic_filters = {
-    'Название': lambda x, y: x == y,
-    'Описание': lambda x, y: x == y,
-    'Навыки': lambda x, y: all(t in x for t in y),
-    'Опыт работы': lambda x, y: x == y,
-    'Премиум-вакансия': lambda x, y: x == y,
-    'Компания': lambda x, y: x == y,
-    'Оклад': lambda salary_from, salary_to, x: salary_from <= x <= salary_to,
-    'Оклад указан до вычета налогов': lambda x, y: x == y,
-    'Идентификатор валюты оклада': lambda x, y: x == y,
-    'Название региона': lambda x, y: x == y,
-    'Дата публикации вакансии': lambda yi, mi, di, dt, mt, yt: di == dt and mi == mt and yi == yt
-}
-
 # Словарь функций сортировки для параметров вакансии
 dic_sorters = {
-    'Навыки': lambda x: len(x.full_dict['key_skills'].split('\n')),
-    'Опыт работы': lambda x: work_experience_sort[dic_work_experience[x.full_dict['experience_id']]],
-    'Оклад': lambda x: x.full_dict['salary'].converter(),
-    'Дата публикации вакансии': lambda x: int(
-       x.full_dict['published_at'][:4] + x.full_dict['published_at'][5:7] +
-       x.full_dict['published_at'][8:10] + x.full_dict['published_at'][11:13] +
-       x.full_dict['published_at'][14:16] + x.full_dict['published_at'][17:19])
+    'Навыки': lambda x: x.field('key_skills').count('\n') + 1,
+    'Опыт работы': lambda x: work_experience_sort[dic_work_experience[x.field('experience_id')]],
+    'Оклад': lambda x: x.salary_info.converter(),
+    'Дата публикации вакансии': lambda x: published_timestamp(x.field('published_at'))
+}
+
+# Максимальная ширина столбцов выводимой таблицы
+columns_max_width = {'№': 20, 'Название': 20, 'Описание': 20, 'Навыки': 20, 'Опыт работы': 20, 'Премиум-вакансия': 20,
+                     'Компания': 20, 'Оклад': 20, 'Название региона': 20, 'Дата публикации вакансии': 20}
+
+# Типы числовых колонок ключей сортировки
+sort_key_types = {
+    'Навыки': 'l',
+    'Опыт работы': 'b',
+    'Оклад': 'q',
+    'Дата публикации вакансии': 'q'
+}
+
+
+def published_timestamp(published_at):
+    """
+    Переводит дату публикации в количество секунд от начала эпохи по местному времени публикации
+    Args:
+        published_at (str): Дата публикации в формате '%Y-%m-%dT%H:%M:%S%z'
+
+    Returns:
+        int: Метка времени публикации
+
+    >>> published_timestamp('2022-07-15T09:56:52+0300')
+    1657879012
+    """
+    return calendar.timegm((int(published_at[:4]), int(published_at[5:7]), int(published_at[8:10]),
+                            int(published_at[11:13]), int(published_at[14:16]), int(published_at[17:19])))
+
+
+# Словарь логических операторов языка запросов фильтрации
+filter_operators = {
+    'И': 'and',
+    'AND': 'and',
+    'ИЛИ': 'or',
+    'OR': 'or'
 }
 
+# Операторы отрицания условия в запросе фильтрации
+filter_negations = ('НЕ ', 'NOT ')
+
+# Регулярное выражение для логического оператора между условиями запроса фильтрации
+filter_operator = re.compile(r'\s+(ИЛИ|OR|И|AND)\s+')
+
+# Регулярное выражение для значения оклада или диапазона окладов 'от-до'
+salary_range = re.compile(r'(-?\d+)(?:\s*-\s*(-?\d+))?')
+
+# Регулярное выражение для даты публикации или диапазона дат 'ДД.ММ.ГГГГ-ДД.ММ.ГГГГ'
+date_range = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})(?:\s*-\s*(\d{2})\.(\d{2})\.(\d{4}))?')
+
+
+def parse_salary_range(value):
+    """
+    Разбирает значение фильтра по окладу: одно число или диапазон
+    Args:
+        value (str): Значение параметра фильтрации
+
+    Returns:
+        tuple: Нижняя и верхняя границы диапазона включительно
+
+    >>> parse_salary_range('50000')
+    (50000, 50000)
+    >>> parse_salary_range('50000-100000')
+    (50000, 100000)
+    """
+    match = salary_range.fullmatch(value)
+    if match is None:
+        raise ValueError('Формат ввода некорректен')
+    return int(match.group(1)), int(match.group(2) or match.group(1))
+
+
+def parse_date_range(value):
+    """
+    Разбирает значение фильтра по дате публикации: одна дата или диапазон дат
+    Args:
+        value (str): Значение параметра фильтрации
+
+    Returns:
+        tuple: Нижняя и верхняя границы диапазона включительно в формате 'ГГГГ-ММ-ДД'
+
+    >>> parse_date_range('15.07.2022')
+    ('2022-07-15', '2022-07-15')
+    >>> parse_date_range('01.07.2022-15.07.2022')
+    ('2022-07-01', '2022-07-15')
+    """
+    match = date_range.fullmatch(value)
+    if match is None:
+        raise ValueError('Формат ввода некорректен')
+    day, month, year, day_to, month_to, year_to = match.groups()
+    low = f'{year}-{month}-{day}'
+    return low, f'{year_to}-{month_to}-{day_to}' if year_to else low
+
+
+class FilterParser(object):
+    """
+    Класс для разбора запроса фильтрации, например
+    'Опыт работы: Нет опыта И (Название региона: Москва ИЛИ НЕ Оклад: 0-50000)'.
+
+    Запрос состоит из условий 'Заголовок: значение', связанных операторами И (AND), ИЛИ (OR) и НЕ (NOT),
+    которые пишутся заглавными буквами через пробел. И связывает сильнее, чем ИЛИ, порядок можно задать
+    скобками. Для оклада можно указать диапазон 'от-до', для даты публикации - 'ДД.ММ.ГГГГ-ДД.ММ.ГГГГ'.
+    Значение в двойных кавычках, например 'Компания: "Рога И Копыта"', берется целиком без кавычек,
+    кавычка внутри него записывается двумя кавычками. Текст в кавычках внутри значения не разбирается
+    на операторы и сохраняется вместе с кавычками
+
+    Attributes:
+        text (str): Текст запроса
+        position (int): Текущая позиция разбора
+        depth (int): Количество открытых скобок в текущей позиции
+    """
+    def __init__(self, text):
+        """
+        Инициализирует объект FilterParser
+        Args:
+            text (str): Текст запроса фильтрации
+        """
+        self.text = text
+        self.position = 0
+        self.depth = 0
+
+    def parse(self):
+        """
+        Разбирает запрос целиком
+        Returns:
+            tuple: Дерево запроса из узлов ('condition', заголовок, значение), ('not', узел),
+            ('and', список узлов) и ('or', список узлов)
+
+        >>> FilterParser('Название: Программист').parse()
+        ('condition', 'Название', 'Программист')
+        >>> FilterParser('НЕ Премиум-вакансия: Да И (Оклад: 100 ИЛИ Навыки: Git, SQL)').parse()
+        ('and', [('not', ('condition', 'Премиум-вакансия', 'Да')), ('or', [('condition', 'Оклад', '100'), ('condition', 'Навыки', 'Git, SQL')])])
+        """
+        query = self.parse_chain('or')
+        if self.position != len(self.text):
+            raise ValueError('Формат ввода некорректен')
+        return query
+
+    def parse_chain(self, operator):
+        """
+        Разбирает последовательность операндов, связанных одним оператором
+        Args:
+            operator (str): 'or' или 'and'
+
+        Returns:
+            tuple: Узел оператора или единственный операнд
+        """
+        operands = [self.parse_chain('and') if operator == 'or' else self.parse_term()]
+        while True:
+            match = filter_operator.match(self.text, self.position)
+            if match is None or filter_operators[match.group(1)] != operator:
+                break
+            self.position = match.end()
+            operands.append(self.parse_chain('and') if operator == 'or' else self.parse_term())
+        return operands[0] if len(operands) == 1 else (operator, operands)
+
+    def parse_term(self):
+        """
+        Разбирает отрицание, выражение в скобках или отдельное условие
+        Returns:
+            tuple: Узел дерева запроса
+        """
+        for negation in filter_negations:
+            if self.text.startswith(negation, self.position):
+                self.position += len(negation)
+                return 'not', self.parse_term()
+        if self.text.startswith('(', self.position):
+            self.position += 1
+            self.depth += 1
+            query = self.parse_chain('or')
+            while self.text.startswith(' ', self.position):
+                self.position += 1
+            if not self.text.startswith(')', self.position):
+                raise ValueError('Формат ввода некорректен')
+            self.position += 1
+            self.depth -= 1
+            return query
+        return self.parse_condition()
+
+    def parse_condition(self):
+        """
+        Разбирает условие 'Заголовок: значение'. Значение продолжается до оператора, закрывающей скобки
+        группы или конца запроса, парные скобки и текст в кавычках внутри значения сохраняются
+        Returns:
+            tuple: Узел условия
+
+        >>> FilterParser('Компания: "Рога И Копыта" ИЛИ Компания: ООО "A AND B"').parse()
+        ('or', [('condition', 'Компания', 'Рога И Копыта'), ('condition', 'Компания', 'ООО "A AND B"')])
+        >>> FilterParser('Компания: "Кавычка ""Q"" внутри"').parse()
+        ('condition', 'Компания', 'Кавычка "Q" внутри')
+        """
+        colon = self.text.find(':', self.position)
+        if colon < 0:
+            raise ValueError('Формат ввода некорректен')
+        title = self.text[self.position:colon]
+        if title not in dic_naming.values():
+            raise ValueError('Параметр поиска некорректен')
+        if not self.text.startswith(': ', colon):
+            raise ValueError('Формат ввода некорректен')
+        start = position = colon + 2
+        if self.text.startswith('"', start):
+            return 'condition', title, self.parse_quoted(start)
+        nesting = 0
+        while position < len(self.text):
+            char = self.text[position]
+            if nesting == 0 and char == ')' and self.depth > 0:
+                self.position = position
+                return 'condition', title, self.text[start:position].rstrip()
+            if nesting == 0 and char == ' ' and filter_operator.match(self.text, position):
+                break
+            if char == '"' and self.text.find('"', position + 1) > 0:
+                position = self.text.find('"', position + 1)
+            nesting += (char == '(') - (char == ')' and nesting > 0)
+            position += 1
+        self.position = position
+        return 'condition', title, self.text[start:position]
+
+    def parse_quoted(self, start):
+        """
+        Разбирает значение в двойных кавычках, две кавычки подряд означают одну кавычку в значении
+        Args:
+            start (int): Позиция открывающей кавычки
+
+        Returns:
+            str: Значение без кавычек
+        """
+        position = start + 1
+        while True:
+            position = self.text.find('"', position)
+            if position < 0:
+                raise ValueError('Формат ввода некорректен')
+            if not self.text.startswith('""', position):
+                break
+            position += 2
+        self.position = position + 1
+        return self.text[start + 1:position].replace('""', '"')
+
+
+def parse_filter(filter_opt):
+    """
+    Разбирает запрос фильтрации. Если текст не разбирается как выражение из-за формата, но является одним
+    условием 'Заголовок: значение', значение берется целиком, как до появления составных запросов.
+    Ошибка в заголовке одного из условий выражения не скрывается
+    Args:
+        filter_opt (str): Значение параметра фильтрации
+
+    Returns:
+        tuple: Дерево запроса
+
+    >>> parse_filter('Компания: Рога И Копыта')
+    ('condition', 'Компания', 'Рога И Копыта')
+    >>> parse_filter('Название: НЕ ИЛИ программист')
+    ('condition', 'Название', 'НЕ ИЛИ программист')
+    """
+    try:
+        return FilterParser(filter_opt).parse()
+    except ValueError as error:
+        title, separator, value = filter_opt.partition(': ')
+        if str(error) != 'Формат ввода некорректен' or not separator or title not in dic_naming.values():
+            raise error
+        try:
+            compile_condition(title, value)
+        except ValueError:
+            raise error
+        return 'condition', title, value
+
+
+def compile_condition(title, value):
+    r"""
+    Строит функцию проверки одного условия по исходным значениям полей строки csv-файла.
+    Правила сравнения совпадают с прежней фильтрацией по одному параметру
+    Args:
+        title (str): Заголовок параметра фильтрации
+        value (str): Значение параметра фильтрации
+
+    Returns:
+        function: Функция, принимающая строку с полями в порядке vacancy_fields и возвращающая bool
+
+    >>> compile_condition('Навыки', 'Git, SQL')(['', '', 'SQL\nGit\nLinux'])
+    True
+    """
+    if title == 'Оклад':
+        low, high = parse_salary_range(value)
+        return lambda row: int(float(row[6])) <= high and int(float(row[7])) >= low
+    if title == 'Дата публикации вакансии':
+        low, high = parse_date_range(value)
+        return lambda row: low <= row[11][:10] <= high
+    index = fields_index[dic_fields[title]]
+    values = value.split(', ')
+    if title == 'Навыки':
+        skills = set(values)
+        return lambda row: skills.issubset(row[index].split('\n'))
+    translator = VacancyIndex.category_translators.get(title)
+    if translator:
+        accepted = frozenset(raw for raw, translated in translator.items() if translated.split('\n') == values)
+        return lambda row: row[index] in accepted
+    expected = '\n'.join(values)
+    return lambda row: row[index] == expected
+
+
+def compile_filter(query):
+    """
+    Строит функцию проверки строки csv-файла по дереву запроса фильтрации
+    Args:
+        query (tuple): Дерево запроса, полученное parse_filter
+
+    Returns:
+        function: Функция, принимающая строку с полями в порядке vacancy_fields и возвращающая bool
+    """
+    if query[0] == 'condition':
+        return compile_condition(query[1], query[2])
+    if query[0] == 'not':
+        operand = compile_filter(query[1])
+        return lambda row: not operand(row)
+    operands = [compile_filter(operand) for operand in query[1]]
+    if query[0] == 'and':
+        return lambda row: all(operand(row) for operand in operands)
+    return lambda row: any(operand(row) for operand in operands)
+
+
+def partition_filter(query, partition_by):
+    """
+    Строит функцию, проверяющую по описанию раздела из manifest.json, могут ли в разделе быть вакансии,
+    подходящие под запрос. Разделы отбрасываются по условиям на дату публикации и, при разбиении по регионам,
+    на название региона
+    Args:
+        query (tuple): Дерево запроса, полученное parse_filter
+        partition_by (str): Способ разбиения каталога разделов
+
+    Returns:
+        function: Функция, принимающая описание раздела и возвращающая bool
+
+    >>> partition_filter(FilterParser('Дата публикации вакансии: 01.01.2022-31.12.2022').parse(), 'year')({'first_published': '2021-01-10T09:00:00+0300', 'last_published': '2021-12-30T09:00:00+0300'})
+    False
+    """
+    if query[0] == 'condition':
+        if query[1] == 'Дата публикации вакансии':
+            low, high = parse_date_range(query[2])
+            return lambda partition: vacancyPartitions.overlaps_dates(partition, low, high)
+        if query[1] == 'Название региона' and partition_by == 'area':
+            expected = '\n'.join(query[2].split(', '))
+            return lambda partition: partition['key'] == expected
+        return lambda partition: True
+    if query[0] == 'not':
+        return lambda partition: True
+    operands = [partition_filter(operand, partition_by) for operand in query[1]]
+    if query[0] == 'and':
+        return lambda partition: all(operand(partition) for operand in operands)
+    return lambda partition: any(operand(partition) for operand in operands)
+
+
+def filter_rows(rows, filter_opt):
+    """
+    Отбирает строки csv-файла по запросу фильтрации до создания объектов вакансий
+    Args:
+        rows (iterator of list of str): Строки данных
+        filter_opt (str): Запрос фильтрации, пустой запрос отбирает все строки
+
+    Returns:
+        tuple: Количество просмотренных строк и список подходящих строк
+    """
+    if not filter_opt:
+        matched = list(rows)
+        return len(matched), matched
+    predicate = compile_filter(parse_filter(filter_opt))
+    rows_count = 0
+    matched = []
+    for row in rows:
+        rows_count += 1
+        if predicate(row):
+            matched.append(row)
+    return rows_count, matched
+
 
 def check_filter_value(filter_opt):
     """
@@ -121,15 +496,50 @@ def check_filter_value(filter_opt):
     'Параметр поиска некорректен'
     >>> check_filter_value('Опыт работы: Без опыта')
     False
+    >>> check_filter_value('Опыт работы: Нет опыта И (Оклад: 50000-100000 ИЛИ НЕ Название региона: Москва)')
+    False
+    >>> check_filter_value('Оклад: много')
+    'Формат ввода некорректен'
+    >>> check_filter_value('(Название: Программист')
+    'Формат ввода некорректен'
+    >>> check_filter_value('Компания: Рога И Копыта')
+    False
+    >>> check_filter_value('Компания: ООО "A AND B"')
+    False
+    >>> check_filter_value('Компания: "Рога И Копыта" ИЛИ НЕ Название: Программист')
+    False
     """
     if filter_opt != '':
-        if ':' not in filter_opt:
-            return "Формат ввода некорректен"
-        elif filter_opt.split(': ')[0] not in dic_naming.values():
-            return "Параметр поиска некорректен"
+        try:
+            compile_filter(parse_filter(filter_opt))
+        except ValueError as error:
+            return str(error)
     return False
 
 
+def parse_sorter(sorter, is_reverse):
+    """
+    Разбирает параметр сортировки по нескольким столбцам вида 'Опыт работы, Оклад: Да, Дата публикации вакансии: Да'.
+    Для столбца без явного указания порядка используется общий параметр обратной сортировки
+    Args:
+        sorter (str): Значение параметра сортировки
+        is_reverse (str): Значение параметра обратной сортировки
+
+    Returns:
+        list of tuple: Пары (заголовок столбца, признак обратного порядка)
+
+    >>> parse_sorter('Опыт работы, Оклад: Да', 'Нет')
+    [('Опыт работы', False), ('Оклад', True)]
+    >>> parse_sorter('Название', 'Да')
+    [('Название', True)]
+    """
+    sort_keys = []
+    for item in sorter.split(', '):
+        title, _, reverse = item.partition(': ')
+        sort_keys.append((title, (reverse or is_reverse) == 'Да'))
+    return sort_keys
+
+
 def check_sorter_value(sorter):
     """
     Проверяет значение параметра сортировки на соответствие требованиям
@@ -145,9 +555,19 @@ def check_sorter_value(sorter):
     False
     >>> check_sorter_value('НеверныйЗаголовок')
     'Параметр сортировки некорректен'
+    >>> check_sorter_value('Опыт работы, Оклад: Да, Дата публикации вакансии: Нет')
+    False
+    >>> check_sorter_value('Опыт работы, Оклад: Может быть')
+    'Порядок сортировки задан некорректно'
     """
-    if sorter != '' and sorter not in dic_naming.values():
-        return "Параметр сортировки некорректен"
+    if sorter == '':
+        return False
+    for item in sorter.split(', '):
+        title, _, reverse = item.partition(': ')
+        if title not in dic_naming.values():
+            return "Параметр сортировки некорректен"
+        if reverse not in ['', 'Да', 'Нет']:
+            return "Порядок сортировки задан некорректно"
     return False
 
 
@@ -172,6 +592,35 @@ def check_reverse_value(reverse_sort):
     return False
 
 
+def check_range_value(split_r):
+    """
+    Проверяет нумерованные границы выводимых строк на соответствие требованиям
+    Args:
+        split_r (list of str): Значение параметра диапазона строк, разделенное по пробелам
+
+    Returns:
+        str or bool: Найденная ошибка или False, если введенный параметр выполняет требования
+
+    >>> check_range_value([''])
+    False
+    >>> check_range_value(['10', '20'])
+    False
+    >>> check_range_value(['abc'])
+    'Диапазон строк задан некорректно'
+    >>> check_range_value(['1', 'x'])
+    'Диапазон строк задан некорректно'
+    """
+    if split_r == ['']:
+        return False
+    if len(split_r) > 2 or not all(bound.isdecimal() and int(bound) > 0 for bound in split_r):
+        return "Диапазон строк задан некорректно"
+    return False
+
+
+# Регулярное выражение для удаления html-тегов из описания вакансии
+html_tags = re.compile(r'<[^>]+>')
+
+
 def formatter(row, key):
     """
     Форматирует строковое значение параметра вакансии в соответствии с правилами для каждого столбца
@@ -199,8 +648,7 @@ def formatter(row, key):
         row.strip()
         row = ' '.join(row.split())
     elif key == 'description':
-        regex = re.compile(r'<[^>]+>')
-        row = regex.sub('', row)
+        row = html_tags.sub('', row)
         row.strip()
         row = ' '.join(row.split())
     elif key == 'key_skills':
@@ -229,6 +677,24 @@ def formatter(row, key):
     return row
 
 
+@functools.lru_cache(maxsize=65536)
+def format_category(row, key):
+    """
+    Форматирует значение поля с небольшим числом различных значений, запоминая результат для повторяющихся
+    значений. Кэш ограничен, потому что в сервере запросов функция работает всё время жизни процесса
+    Args:
+        row(str): Строковое значение параметра вакансии
+        key(str): Указатель названия столбца, к которому относится строковое значение
+
+    Returns:
+        str: Отформатированное строковое значение параметра вакансии
+
+    >>> format_category('between1And3', 'experience_id')
+    'От 1 года до 3 лет'
+    """
+    return formatter(row, key)
+
+
 class Salary(object):
     """
     Класс для представления зарплаты
@@ -239,6 +705,8 @@ class Salary(object):
         salary_currency (str): Валюта оклада
         salary_to_print (str): Отформатированная строка зарплаты для печати
     """
+    __slots__ = ('salary_from', 'salary_to', 'salary_gross', 'salary_currency')
+
     def __init__(self, salary_f, salary_t, salary_g, salary_c):
         """
         Инициализирует объект Salary
@@ -265,7 +733,18 @@ class Salary(object):
         self.salary_to = salary_t
         self.salary_gross = salary_g
         self.salary_currency = salary_c
-        self.salary_to_print = formatter(self, 'salary')
+
+    @property
+    def salary_to_print(self):
+        """
+        Форматирует зарплату для печати. Вычисляется только при обращении
+        Returns:
+            str: Отформатированная строка зарплаты
+
+        >>> Salary(10000, 20000.5, 'True', 'RUR').salary_to_print
+        '10 000 - 20 000 (Рубли) (Без вычета налогов)'
+        """
+        return formatter(self, 'salary')
 
     def converter(self):
         """
@@ -293,10 +772,15 @@ class Vacancy(object):
     """
     Класс для представления вакансии
 
+    Отформатированные значения полей вычисляются только при обращении к ним, то есть только для вакансий,
+    попавших в выводимый диапазон строк таблицы
+
     Attributes:
-        full_dict (dict): Полный словарь из названий парметров и значений параметров
+        raw (tuple of str): Исходные значения полей вакансии в порядке vacancy_fields
+        salary_info (Salary object): Зарплата
+        row_id (int or None): Номер вакансии в загруженном датасете
         name (str): Название вакансии
-        salary (Salary object): Зарплата
+        salary (str): Отформатированная зарплата
         area_name (str): Название региона
         published_at (str): Дата публикации вакансии
         description (str): Описание вакансии
@@ -305,11 +789,14 @@ class Vacancy(object):
         employer_name (str): Название компании работодателя
         experience_id (str): Опыт работы
     """
-    def __init__(self, vacancy_row):
+    __slots__ = ('raw', 'salary_info', 'row_id')
+
+    def __init__(self, vacancy_row, row_id=None):
         r"""
         Инициализирует объект Vacancy
         Args:
             vacancy_row(list of str or int): Список параметров вакансии
+            row_id(int or None): Номер вакансии в загруженном датасете
 
         >>> type(Vacancy(['Оператор сервисного центра', 'Необходимо отвечать на звонки клиентов и решать их проблемы', 'Ответственность\nКоммуникабельность', 'noExperience', 'False', 'ОАО "Информационные технологии"', 20000, 30000, 'False', 'RUR', 'Екатеринбург', '2022-07-15T09:56:52+0300'])).__name__
         'Vacancy'
@@ -332,30 +819,266 @@ class Vacancy(object):
         >>> Vacancy(['Оператор сервисного центра', 'Необходимо отвечать на звонки клиентов и решать их проблемы', 'Ответственность\nКоммуникабельность', 'noExperience', 'False', 'ОАО "Информационные технологии"', 20000, 30000, 'False', 'RUR', 'Екатеринбург', '2022-07-15T09:56:52+0300']).published_at
         '15.07.2022'
         """
-        self.full_dict = dict({
-            'name': vacancy_row[0],
-            'description': vacancy_row[1],
-            'key_skills': vacancy_row[2],
-            'experience_id': vacancy_row[3],
-            'premium': vacancy_row[4],
-            'employer_name': vacancy_row[5],
-            'salary': Salary(vacancy_row[6], vacancy_row[7], vacancy_row[8], vacancy_row[9]),
-            'salary_from': vacancy_row[6],
-            'salary_to': vacancy_row[7],
-            'salary_gross': vacancy_row[8],
-            'salary_currency': vacancy_row[9],
-            'area_name': vacancy_row[10],
-            'published_at': vacancy_row[11]})
-
-        self.name = formatter(vacancy_row[0], 'name')
-        self.description = formatter(vacancy_row[1], 'description')
-        self.key_skills = formatter(vacancy_row[2], 'key_skills')
-        self.experience_id = formatter(vacancy_row[3], 'experience_id')
-        self.premium = formatter(vacancy_row[4], 'premium')
-        self.employer_name = formatter(vacancy_row[5], 'employer_name')
-        self.salary = Salary(vacancy_row[6], vacancy_row[7], vacancy_row[8], vacancy_row[9]).salary_to_print
-        self.area_name = formatter(vacancy_row[10], 'area_name')
-        self.published_at = formatter(vacancy_row[11], 'published_at')
+        self.raw = tuple(sys.intern(value) if field in categorical_fields and type(value) is str else value
+                         for field, value in zip(vacancy_fields, vacancy_row))
+        self.salary_info = Salary(vacancy_row[6], vacancy_row[7], self.raw[8], self.raw[9])
+        self.row_id = row_id
+
+    name = property(lambda self: formatter(self.raw[0], 'name'))
+    description = property(lambda self: formatter(self.raw[1], 'description'))
+    key_skills = property(lambda self: formatter(self.raw[2], 'key_skills'))
+    experience_id = property(lambda self: format_category(self.raw[3], 'experience_id'))
+    premium = property(lambda self: format_category(self.raw[4], 'premium'))
+    employer_name = property(lambda self: formatter(self.raw[5], 'employer_name'))
+    salary = property(lambda self: self.salary_info.salary_to_print)
+    area_name = property(lambda self: format_category(self.raw[10], 'area_name'))
+    published_at = property(lambda self: formatter(self.raw[11], 'published_at'))
+
+    def field(self, field):
+        """
+        Возвращает исходное значение поля вакансии
+        Args:
+            field (str): Английское название поля
+
+        Returns:
+            str: Значение поля из csv-файла
+
+        >>> Vacancy(['Оператор', 'Описание', 'Ответственность', 'noExperience', 'False', 'ОАО "ИТ"', 20000, 30000, 'False', 'RUR', 'Екатеринбург', '2022-07-15T09:56:52+0300']).field('area_name')
+        'Екатеринбург'
+        """
+        return self.raw[fields_index[field]]
+
+    @property
+    def full_dict(self):
+        """
+        Формирует полный словарь из названий параметров и значений параметров
+        Returns:
+            dict: Исходные значения полей вакансии и объект зарплаты под ключом 'salary'
+        """
+        full_dict = dict(zip(vacancy_fields, self.raw))
+        full_dict['salary'] = self.salary_info
+        return full_dict
+
+
+class SalaryIntervals(object):
+    """
+    Статическое дерево интервалов вилок окладов для поиска вакансий, в вилку которых попадает значение
+    """
+    def __init__(self, intervals):
+        """
+        Строит дерево интервалов
+        Args:
+            intervals (list of tuple): Тройки (нижняя граница, верхняя граница, номер вакансии)
+
+        >>> SalaryIntervals([(10, 20, 0), (15, 30, 1), (40, 50, 2)]).stab(18)
+        [0, 1]
+        >>> SalaryIntervals([(10, 20, 0), (15, 30, 1), (40, 50, 2)]).stab(35)
+        []
+        """
+        self.root = self.build(intervals)
+
+    def build(self, intervals):
+        """
+        Рекурсивно строит узел дерева: интервалы, содержащие центр, хранятся в узле отсортированными
+        по нижней и по верхней границе, остальные уходят в левое и правое поддеревья
+        Args:
+            intervals (list of tuple): Тройки (нижняя граница, верхняя граница, номер вакансии)
+
+        Returns:
+            tuple or None: Центр, интервалы узла по возрастанию нижней границы, интервалы узла по убыванию
+            верхней границы, левое и правое поддеревья
+        """
+        if not intervals:
+            return None
+        endpoints = sorted(bound for interval in intervals for bound in interval[:2])
+        center = endpoints[len(endpoints) // 2]
+        left = [interval for interval in intervals if interval[1] < center]
+        right = [interval for interval in intervals if interval[0] > center]
+        middle = [interval for interval in intervals if interval[0] <= center <= interval[1]]
+        return (center, sorted(middle, key=lambda interval: interval[0]),
+                sorted(middle, key=lambda interval: interval[1], reverse=True),
+                self.build(left), self.build(right))
+
+    def stab(self, value):
+        """
+        Находит интервалы, содержащие значение
+        Args:
+            value (int): Значение оклада
+
+        Returns:
+            list of int: Номера вакансий по возрастанию
+        """
+        found = []
+        node = self.root
+        while node is not None:
+            center, by_lower, by_upper, left, right = node
+            if value < center:
+                found.extend(itertools.takewhile(lambda interval: interval[0] <= value, by_lower))
+                node = left
+            elif value > center:
+                found.extend(itertools.takewhile(lambda interval: interval[1] >= value, by_upper))
+                node = right
+            else:
+                found.extend(by_lower)
+                node = None
+        return sorted(interval[2] for interval in found)
+
+
+# Номера установленных битов для каждого значения байта
+byte_bits = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+class SkillIndex(object):
+    """
+    Инвертированный индекс навыков: для каждого навыка хранятся номера вакансий, в которых он указан.
+    Частые навыки хранятся битовой картой, редкие - отсортированным списком номеров, поэтому запрос
+    из нескольких навыков сводится к пересечению битовых карт
+
+    Attributes:
+        size (int): Количество проиндексированных вакансий
+        postings (dict): Битовая карта (bytes) или список номеров вакансий для каждого навыка
+    """
+    def __init__(self, vacancies):
+        """
+        Строит индекс навыков
+        Args:
+            vacancies (list of Vacancy objects): Список вакансий
+
+        >>> index = SkillIndex([Vacancy(['A', 'B', 'Python\\nSQL', 'noExperience', 'False', 'C', 1, 2, 'False', 'RUR', 'D', '2022-07-15T09:56:52+0300'])])
+        >>> index.select(['SQL', 'Python'])
+        [0]
+        """
+        self.size = len(vacancies)
+        lists = {}
+        for row_id, vacancy in enumerate(vacancies):
+            for skill in set(vacancy.field('key_skills').split('\n')):
+                lists.setdefault(skill, []).append(row_id)
+        self.postings = {skill: self.to_bitmap(row_ids) if len(row_ids) * 32 > self.size else row_ids
+                         for skill, row_ids in lists.items()}
+
+    def to_bitmap(self, row_ids):
+        """
+        Преобразует список номеров вакансий в битовую карту
+        Args:
+            row_ids (list of int): Номера вакансий
+
+        Returns:
+            bytes: Битовая карта, в которой бит с номером вакансии установлен
+        """
+        bitmap = bytearray((self.size + 7) // 8)
+        for row_id in row_ids:
+            bitmap[row_id >> 3] |= 1 << (row_id & 7)
+        return bytes(bitmap)
+
+    @staticmethod
+    def from_bitmap(bitmap):
+        """
+        Преобразует битовую карту в список номеров вакансий
+        Args:
+            bitmap (bytes): Битовая карта
+
+        Returns:
+            list of int: Номера установленных битов по возрастанию
+        """
+        return [position * 8 + bit for position in itertools.compress(range(len(bitmap)), bitmap)
+                for bit in byte_bits[bitmap[position]]]
+
+    def select(self, skills):
+        """
+        Находит вакансии, в которых указаны все навыки
+        Args:
+            skills (list of str): Навыки
+
+        Returns:
+            list of int: Номера вакансий по возрастанию
+        """
+        postings = [self.postings.get(skill) for skill in set(skills)]
+        if not postings or None in postings:
+            return []
+        bitmaps = [posting for posting in postings if isinstance(posting, bytes)]
+        lists = sorted((posting for posting in postings if isinstance(posting, list)), key=len)
+        bitmap = None
+        if bitmaps:
+            bitmap = functools.reduce(lambda first, second: first & second,
+                                      (int.from_bytes(posting, 'little') for posting in bitmaps))
+            bitmap = bitmap.to_bytes(len(bitmaps[0]), 'little')
+        if not lists:
+            return self.from_bitmap(bitmap)
+        row_ids = lists[0]
+        for posting in lists[1:]:
+            posting = set(posting)
+            row_ids = [row_id for row_id in row_ids if row_id in posting]
+        if bitmap is not None:
+            row_ids = [row_id for row_id in row_ids if bitmap[row_id >> 3] >> (row_id & 7) & 1]
+        return row_ids
+
+
+class VacancyIndex(object):
+    """
+    Вторичные индексы загруженного списка вакансий: хэш-индексы категориальных полей, дерево интервалов
+    окладов, индекс дат публикации и инвертированный индекс навыков. Строятся один раз и отвечают на
+    запросы фильтрации без полного перебора
+
+    Attributes:
+        vacancies (list of Vacancy objects): Список вакансий, по которому построены индексы
+        categories (dict): Для каждого индексируемого заголовка словарь значений и номеров вакансий
+        salaries (SalaryIntervals): Дерево интервалов вилок окладов
+        dates (dict): Номера вакансий по дате публикации в формате 'ГГГГ-ММ-ДД'
+        skills (SkillIndex): Инвертированный индекс навыков
+    """
+    # Индексируемые категориальные заголовки и словари перевода их значений
+    category_translators = {
+        'Опыт работы': dic_work_experience,
+        'Премиум-вакансия': dic_bool,
+        'Идентификатор валюты оклада': dic_currency,
+        'Компания': None,
+        'Название региона': None
+    }
+
+    def __init__(self, vacancies):
+        """
+        Строит индексы по списку вакансий
+        Args:
+            vacancies (list of Vacancy objects): Список вакансий
+        """
+        self.vacancies = vacancies
+        self.categories = {title: {} for title in self.category_translators}
+        self.dates = {}
+        intervals = []
+        for row_id, vacancy in enumerate(vacancies):
+            for title, translator in self.category_translators.items():
+                value = vacancy.field(dic_fields[title])
+                for line in set((translator[value] if translator else value).split('\n')):
+                    self.categories[title].setdefault(line, []).append(row_id)
+            self.dates.setdefault(vacancy.field('published_at')[:10], []).append(row_id)
+            intervals.append((int(float(vacancy.field('salary_from'))), int(float(vacancy.field('salary_to'))), row_id))
+        self.salaries = SalaryIntervals(intervals)
+        self.skills = SkillIndex(vacancies)
+
+    def select(self, filter_key, filter_value):
+        """
+        Находит номера вакансий, удовлетворяющих условию фильтрации, с теми же правилами сравнения, что и filter_data
+        Args:
+            filter_key (str): Заголовок параметра фильтрации
+            filter_value (str): Значение параметра фильтрации
+
+        Returns:
+            list of int or None: Номера вакансий по возрастанию или None, если условие не отвечается индексом
+        """
+        if filter_key == 'Оклад':
+            low, high = parse_salary_range(filter_value)
+            return self.salaries.stab(low) if low == high else None
+        if filter_key == 'Навыки':
+            return self.skills.select(filter_value.split(', '))
+        if filter_key == 'Дата публикации вакансии':
+            low, high = parse_date_range(filter_value)
+            return list(heapq.merge(*(row_ids for date, row_ids in self.dates.items() if low <= date <= high)))
+        if filter_key in self.categories:
+            values = set(filter_value.split(', '))
+            if len(values) != 1:
+                return []
+            return self.categories[filter_key].get(values.pop(), [])
+        return None
 
 
 class DataSet(object):
@@ -364,117 +1087,236 @@ class DataSet(object):
 
     Attributes:
         vacancies (list of Vacancy objects): Список вакансий датасета
+        all_vacancies (list of Vacancy objects): Все загруженные вакансии, номер в списке - row_id вакансии
+        header (list of str or None): Заголовок csv-файла
+        index (VacancyIndex or None): Вторичные индексы загруженного списка вакансий, если они построены
+        key_columns (dict): Построенные колонки ключей сортировки по заголовкам, индекс - row_id вакансии
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, use_cache=False, processes=None, filter_opt=''):
         """
-        Инициализирует объект датасета
+        Инициализирует объект датасета. Если задан запрос фильтрации, он проверяется по исходным значениям
+        полей во время чтения файла, и объекты вакансий создаются только для подходящих строк
         Args:
-            file_path (str): Путь к csv-файлу с данными о вакансиях
+            file_path (str): Путь к csv-файлу с данными о вакансиях или к каталогу разделов, созданному
+                vacancyPartitions.partition_csv. Из каталога читаются только разделы, в которых могут быть
+                вакансии, подходящие под запрос фильтрации
+            use_cache (bool): Читать данные из двоичного кэша рядом с csv-файлом и создавать его при отсутствии
+            processes (int or None): Количество процессов для параллельного разбора файла или разделов
+            filter_opt (str): Запрос фильтрации, проверяемый при чтении
 
         >>> type(DataSet('vacancies.csv')).__name__
         'DataSet'
         """
-        vacancies = []
-        vacancies_objs = []
-        with open(file_path, encoding="utf-8-sig") as File:
-            if os.stat(file_path).st_size == 0:
-                self.vacancies = 'Пустой файл'
-            else:
-                reader = csv.reader(File, delimiter=',', quotechar='"')
-                for vacancy in reader:
-                    if all(vacancy):
-                        vacancies.append(vacancy)
-                        if len(vacancy) < len(vacancies[0]):
-                            vacancies.remove(vacancy)
-
-            if len(vacancies) == 1:
-                self.vacancies = 'Нет данных'
-            elif len(vacancies) != 0:
-                columns_names.extend([dic_naming[x] for x in vacancies[0]])
-                for vacancy in vacancies[1::]:
-                    vacancies_objs.append(Vacancy(vacancy))
-                self.vacancies = vacancies_objs
+        self.index = None
+        self.key_columns = {}
+        self.all_vacancies = []
+        self.header = None
+        is_partitioned = vacancyPartitions.is_partitioned(file_path)
+        if not is_partitioned and os.stat(file_path).st_size == 0:
+            self.vacancies = 'Пустой файл'
+            return
+        rows_count = None
+        if is_partitioned:
+            manifest = vacancyPartitions.read_manifest(file_path)
+            header, partitions = manifest['header'], manifest['partitions']
+            selected = partitions
+            if filter_opt:
+                is_needed = partition_filter(parse_filter(filter_opt), manifest['partition_by'])
+                selected = [partition for partition in partitions if is_needed(partition)]
+            parts = vacancyPartitions.map_partitions(file_path, selected, filter_rows, (filter_opt,), processes,
+                                                     use_cache)
+            selected_files = {partition['file'] for partition in selected}
+            rows_count = sum(count for count, _ in parts) + \
+                sum(partition.get('valid_rows', partition['rows']) for partition in partitions
+                    if partition['file'] not in selected_files)
+            rows = itertools.chain.from_iterable(matched for _, matched in parts)
+        elif processes and filter_opt and not use_cache:
+            header, parts = parallelReader.map_ranges(file_path, filter_rows, (filter_opt,), processes)
+            rows_count = sum(count for count, _ in parts)
+            rows = itertools.chain.from_iterable(matched for _, matched in parts)
+        else:
+            reader = functools.partial(parallelReader.read_rows_parallel, processes=processes) if processes else \
+                parallelReader.read_rows
+            rows = vacancyCache.cached_rows(file_path, reader) if use_cache else reader(file_path)
+            header = next(rows, None)
+            if filter_opt:
+                rows_count, rows = filter_rows(rows, filter_opt)
+        self.vacancies = self.all_vacancies = [Vacancy(vacancy, row_id) for row_id, vacancy in enumerate(rows)]
+        if rows_count is None:
+            rows_count = len(self.vacancies)
+        if rows_count == 0:
+            self.vacancies = 'Нет данных'
+        else:
+            self.header = header
+            if len(self.vacancies) == 0:
+                self.vacancies = 'Ничего не найдено'
+
+    def view(self):
+        """
+        Создает представление датасета с собственным списком вакансий. Загруженные вакансии, индексы и
+        колонки ключей сортировки общие, поэтому представление создается быстро, а фильтрация и сортировка
+        представления не изменяют исходный датасет
+        Returns:
+            DataSet: Представление датасета
+        """
+        return copy.copy(self)
+
+    def create_index(self):
+        """
+        Строит вторичные индексы по загруженному списку вакансий. Имеет смысл, если датасет
+        фильтруется больше одного раза
+        """
+        self.index = VacancyIndex(self.vacancies)
 
     def filter_data(self, filter_opt):
         """
-        Фильтрует список вакансий по заданному условию
+        Фильтрует список вакансий по запросу фильтрации. Если построены индексы, а запрос состоит
+        из одного условия по индексируемому заголовку, полный перебор вакансий не выполняется
         Args:
             filter_opt(str): Значение параметра фильтрации
         """
-        filter_key = filter_opt.split(': ')[0]
-        filter_value = filter_opt.split(': ')[1]
-        if filter_key == 'Оклад':
-            self.vacancies = list(
-                filter(lambda x:
-                       dic_filters[filter_key]
-                       (int(x.full_dict['salary_from']),
-                        int(x.full_dict['salary_to']),
-                        int(filter_value)),
-                       self.vacancies))
-        elif filter_key == 'Дата публикации вакансии':
-            self.vacancies = list(
-                filter(lambda x:
-                       dic_filters[filter_key]
-                       (x.full_dict['published_at'][:4],
-                        x.full_dict['published_at'][5:7],
-                        x.full_dict['published_at'][8:10],
-                        filter_value[:2],
-                        filter_value[3:5],
-                        filter_value[6:10]),
-                       self.vacancies))
-        elif filter_key == 'Опыт работы':
-            self.vacancies = list(
-                filter(lambda x:
-                       dic_filters[filter_key]
-                       (dic_work_experience[x.full_dict[invert_dic(dic_naming)[filter_key]]].split('\n'),
-                        filter_value.split(', ')),
-                       self.vacancies))
-        elif filter_key in ['Опыт работы', 'Премиум-вакансия']:
-            self.vacancies = list(
-                filter(lambda x:
-                       dic_filters[filter_key]
-                       (dic_bool[x.full_dict[invert_dic(dic_naming)[filter_key]]].split('\n'),
-                        filter_value.split(', ')),
-                       self.vacancies))
-        elif filter_key in ['Идентификатор валюты оклада']:
-            self.vacancies = list(
-                filter(lambda x:
-                       dic_filters[filter_key]
-                       (dic_currency[x.full_dict[invert_dic(dic_naming)[filter_key]]].split('\n'),
-                        filter_value.split(', ')),
-                       self.vacancies))
+        query = parse_filter(filter_opt)
+        row_ids = None
+        if self.index is not None and query[0] == 'condition':
+            row_ids = self.index.select(query[1], query[2])
+        if row_ids is not None:
+            matched = [self.index.vacancies[row_id] for row_id in row_ids]
+            if self.vacancies is not self.index.vacancies:
+                matched_ids = set(map(id, matched))
+                matched = [vacancy for vacancy in self.vacancies if id(vacancy) in matched_ids]
+            self.vacancies = matched
         else:
-            self.vacancies = list(
-                filter(lambda x:
-                       dic_filters[filter_key]
-                       (x.full_dict[invert_dic(dic_naming)[filter_key]].split('\n'),
-                        filter_value.split(', ')),
-                       self.vacancies))
+            predicate = compile_filter(query)
+            self.vacancies = [vacancy for vacancy in self.vacancies if predicate(vacancy.raw)]
         if len(self.vacancies) == 0:
             self.vacancies = 'Ничего не найдено'
 
-    def sorter_data(self, sorter_opt, is_reverse):
+    def sort_key_column(self, sorter_opt):
         """
-        Сортирует список вакансий по заданному условию
+        Возвращает колонку ключей сортировки по столбцу для всех загруженных вакансий. Колонка строится
+        при первом обращении и переиспользуется при следующих сортировках
+        Args:
+            sorter_opt (str): Заголовок столбца
+
+        Returns:
+            array or list: Ключи сортировки, индекс - row_id вакансии
+        """
+        column = self.key_columns.get(sorter_opt)
+        if column is None:
+            key = dic_sorters.get(sorter_opt) or (lambda d: d.field(dic_fields[sorter_opt]))
+            keys = (key(vacancy) for vacancy in self.all_vacancies)
+            column = array(sort_key_types[sorter_opt], keys) if sorter_opt in sort_key_types else list(keys)
+            self.key_columns[sorter_opt] = column
+        return column
+
+    def sorter_data(self, sorter_opt, is_reverse, limit=None):
+        """
+        Сортирует список вакансий по одному или нескольким столбцам, например
+        'Опыт работы, Оклад: Да, Дата публикации вакансии: Да'. Ключи берутся из колонок ключей сортировки.
+        Если задан limit, вместо полной сортировки выбираются только первые limit вакансий с помощью кучи,
+        результат совпадает с началом полного устойчивого упорядочивания
         Args:
             sorter_opt (str): Значение параметра сортировки
             is_reverse (str): Значение параметра обратной сортировки
+            limit (int or None): Количество первых вакансий, которые нужно оставить
         """
-        is_reverse_sorter = is_reverse == 'Да'
+        sort_keys = parse_sorter(sorter_opt, is_reverse)
+        columns = [self.sort_key_column(title) for title, _ in sort_keys]
+        reverses = [reverse for _, reverse in sort_keys]
+        row_ids = [vacancy.row_id for vacancy in self.vacancies]
+
+        if all(reverse == reverses[0] for reverse in reverses):
+            is_reverse_sorter = reverses[0]
+            negations = [False] * len(columns)
+        elif all(title in sort_key_types for title, reverse in sort_keys if reverse):
+            is_reverse_sorter = False
+            negations = reverses
+        else:
+            order = list(range(len(row_ids)))
+            for column, reverse in reversed(list(zip(columns, reverses))):
+                order.sort(key=lambda index: column[row_ids[index]], reverse=reverse)
+            self.vacancies = [self.vacancies[index] for index in order[:limit]]
+            return
 
-        if sorter_opt in ['Название', 'Описание', 'Компания', 'Название региона',
-                           'Премиум-вакансия', 'Оклад указан до вычета налогов', 'Идентификатор валюты оклада']:
-            self.vacancies = sorted(self.vacancies, reverse=is_reverse_sorter,
-                                    key=lambda d: d.full_dict[invert_dic(dic_naming)[sorter_opt]])
+        if len(columns) == 1:
+            keys = [columns[0][row_id] for row_id in row_ids]
+        else:
+            keys = [tuple(-column[row_id] if negation else column[row_id]
+                          for column, negation in zip(columns, negations)) for row_id in row_ids]
+        order = range(len(row_ids))
+        if limit is not None and limit < len(row_ids):
+            select = heapq.nlargest if is_reverse_sorter else heapq.nsmallest
+            order = select(limit, order, key=keys.__getitem__)
         else:
-            self.vacancies = sorted(self.vacancies, reverse=is_reverse_sorter, key=dic_sorters[sorter_opt])
+            order = sorted(order, key=keys.__getitem__, reverse=is_reverse_sorter)
+        self.vacancies = [self.vacancies[index] for index in order]
+
+
+def table_columns(header):
+    """
+    Формирует заголовки столбцов выводимой таблицы по заголовку csv-файла: добавляет номер строки и
+    заменяет четыре поля зарплаты одним столбцом оклада
+    Args:
+        header (list of str): Заголовок csv-файла
+
+    Returns:
+        list of str: Заголовки столбцов таблицы
+
+    >>> table_columns(list(vacancy_fields))[6:]
+    ['Компания', 'Оклад', 'Название региона', 'Дата публикации вакансии']
+    """
+    columns = ['№'] + [dic_naming[field] for field in header]
+    columns.insert(7, dic_naming['salary'])
+    for field in ['salary_from', 'salary_to', 'salary_gross', 'salary_currency']:
+        columns.remove(dic_naming[field])
+    return columns
+
+
+def print_vacancies(data, sorter_opt, is_reverse, split_r, columns_r, file=None):
+    """
+    Сортирует загруженный и отфильтрованный датасет и выводит заданный диапазон строк в виде таблицы
+    Args:
+        data (DataSet): Датасет, список вакансий которого уже отфильтрован
+        sorter_opt (str): Значение параметра сортировки
+        is_reverse (str): Значение параметра обратной сортировки
+        split_r (list of str): Нумерованные границы строк, которые должны быть выведены
+        columns_r (list of str): Список названий столбцов, которые должны быть выведены
+        file (file object or None): Файл для вывода, по умолчанию - стандартный вывод
+    """
+    if len(split_r) == 2:
+        window = slice(int(split_r[0]) - 1, int(split_r[1]) - 1)
+    elif split_r[0] != '':
+        window = slice(int(split_r[0]) - 1, None)
+    else:
+        window = slice(None)
+
+    # SORTER
+    if sorter_opt != '' and data.vacancies != 'Ничего не найдено':
+        is_window_prefix = window.stop is not None and window.stop >= 0 and (window.start or 0) >= 0
+        data.sorter_data(sorter_opt, is_reverse, window.stop if is_window_prefix else None)
+
+    if data.vacancies == 'Ничего не найдено':
+        print('Ничего не найдено', file=file)
+        return
+
+    columns_names = table_columns(data.header)
+    output_range = [columns_names[0]] + columns_r
+    if columns_r[0] == '':
+        output_range = columns_names
+
+    visible = range(len(data.vacancies))[window]
+    rows = ([index + 1, vacancy.name, vacancy.description, vacancy.key_skills, vacancy.experience_id,
+             vacancy.premium, vacancy.employer_name, vacancy.salary, vacancy.area_name, vacancy.published_at]
+            for index, vacancy in zip(visible, data.vacancies[window]))
+    table = tableRenderer.TableRenderer(columns_names, columns_max_width)
+    table.render(rows, fields=output_range, file=file)
 
 
 class InputConect(object):
     """
     Класс для вывода полученного списка вакансий в виде таблицы
     """
-    def __init__(self, file_path, filter_opt, sorter_opt, is_reverse, split_r, columns_r):
+    def __init__(self, file_path, filter_opt, sorter_opt, is_reverse, split_r, columns_r, use_cache=False):
         """
         Инициализирует объект InputConect
         Args:
@@ -484,6 +1326,7 @@ class InputConect(object):
             is_reverse (str): Значение параметра обратной сортировки
             split_r (list of two int): Нумерованные границы строк, которые должны быть выведены
             columns_r: Список названий столбцов, которые должны быть выведены
+            use_cache (bool): Использовать двоичный кэш разобранного csv-файла
         """
         if check_filter_value(filter_opt):
             print(check_filter_value(filter_opt))
@@ -491,60 +1334,16 @@ class InputConect(object):
             print(check_sorter_value(sorter_opt))
         elif check_reverse_value(is_reverse):
             print(check_reverse_value(is_reverse))
+        elif check_range_value(split_r):
+            print(check_range_value(split_r))
         else:
-            data = DataSet(file_path)
+            # FILTER
+            data = DataSet(file_path, use_cache, filter_opt=filter_opt)
             if data.vacancies in ['Нет данных', 'Пустой файл']:
                 print(data.vacancies)
             else:
-                # FILTER
-                if filter_opt != '':
-                    data.filter_data(filter_opt)
-
-                # SORTER
-                if sorter_opt != '':
-                    data.sorter_data(sorter_opt, is_reverse)
-
-                if data.vacancies == 'Ничего не найдено':
-                    print('Ничего не найдено')
-                else:
-                    for index, vacancy in enumerate(data.vacancies):
-                        table.add_row([index + 1] + [vacancy.name, vacancy.description, vacancy.key_skills,
-                                                     vacancy.experience_id, vacancy.premium, vacancy.employer_name,
-                                                     vacancy.salary, vacancy.area_name, vacancy.published_at])
-
-                    columns_names.insert(0, '№')
-                    columns_names.insert(7, 'salary')
-                    columns_names.remove('Нижняя граница вилки оклада')
-                    columns_names.remove('Верхняя граница вилки оклада')
-                    columns_names.remove('Оклад указан до вычета налогов')
-                    columns_names.remove('Идентификатор валюты оклада')
-                    for (index, field) in enumerate(columns_names):
-                        if field in dic_naming:
-                            columns_names[index] = dic_naming[field]
-
-                    table.field_names = columns_names
-                    table._max_width = {'№': 20, 'Название': 20, 'Описание': 20, 'Навыки': 20, 'Опыт работы': 20,
-                                        'Премиум-вакансия': 20, 'Компания': 20, 'Оклад': 20, 'Название региона': 20,
-                                        'Дата публикации вакансии': 20}
-
-                    output_range = [columns_names[0]] + columns_r
-                    if columns_r[0] == '':
-                        output_range = columns_names
-
-                    if len(split_r) == 2:
-                        print(table.get_string(start=int(split_r[0]) - 1, end=int(split_r[1]) - 1, fields=output_range))
-                    elif split_r[0] != '':
-                        print(table.get_string(start=int(split_r[0]) - 1, fields=output_range))
-                    else:
-                        print(table.get_string(fields=output_range))
-
-
-columns_names = []
-table = PrettyTable()
-table.align = "l"
-table.border = True
-table.hrules = ALL
-vacancies = []
+                print_vacancies(data, sorter_opt, is_reverse, split_r, columns_r)
+
 
 def PrintTable():
     """
@@ -558,6 +1357,7 @@ def PrintTable():
     split_range = input('Введите диапазон вывода: ').split(' ')
     columns_range = input('Введите требуемые столбцы: ').split(', ')
 
-    inputConnect = InputConect(file, filter_option, sorter_option, is_reverse_sort, split_range, columns_range)
+    inputConnect = InputConect(file, filter_option, sorter_option, is_reverse_sort, split_range, columns_range,
+                               use_cache=True)
 
 # Код из задачи 5.2
\ No newline at end of file
@@ -1,5 +1,28 @@
+import io
+import os
+import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from tableRenderer import TableRenderer
 from tableWriter import *
+from vacancyPartitions import partition_csv, read_manifest
+
+
+# Заголовок csv-файла с вакансиями в тестовых данных
+vacancy_header = ('name,description,key_skills,experience_id,premium,employer_name,salary_from,salary_to,'
+                  'salary_gross,salary_currency,area_name,published_at')
+
+
+def write_vacancies(directory, rows, file_name='vacancies.csv'):
+    file_path = os.path.join(directory, file_name)
+    with open(file_path, 'w', encoding='utf-8-sig') as file:
+        file.write(vacancy_header + '\n')
+        file.writelines(row + '\n' for row in rows)
+    return file_path
+
+
+def cached_vacancies_count(file_path):
+    return len(DataSet(file_path, use_cache=True).vacancies)
 
 
 class TableWriterTests(unittest.TestCase):
@@ -9,6 +32,76 @@ class TableWriterTests(unittest.TestCase):
         self.assertEqual(check_filter_value('Название: 1С-программист'), False)
         self.assertEqual(check_filter_value('Неверный заголовок: 1С-программист'), 'Параметр поиска некорректен')
         self.assertEqual(check_filter_value('Опыт работы: Без опыта'), False)
+        self.assertEqual(check_filter_value('Название: Программист (Java) ИЛИ НЕ (Оклад: 100-200 И Компания: Яндекс)'),
+                         False)
+        self.assertEqual(check_filter_value('Дата публикации вакансии: 2022'), 'Формат ввода некорректен')
+        self.assertEqual(check_filter_value('Название: Программист И Неверный заголовок: 1'),
+                         'Параметр поиска некорректен')
+
+    def test_filter_parser(self):
+        self.assertEqual(FilterParser('Название: Программист (Java) И (Компания: Яндекс ИЛИ Компания: Сбер)').parse(),
+                         ('and', [('condition', 'Название', 'Программист (Java)'),
+                                  ('or', [('condition', 'Компания', 'Яндекс'), ('condition', 'Компания', 'Сбер')])]))
+        self.assertEqual(FilterParser('Оклад: 1 OR Оклад: 2 AND NOT Оклад: 3').parse(),
+                         ('or', [('condition', 'Оклад', '1'),
+                                 ('and', [('condition', 'Оклад', '2'), ('not', ('condition', 'Оклад', '3'))])]))
+
+    def test_dataset_filter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,{["noExperience", "between1And3"][index % 2]},False,'
+                    f'Компания {index % 4},{index % 5}0000,{index % 5 + 1}0000,False,RUR,'
+                    f'{["Москва", "Казань", "Пермь"][index % 3]},2022-07-{index % 9 + 10}T09:56:52+0300'
+                    for index in range(40))
+            file_path = write_vacancies(directory, rows)
+            queries = ['Опыт работы: Нет опыта И (Название региона: Москва ИЛИ НЕ Оклад: 25000-35000)',
+                       'Дата публикации вакансии: 12.07.2022-14.07.2022 И Компания: Компания 1',
+                       'Название: Нет такой']
+            for query in queries:
+                predicate = compile_filter(FilterParser(query).parse())
+                expected = [vacancy.name for vacancy in DataSet(file_path).vacancies if predicate(vacancy.raw)]
+                for data in [DataSet(file_path, filter_opt=query), DataSet(file_path, processes=2, filter_opt=query)]:
+                    self.assertEqual([] if data.vacancies == 'Ничего не найдено' else
+                                     [vacancy.name for vacancy in data.vacancies], expected)
+                indexed = DataSet(file_path)
+                indexed.create_index()
+                indexed.filter_data(query)
+                self.assertEqual([] if indexed.vacancies == 'Ничего не найдено' else
+                                 [vacancy.name for vacancy in indexed.vacancies], expected)
+            self.assertEqual(DataSet(file_path, filter_opt=queries[2]).vacancies, 'Ничего не найдено')
+
+    def test_dataset_partitions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,noExperience,False,Компания {index % 4},'
+                    f'{index % 5}0000,{index % 5 + 1}0000,False,RUR,{["Москва", "Казань"][index % 2]},'
+                    f'20{10 + index % 4}-07-{index % 9 + 10}T09:56:52+0300'
+                    for index in range(40))
+            file_path = write_vacancies(directory, rows)
+            partition_csv(file_path, os.path.join(directory, 'years'))
+            partition_csv(file_path, os.path.join(directory, 'areas'), 'area')
+            queries = ['', 'Дата публикации вакансии: 12.07.2011-14.07.2011 И Компания: Компания 1',
+                       'Название региона: Казань ИЛИ Дата публикации вакансии: 10.07.2012',
+                       'Дата публикации вакансии: 10.07.2020']
+            for query in queries:
+                expected = DataSet(file_path, filter_opt=query).vacancies
+                for partitioned in ['years', 'areas']:
+                    data = DataSet(os.path.join(directory, partitioned), processes=2, filter_opt=query)
+                    if isinstance(expected, str):
+                        self.assertEqual(data.vacancies, expected)
+                    else:
+                        self.assertEqual(sorted(vacancy.name for vacancy in data.vacancies),
+                                         sorted(vacancy.name for vacancy in expected))
+            rows = (f'Вакансия {index},,Python,noExperience,False,Компания,10000,20000,False,RUR,Москва,'
+                    f'20{11 + index % 2}-07-15T09:56:52+0300'
+                    for index in range(4))
+            incomplete = write_vacancies(directory, rows, 'incomplete.csv')
+            partition_csv(incomplete, os.path.join(directory, 'incomplete'))
+            query = 'Дата публикации вакансии: 15.07.2011'
+            self.assertEqual(DataSet(incomplete, filter_opt=query).vacancies, 'Нет данных')
+            self.assertEqual(DataSet(os.path.join(directory, 'incomplete'), filter_opt=query).vacancies, 'Нет данных')
+            query = FilterParser('Дата публикации вакансии: 01.07.2011-31.07.2011').parse()
+            manifest = read_manifest(os.path.join(directory, 'years'))
+            self.assertEqual([partition['key'] for partition in manifest['partitions']
+                              if partition_filter(query, 'year')(partition)], ['2011'])
 
     def test_check_sorter_value(self):
         self.assertEqual(check_sorter_value('Название'), False)
@@ -20,6 +113,12 @@ class TableWriterTests(unittest.TestCase):
         self.assertEqual(check_reverse_value(''), False)
         self.assertEqual(check_reverse_value('НеверноеЗначение'), 'Порядок сортировки задан некорректно')
 
+    def test_check_range_value(self):
+        self.assertEqual(check_range_value(['']), False)
+        self.assertEqual(check_range_value(['5']), False)
+        self.assertEqual(check_range_value(['0', '5']), 'Диапазон строк задан некорректно')
+        self.assertEqual(check_range_value(['1', '2', '3']), 'Диапазон строк задан некорректно')
+
     def test_formatter(self):
         self.assertEqual(formatter('  Программист 1С'   , 'name'), 'Программист 1С')
         self.assertEqual(formatter('<p>Описание Вакансии</p>', 'description'), 'Описание Вакансии')
@@ -65,8 +164,156 @@ class TableWriterTests(unittest.TestCase):
         self.assertEqual(Vacancy(['Оператор сервисного центра', 'Необходимо отвечать на звонки клиентов и решать их проблемы', 'Ответственность\nКоммуникабельность', 'noExperience', 'False', 'ОАО "Информационные технологии"', 20000, 30000, 'False', 'RUR', 'Екатеринбург', '2022-07-15T09:56:52+0300']).published_at,
                          '15.07.2022')
 
+    def test_vacancy_slots(self):
+        vacancy = Vacancy(['Оператор', 'Описание', 'Ответственность', 'between1And3', 'False', 'ОАО "ИТ"', 20000,
+                           30000, 'False', 'RUR', 'Екатеринбург', '2022-07-15T09:56:52+0300'])
+        self.assertFalse(hasattr(vacancy, '__dict__'))
+        self.assertFalse(hasattr(vacancy.salary_info, '__dict__'))
+        self.assertEqual(vacancy.experience_id, 'От 1 года до 3 лет')
+        hits = format_category.cache_info().hits
+        self.assertEqual(vacancy.experience_id, 'От 1 года до 3 лет')
+        self.assertEqual(format_category.cache_info().hits, hits + 1)
+        self.assertIsNotNone(format_category.cache_info().maxsize)
+
     def test_dataset(self):
         self.assertEqual(type(DataSet('vacancies.csv')).__name__, 'DataSet')
 
+    def test_dataset_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = ['Программист,Описание,"Python\nSQL",noExperience,False,Яндекс,10000,20000,True,RUR,'
+                    'Москва,2022-07-15T09:56:52+0300',
+                    'Аналитик,,SQL,noExperience,False,Яндекс,10000,20000,True,RUR,Москва,2022-07-15T09:56:52+0300']
+            file_path = write_vacancies(directory, rows)
+            parsed = DataSet(file_path, use_cache=True)
+            self.assertTrue(vacancyCache.is_valid(file_path))
+            cached = DataSet(file_path, use_cache=True)
+            self.assertEqual([vacancy.key_skills for vacancy in cached.vacancies], ['Python\nSQL'])
+            self.assertEqual([vacancy.salary for vacancy in cached.vacancies],
+                             [vacancy.salary for vacancy in parsed.vacancies])
+            os.utime(file_path, ns=(10 ** 18, 10 ** 18))
+            self.assertTrue(vacancyCache.is_valid(file_path))
+            with open(vacancyCache.cache_path(file_path), 'rb') as file:
+                self.assertEqual(vacancyCache.read_meta(file)[0]['mtime'], vacancyCache.source_key(file_path)['mtime'])
+            self.assertEqual(len(DataSet(file_path, use_cache=True).vacancies), 1)
+            with open(file_path, 'a', encoding='utf-8') as file:
+                file.write('Тестировщик,Описание,SQL,noExperience,False,Яндекс,10000,20000,True,RUR,Москва,'
+                           '2022-07-15T09:56:52+0300\n')
+            self.assertFalse(vacancyCache.is_valid(file_path))
+            self.assertEqual(len(DataSet(file_path, use_cache=True).vacancies), 2)
+
+    def test_dataset_cache_concurrent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,noExperience,False,Компания {index % 50},'
+                    f'{index % 7}0000,{index % 7 + 1}0000,False,RUR,Москва,2022-07-15T09:56:52+0300'
+                    for index in range(5000))
+            file_path = write_vacancies(directory, rows)
+            for _ in range(3):
+                if os.path.exists(vacancyCache.cache_path(file_path)):
+                    os.remove(vacancyCache.cache_path(file_path))
+                with ProcessPoolExecutor(6) as executor:
+                    counts = list(executor.map(cached_vacancies_count, [file_path] * 6))
+                self.assertEqual(counts, [5000] * 6)
+                self.assertEqual(sorted(os.listdir(directory)), ['vacancies.csv', 'vacancies.csv.vcache'])
+                self.assertEqual(cached_vacancies_count(file_path), 5000)
+
+    def test_sorter_data_limit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,noExperience,False,Компания {index % 4},'
+                    f'{index % 7}0000,{index % 7}0000,False,RUR,Москва,2022-07-{index % 9 + 10}T09:56:52+0300'
+                    for index in range(50))
+            file_path = write_vacancies(directory, rows)
+            for sorter in ['Оклад', 'Компания', 'Дата публикации вакансии']:
+                for is_reverse in ['Да', 'Нет']:
+                    full = DataSet(file_path)
+                    full.sorter_data(sorter, is_reverse)
+                    top = DataSet(file_path)
+                    top.sorter_data(sorter, is_reverse, 10)
+                    self.assertEqual([vacancy.name for vacancy in top.vacancies],
+                                     [vacancy.name for vacancy in full.vacancies[:10]])
+
+    def test_sorter_data_multiple(self):
+        self.assertEqual(parse_sorter('Опыт работы, Оклад: Да', 'Нет'), [('Опыт работы', False), ('Оклад', True)])
+        self.assertEqual(check_sorter_value('Опыт работы, Оклад: Да'), False)
+        self.assertEqual(check_sorter_value('Опыт работы, Оклад: Может быть'), 'Порядок сортировки задан некорректно')
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,{["noExperience", "between1And3"][index % 2]},False,'
+                    f'Компания {index % 4},{index % 5}0000,{index % 5}0000,False,RUR,Москва,'
+                    f'2022-07-{index % 9 + 10}T09:56:52+0300'
+                    for index in range(30))
+            file_path = write_vacancies(directory, rows)
+            for sorter in ['Опыт работы, Оклад: Да', 'Компания: Да, Название', 'Оклад, Дата публикации вакансии: Да']:
+                expected = DataSet(file_path)
+                for title, is_reverse in reversed(parse_sorter(sorter, 'Нет')):
+                    expected.sorter_data(title, 'Да' if is_reverse else 'Нет')
+                actual = DataSet(file_path)
+                actual.sorter_data(sorter, 'Нет')
+                self.assertEqual([vacancy.name for vacancy in actual.vacancies],
+                                 [vacancy.name for vacancy in expected.vacancies])
+
+    def test_dataset_view(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = (f'Вакансия {index},Описание,Python,noExperience,False,Компания {index % 2},'
+                    f'{index}0000,{index}0000,False,RUR,Москва,2022-07-15T09:56:52+0300'
+                    for index in range(5))
+            file_path = write_vacancies(directory, rows)
+            data = DataSet(file_path)
+            data.create_index()
+            view = data.view()
+            view.filter_data('Компания: Компания 1')
+            output = io.StringIO()
+            print_vacancies(view, 'Оклад', 'Да', ['1', '2'], ['Название'], file=output)
+            self.assertEqual(output.getvalue().count('Вакансия'), 1)
+            self.assertIn('Вакансия 3', output.getvalue())
+            self.assertEqual(len(data.vacancies), 5)
+
+    def test_table_renderer(self):
+        output = io.StringIO()
+        renderer = TableRenderer(['№', 'Название', 'Навыки'], {'Название': 12})
+        renderer.render(iter([[1, 'Программист Python', 'SQL'], [2, 'Аналитик', 'Git\nDocker\nLinux']]),
+                        fields=['№', 'Название'], file=output)
+        self.assertEqual(output.getvalue(), '+---+--------------+\n'
+                                            '| № | Название     |\n'
+                                            '+---+--------------+\n'
+                                            '| 1 | Программист  |\n'
+                                            '|   | Python       |\n'
+                                            '+---+--------------+\n'
+                                            '| 2 | Аналитик     |\n'
+                                            '|   |              |\n'
+                                            '|   |              |\n'
+                                            '+---+--------------+\n')
+        self.assertRaises(ValueError, renderer.render, [], ['Оклад'])
+
+    def test_salary_intervals(self):
+        intervals = SalaryIntervals([(10, 20, 0), (15, 30, 1), (40, 50, 2), (5, 60, 3), (20, 20, 4)])
+        self.assertEqual(intervals.stab(20), [0, 1, 3, 4])
+        self.assertEqual(intervals.stab(35), [3])
+        self.assertEqual(intervals.stab(70), [])
+
+    def test_vacancy_index(self):
+        vacancies = [Vacancy(['Программист', 'Описание', 'Python', 'noExperience', 'False', 'Яндекс', '10000', '20000',
+                              'False', 'RUR', 'Москва', '2022-07-15T09:56:52+0300']),
+                     Vacancy(['Аналитик', 'Описание', 'SQL', 'moreThan6', 'True', 'Сбер', '15000.0', '30000',
+                              'False', 'USD', 'Москва', '2022-07-16T09:56:52+0300'])]
+        index = VacancyIndex(vacancies)
+        self.assertEqual(index.select('Название региона', 'Москва'), [0, 1])
+        self.assertEqual(index.select('Опыт работы', 'Более 6 лет'), [1])
+        self.assertEqual(index.select('Идентификатор валюты оклада', 'Доллары'), [1])
+        self.assertEqual(index.select('Оклад', '12000'), [0])
+        self.assertEqual(index.select('Дата публикации вакансии', '16.07.2022'), [1])
+        self.assertIsNone(index.select('Название', 'Аналитик'))
+
+    def test_skill_index(self):
+        vacancies = [Vacancy(['Программист', 'Описание', skills, 'noExperience', 'False', 'Яндекс', '10000', '20000',
+                              'False', 'RUR', 'Москва', '2022-07-15T09:56:52+0300'])
+                     for skills in ['Python\nSQL\nDocker', 'Python\nSQL', 'Docker'] * 30 + ['Git']]
+        index = SkillIndex(vacancies)
+        self.assertIsInstance(index.postings['Python'], bytes)
+        self.assertIsInstance(index.postings['Git'], list)
+        self.assertEqual(index.select(['Python', 'SQL', 'Docker']), list(range(0, 90, 3)))
+        self.assertEqual(index.select(['Docker', 'Git']), [])
+        self.assertEqual(index.select(['Git']), [90])
+        self.assertEqual(index.select(['Kotlin']), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from array import array
+
+# Сигнатура и версия формата файла кэша
+CACHE_MAGIC = b'VCACHE02'
+
+# Расширение файла кэша, который сохраняется рядом с исходным csv-файлом
+CACHE_SUFFIX = '.vcache'
+
+# Код отсутствующего значения в колонке: строка короче самой длинной строки файла
+ABSENT = 0xFFFFFFFF
+
+
+def cache_path(file_path):
+    """
+    Возвращает путь к файлу кэша для csv-файла
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях
+
+    Returns:
+        str: Путь к файлу кэша
+
+    >>> cache_path('vacancies.csv')
+    'vacancies.csv.vcache'
+    """
+    return file_path + CACHE_SUFFIX
+
+
+def file_hash(file_path):
+    """
+    Вычисляет хэш содержимого файла
+    Args:
+        file_path (str): Путь к файлу
+
+    Returns:
+        str: Шестнадцатеричный хэш BLAKE2b содержимого файла
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as File:
+        for block in iter(lambda: File.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(file_path):
+    """
+    Формирует ключ исходного файла без чтения его содержимого
+    Args:
+        file_path (str): Путь к csv-файлу
+
+    Returns:
+        dict: Абсолютный путь, размер и время изменения файла. Время изменения записано строкой постоянной
+        длины, чтобы его можно было обновить в метаданных кэша без перезаписи файла кэша
+    """
+    stat = os.stat(file_path)
+    return {'path': os.path.abspath(file_path), 'size': stat.st_size, 'mtime': f'{stat.st_mtime_ns:020d}'}
+
+
+def read_meta(cache_file):
+    """
+    Читает метаданные файла кэша
+    Args:
+        cache_file (file object): Открытый в двоичном режиме файл кэша
+
+    Returns:
+        tuple: Метаданные и смещение, с которого начинаются данные, или (None, 0), если формат неизвестен
+    """
+    if cache_file.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+        return None, 0
+    meta_length = int.from_bytes(cache_file.read(8), 'little')
+    meta = json.loads(cache_file.read(meta_length).decode('utf-8'))
+    return meta, align(len(CACHE_MAGIC) + 8 + meta_length)
+
+
+def align(offset):
+    """
+    Выравнивает смещение по границе 8 байт
+    Args:
+        offset (int): Смещение в байтах
+
+    Returns:
+        int: Ближайшее не меньшее смещение, кратное 8
+
+    >>> align(13)
+    16
+    >>> align(16)
+    16
+    """
+    return (offset + 7) & ~7
+
+
+def update_mtime(file_path, meta):
+    """
+    Записывает в метаданные кэша текущее время изменения csv-файла, содержимое которого не изменилось,
+    чтобы следующие проверки не вычисляли хэш заново
+    Args:
+        file_path (str): Путь к csv-файлу
+        meta (dict): Метаданные кэша
+    """
+    old_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    meta_bytes = json.dumps(dict(meta, mtime=source_key(file_path)['mtime']), ensure_ascii=False).encode('utf-8')
+    if len(meta_bytes) != len(old_bytes):
+        return
+    try:
+        with open(cache_path(file_path), 'r+b') as File:
+            File.seek(len(CACHE_MAGIC) + 8)
+            File.write(meta_bytes)
+    except OSError:
+        pass
+
+
+def is_valid(file_path):
+    """
+    Проверяет, что кэш соответствует текущему содержимому csv-файла. Если путь, размер и время изменения
+    совпадают, кэш считается актуальным; если отличается только время изменения, сравнивается хэш содержимого,
+    и при совпадении новое время изменения сохраняется в кэше
+    Args:
+        file_path (str): Путь к csv-файлу
+
+    Returns:
+        bool: True, если кэш можно использовать вместо разбора csv-файла
+    """
+    try:
+        with open(cache_path(file_path), 'rb') as File:
+            meta, _ = read_meta(File)
+    except (OSError, ValueError):
+        return False
+    if meta is None:
+        return False
+    key = source_key(file_path)
+    if meta['path'] != key['path'] or meta['size'] != key['size']:
+        return False
+    if meta['mtime'] == key['mtime']:
+        return True
+    if meta['hash'] != file_hash(file_path):
+        return False
+    update_mtime(file_path, meta)
+    return True
+
+
+def write_cache(file_path, header, strings, columns, rows_count):
+    """
+    Записывает кэш: метаданные, таблицу строк и колонки кодов строк. Каждый процесс пишет в собственный
+    временный файл и атомарно заменяет им файл кэша, поэтому одновременная запись не портит кэш
+    Args:
+        file_path (str): Путь к исходному csv-файлу
+        header (list of str): Заголовок csv-файла
+        strings (list of str): Таблица уникальных строк, индекс - код строки
+        columns (list of array): Колонки кодов строк, по одному коду на каждую строку данных
+        rows_count (int): Количество строк данных
+    """
+    blob = bytearray()
+    offsets = array('Q', [0])
+    for string in strings:
+        blob += string.encode('utf-8')
+        offsets.append(len(blob))
+    meta = dict(source_key(file_path), hash=file_hash(file_path), header=header, rows=rows_count,
+                columns=len(columns), strings=len(strings), blob=len(blob))
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+
+    target = cache_path(file_path)
+    handle, temp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(target),
+                                         dir=os.path.dirname(os.path.abspath(target)))
+    try:
+        with os.fdopen(handle, 'wb') as File:
+            File.write(CACHE_MAGIC)
+            File.write(len(meta_bytes).to_bytes(8, 'little'))
+            File.write(meta_bytes)
+            File.write(bytes(align(File.tell()) - File.tell()))
+            File.write(offsets.tobytes())
+            File.write(blob)
+            File.write(bytes(align(File.tell()) - File.tell()))
+            for column in columns:
+                File.write(column.tobytes())
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_cache(file_path):
+    """
+    Читает строки из кэша, отображая файл кэша в память
+    Args:
+        file_path (str): Путь к исходному csv-файлу
+
+    Yields:
+        list of str: Заголовок, а затем строки данных в исходном порядке
+    """
+    with open(cache_path(file_path), 'rb') as File:
+        meta, offset = read_meta(File)
+        with mmap.mmap(File.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            offsets = view[offset:offset + (meta['strings'] + 1) * 8].cast('Q')
+            blob_start = offset + (meta['strings'] + 1) * 8
+            strings = [str(view[blob_start + offsets[i]:blob_start + offsets[i + 1]], 'utf-8')
+                       for i in range(meta['strings'])]
+            offsets.release()
+            columns_start = align(blob_start + meta['blob'])
+            column_size = meta['rows'] * 4
+            columns = [view[columns_start + i * column_size:columns_start + (i + 1) * column_size].cast('I')
+                       for i in range(meta['columns'])]
+            try:
+                yield meta['header']
+                for index in range(meta['rows']):
+                    yield [strings[column[index]] for column in columns if column[index] != ABSENT]
+            finally:
+                for column in columns:
+                    column.release()
+                view.release()
+
+
+def write_through(file_path, rows):
+    """
+    Передает строки дальше без изменений и одновременно кодирует их для кэша. Кэш записывается,
+    когда строки прочитаны до конца
+    Args:
+        file_path (str): Путь к исходному csv-файлу
+        rows (iterator of list of str): Заголовок и строки данных
+
+    Yields:
+        list of str: Те же строки, что и в rows
+    """
+    header = next(rows, None)
+    if header is None:
+        return
+    yield header
+    codes = {}
+    columns = []
+    rows_count = 0
+    for row in rows:
+        while len(columns) < len(row):
+            columns.append(array('I', [ABSENT]) * rows_count)
+        for index, column in enumerate(columns):
+            column.append(codes.setdefault(row[index], len(codes)) if index < len(row) else ABSENT)
+        rows_count += 1
+        yield row
+    write_cache(file_path, header, list(codes), columns, rows_count)
+
+
+def cached_rows(file_path, read_rows):
+    """
+    Возвращает строки csv-файла из кэша, если он актуален, иначе разбирает файл и сохраняет кэш
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях
+        read_rows (function): Функция разбора csv-файла, возвращающая заголовок и очищенные строки данных
+
+    Returns:
+        iterator of list of str: Заголовок, а затем строки данных
+    """
+    if is_valid(file_path):
+        return read_cache(file_path)
+    return write_through(file_path, read_rows(file_path))
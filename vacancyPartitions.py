@@ -0,0 +1,339 @@
+import csv
+import functools
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import parallelReader
+import vacancyCache
+
+# Имя файла описания разделов в каталоге разделов
+MANIFEST_NAME = 'manifest.json'
+# Количество строк, накапливаемых в памяти до записи в файлы разделов
+buffer_rows = 100000
+# Столбец и длина префикса значения, по которым строка относится к разделу
+partition_keys = {
+    'year': ('published_at', 4),
+    'month': ('published_at', 7),
+    'area': ('area_name', None),
+}
+
+
+def partition_file_name(key, used):
+    """
+    Формирует имя файла раздела, допустимое в файловой системе и не совпадающее с уже выданными
+    Args:
+        key (str): Ключ раздела
+        used (set of str): Уже выданные имена файлов, пополняется новым именем
+
+    Returns:
+        str: Имя файла раздела
+
+    >>> partition_file_name('2022', set())
+    '2022.csv'
+    >>> partition_file_name('Москва/Область', {'Москва_Область.csv'})
+    'Москва_Область_1.csv'
+    """
+    stem = re.sub(r'[\\/:*?"<>|\s]', '_', key)
+    name, number = f'{stem}.csv', 0
+    while name in used:
+        number += 1
+        name = f'{stem}_{number}.csv'
+    used.add(name)
+    return name
+
+
+class Partition(object):
+    """
+    Класс для представления одного раздела: буфер строк и сведения для описания раздела
+
+    Attributes:
+        key (str): Ключ раздела
+        file_name (str): Имя файла раздела
+        rows (list of list of str): Строки, ещё не записанные в файл
+        count (int): Количество строк раздела
+        valid_count (int): Количество строк раздела, в которых заполнены все значения
+        first_published (str or None): Наименьшая дата публикации в разделе
+        last_published (str or None): Наибольшая дата публикации в разделе
+        is_written (bool): Файл раздела уже создан в этом разбиении
+    """
+    def __init__(self, key, file_name):
+        """
+        Инициализирует пустой раздел
+        Args:
+            key (str): Ключ раздела
+            file_name (str): Имя файла раздела
+        """
+        self.key = key
+        self.file_name = file_name
+        self.rows = []
+        self.count = 0
+        self.valid_count = 0
+        self.first_published = None
+        self.last_published = None
+        self.is_written = False
+
+    def add(self, row, published_at):
+        """
+        Добавляет строку в буфер раздела
+        Args:
+            row (list of str): Строка csv-файла не короче заголовка
+            published_at (str): Дата публикации вакансии
+        """
+        self.rows.append(row)
+        self.count += 1
+        self.valid_count += all(row)
+        if self.first_published is None or published_at < self.first_published:
+            self.first_published = published_at
+        if self.last_published is None or published_at > self.last_published:
+            self.last_published = published_at
+
+    def flush(self, directory, header):
+        """
+        Дописывает буфер в файл раздела и очищает его. Первая запись в разбиении создает файл заново
+        Args:
+            directory (str): Каталог разделов
+            header (list of str): Заголовок csv-файла
+        """
+        with open(os.path.join(directory, self.file_name), 'a' if self.is_written else 'w',
+                  encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            if not self.is_written:
+                writer.writerow(header)
+            writer.writerows(self.rows)
+        self.is_written = True
+        self.rows = []
+
+    def describe(self):
+        """
+        Формирует описание раздела для manifest.json
+        Returns:
+            dict: Ключ, имя файла, количество строк, количество строк, которые останутся после отбрасывания строк
+            с пустыми значениями при чтении, и диапазон дат публикации
+        """
+        return {'key': self.key, 'file': self.file_name, 'rows': self.count, 'valid_rows': self.valid_count,
+                'first_published': self.first_published, 'last_published': self.last_published}
+
+
+class Partitioner(object):
+    """
+    Потоковый разбиватель строк csv-файла на разделы. Строки распределяются по буферам разделов; когда
+    в буферах накапливается buffer_size строк, все непустые буферы параллельно дописываются в свои файлы,
+    поэтому в памяти одновременно находится не больше buffer_size строк
+
+    Attributes:
+        directory (str): Каталог разделов
+        header (list of str): Заголовок csv-файла
+        partition_by (str): Способ разбиения: 'year', 'month' или 'area'
+        partitions (dict): Разделы по ключам
+        skipped (int): Количество строк без ключа раздела или даты публикации
+    """
+    def __init__(self, directory, header, partition_by='year', max_workers=4, buffer_size=buffer_rows):
+        """
+        Инициализирует разбиватель
+        Args:
+            directory (str): Каталог разделов, создается при отсутствии
+            header (list of str): Заголовок csv-файла
+            partition_by (str): Способ разбиения: 'year', 'month' или 'area'
+            max_workers (int): Количество потоков записи
+            buffer_size (int): Наибольшее количество строк в буферах
+
+        Raises:
+            ValueError: Если способ разбиения неизвестен или в заголовке нет нужного столбца
+        """
+        if partition_by not in partition_keys:
+            raise ValueError(f'Неизвестный способ разбиения: {partition_by}')
+        column, self.prefix = partition_keys[partition_by]
+        if column not in header or 'published_at' not in header:
+            raise ValueError(f'В файле нет столбца {column}')
+        self.key_index, self.date_index = header.index(column), header.index('published_at')
+        self.directory = directory
+        self.header = header
+        self.partition_by = partition_by
+        self.max_workers = max_workers
+        self.buffer_size = buffer_size
+        self.buffered = 0
+        self.partitions = {}
+        self.file_names = set()
+        self.skipped = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, row):
+        """
+        Относит строку к разделу и записывает буферы, если они заполнены
+        Args:
+            row (list of str): Строка csv-файла
+        """
+        if len(row) < len(self.header) or not row[self.key_index] or not row[self.date_index]:
+            self.skipped += 1
+            return
+        key = row[self.key_index][:self.prefix]
+        partition = self.partitions.get(key)
+        if partition is None:
+            partition = self.partitions[key] = Partition(key, partition_file_name(key, self.file_names))
+        partition.add(row, row[self.date_index])
+        self.buffered += 1
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Параллельно дописывает непустые буферы в файлы разделов
+        """
+        pending = [partition for partition in self.partitions.values() if partition.rows]
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            for _ in executor.map(lambda partition: partition.flush(self.directory, self.header), pending):
+                pass
+        self.buffered = 0
+
+    def manifest(self, source=None):
+        """
+        Формирует описание разбиения
+        Args:
+            source (str or None): Путь к исходному csv-файлу
+
+        Returns:
+            dict: Описание разбиения с разделами, отсортированными по ключу
+        """
+        return {'source': source, 'partition_by': self.partition_by, 'header': self.header,
+                'rows': sum(partition.count for partition in self.partitions.values()), 'skipped': self.skipped,
+                'partitions': [self.partitions[key].describe() for key in sorted(self.partitions)]}
+
+
+def write_manifest(directory, manifest):
+    """
+    Записывает описание разбиения в каталог разделов, заменяя прежнее только после полной записи
+    Args:
+        directory (str): Каталог разделов
+        manifest (dict): Описание разбиения
+    """
+    temp_path = os.path.join(directory, MANIFEST_NAME + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, os.path.join(directory, MANIFEST_NAME))
+
+
+def partition_csv(file_path, directory, partition_by='year', max_workers=4, buffer_size=buffer_rows):
+    """
+    Разбивает csv-файл с вакансиями на файлы разделов за один проход и записывает manifest.json
+    Args:
+        file_path (str): Путь к csv-файлу с данными о вакансиях
+        directory (str): Каталог разделов
+        partition_by (str): Способ разбиения: 'year', 'month' или 'area'
+        max_workers (int): Количество потоков записи
+        buffer_size (int): Наибольшее количество строк в буферах
+
+    Returns:
+        dict: Описание разбиения
+    """
+    with open(file_path, encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        partitioner = Partitioner(directory, next(reader, []), partition_by, max_workers, buffer_size)
+        for row in reader:
+            partitioner.add(row)
+    partitioner.flush()
+    manifest = partitioner.manifest(os.path.abspath(file_path))
+    write_manifest(directory, manifest)
+    return manifest
+
+
+def is_partitioned(path):
+    """
+    Проверяет, что путь указывает на каталог разделов с описанием разбиения
+    Args:
+        path (str): Путь к csv-файлу или каталогу разделов
+
+    Returns:
+        bool: True, если в каталоге есть manifest.json
+    """
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_NAME))
+
+
+def read_manifest(directory):
+    """
+    Читает описание разбиения
+    Args:
+        directory (str): Каталог разделов
+
+    Returns:
+        dict: Описание разбиения
+    """
+    with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as file:
+        return json.load(file)
+
+
+def overlaps_dates(partition, low, high):
+    """
+    Проверяет, что даты публикации раздела пересекаются с диапазоном дат
+    Args:
+        partition (dict): Описание раздела из manifest.json
+        low (str): Первая дата диапазона в формате 'YYYY-MM-DD'
+        high (str): Последняя дата диапазона в формате 'YYYY-MM-DD'
+
+    Returns:
+        bool: True, если в разделе могут быть вакансии из диапазона
+
+    >>> overlaps_dates({'first_published': '2022-01-10T09:00:00+0300', 'last_published': '2022-12-01T09:00:00+0300'}, '2022-12-01', '2023-01-01')
+    True
+    >>> overlaps_dates({'first_published': '2022-01-10T09:00:00+0300', 'last_published': '2022-12-01T09:00:00+0300'}, '2021-01-01', '2022-01-09')
+    False
+    """
+    return partition['first_published'][:10] <= high and partition['last_published'][:10] >= low
+
+
+def read_partition(file_path):
+    """
+    Читает файл раздела, отбрасывая строки с пустыми значениями и строки короче заголовка
+    Args:
+        file_path (str): Путь к файлу раздела
+
+    Yields:
+        list of str: Заголовок файла, а затем каждая корректная строка данных
+    """
+    header, start = parallelReader.read_header(file_path)
+    if header is None:
+        return
+    yield header
+    yield from parallelReader.iter_range(file_path, start, os.path.getsize(file_path), len(header))
+
+
+def collect_partition(function, args, use_cache, file_path):
+    """
+    Обрабатывает один раздел в дочернем процессе
+    Args:
+        function (function): Функция, получающая итератор строк раздела и дополнительные аргументы
+        args (tuple): Дополнительные аргументы функции
+        use_cache (bool): Читать строки из двоичного кэша рядом с файлом раздела
+        file_path (str): Путь к файлу раздела
+
+    Returns:
+        Результат function для строк раздела
+    """
+    rows = vacancyCache.cached_rows(file_path, read_partition) if use_cache else read_partition(file_path)
+    next(rows, None)
+    return function(rows, *args)
+
+
+def map_partitions(directory, partitions, function, args=(), processes=None, use_cache=False):
+    """
+    Применяет функцию к строкам каждого раздела. Разделы независимы, поэтому разбираются параллельно
+    в пуле процессов, а между процессами передаются только результаты функции
+    Args:
+        directory (str): Каталог разделов
+        partitions (list of dict): Описания читаемых разделов из manifest.json
+        function (function): Функция уровня модуля, получающая итератор строк раздела и args
+        args (tuple): Дополнительные аргументы функции
+        processes (int or None): Количество процессов, по умолчанию - количество ядер, 1 - без пула процессов
+        use_cache (bool): Читать строки из двоичного кэша рядом с файлами разделов
+
+    Returns:
+        list: Результаты функции в порядке разделов
+    """
+    paths = [os.path.join(directory, partition['file']) for partition in partitions]
+    worker = functools.partial(collect_partition, function, args, use_cache)
+    processes = min(processes or os.cpu_count(), len(paths))
+    if processes <= 1:
+        return [worker(path) for path in paths]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(worker, paths, chunksize=1)